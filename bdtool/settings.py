@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    'django.contrib.postgres',
     'django.contrib.staticfiles',
     'django_countries',
     'djmoney',
@@ -52,6 +53,7 @@ INSTALLED_APPS = [
 default_app_config = 'project_management.apps.ProjectManagementConfig'
 
 MIDDLEWARE = [
+    'project_management.profiling.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -97,6 +99,21 @@ DATABASES = {
 }
 
 
+# Cache
+# The Domain tree, changelist facet counts, autocomplete results and the
+# similar project index are invalidated through version keys stored in the
+# cache, so it must be shared by every process: the web server workers and
+# process_jobs. The per-process default, LocMemCache, would keep stale data
+# in the other processes. A DatabaseCache would turn every cache read into
+# a query and cull the version keys past MAX_ENTRIES, so memcached is used.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': '127.0.0.1:11211',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
 
@@ -140,3 +157,92 @@ STATICFILES_DIRS = [
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Uploaded files are served to staff users by project_management.media.
+# Set MEDIA_SENDFILE_BACKEND to 'x-accel-redirect' (nginx, with an internal
+# location at MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT) or
+# 'x-sendfile' (Apache mod_xsendfile) to have the web server send them.
+MEDIA_SENDFILE_BACKEND = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+# Browser cache lifetime of the files; logo thumbnails and project uploads
+# are always cached for a year as their names change with their content.
+MEDIA_CACHE_MAX_AGE = 0
+
+# Project attachments and logos are stored once per content, under
+# MEDIA_ROOT/<CONTENT_STORAGE_DIRECTORY>/ (see project_management.storage).
+# Move older uploads there with the rehome_uploads command.
+CONTENT_STORAGE_DIRECTORY = 'files'
+
+# Text search configuration of the Project and Client search vectors
+SEARCH_CONFIG = 'english'
+
+# Autocomplete API: maximum number of results and per-term cache lifetime
+AUTOCOMPLETE_LIMIT = 20
+AUTOCOMPLETE_CACHE_TIMEOUT = 300
+
+# Options fetched per request by the lazy changelist dropdown filters
+FILTER_CHOICES_PAGE_SIZE = 50
+
+# Lifetime of the cached Project changelist facet counts; saving a project
+# or one of its tags, technologies or domains invalidates them earlier.
+FACET_CACHE_TIMEOUT = 600
+
+# Lifetime of the cached Domain tree; saving, moving or deleting a domain
+# invalidates it earlier.
+DOMAIN_TREE_CACHE_TIMEOUT = 3600
+
+# Currency of Project.project_budget_base, used by the budget range
+# filter and budget sorting. Rates are loaded with load_exchange_rates.
+BASE_CURRENCY = 'USD'
+
+# Similar projects on the Project change form: weight of each compared
+# field and number of projects shown
+SIMILAR_PROJECT_WEIGHTS = {
+    'technologies': 3, 'domains': 2, 'tags': 1, 'project_type': 1,
+}
+SIMILAR_PROJECT_LIMIT = 10
+
+# find_duplicate_clients: minimum score of a stored pair, and the size
+# above which a shared blocking key (e.g. a placeholder phone number) is
+# ignored
+CLIENT_DUPLICATE_THRESHOLD = 0.6
+CLIENT_DUPLICATE_MAX_BLOCK = 50
+CLIENT_DUPLICATES_PER_PAGE = 50
+
+# Project logo thumbnails, generated by the process_jobs worker when a logo
+# is uploaded (generate_logo_thumbnails backfills them). Formats the
+# installed Pillow cannot write are skipped.
+LOGO_THUMBNAIL_SIZES = ((150, 150),)
+LOGO_THUMBNAIL_FORMATS = ('webp', 'jpeg')
+
+# Text of Project attachments searched by the Project admin, extracted by
+# the process_jobs worker (extract_attachment_text backfills it); longer
+# texts are truncated to stay under PostgreSQL's tsvector size limit.
+ATTACHMENT_TEXT_MAX_LENGTH = 500000
+
+# Client and Project changelists use PostgreSQL's row estimate instead of
+# COUNT(*) once it reaches this many rows
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+# Admin exports
+# Number of rows read per batch; many-to-many columns are resolved per batch.
+EXPORT_CHUNK_SIZE = 2000
+
+# Rows per batch of bulk queries in ProjectResource.bulk_import
+IMPORT_CHUNK_SIZE = 500
+
+# Request profiling (see project_management.profiling): fraction of the
+# requests whose time and queries are saved (e.g. 0.05 in production, off
+# here so query count tests are not sampled), the duration above which a
+# sampled request is also logged, and the days of profiles kept by the
+# prune_request_profiles command.
+REQUEST_PROFILE_SAMPLE_RATE = 0
+REQUEST_PROFILE_SLOW_MS = 1000
+REQUEST_PROFILE_RETENTION_DAYS = 30
+
+# Background jobs (see the process_jobs management command). Jobs still
+# running JOB_TIMEOUT seconds after they started are marked as failed.
+JOB_IMPORT_CHUNK_SIZE = 1000
+JOB_POLL_INTERVAL = 5
+JOB_TIMEOUT = 6 * 60 * 60
+JOB_WORKER_PROCESSES = 2
@@ -14,14 +14,19 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+# Python Imports
+import re
+
 # Django Imports
 from django.conf import settings
 from django.conf.urls import include, url
 from django.contrib import admin
 from django.contrib.staticfiles import views
-from django.conf.urls.static import static
 from django.views.generic import RedirectView
 
+# Project Imports
+from project_management.views import media
+
 admin.site.site_header = "BD Tool Administration"
 admin.site.site_title = "BD Tool Backend"
 admin.site.index_title = "Welcome to BD Tool Portal"
@@ -29,7 +34,9 @@ admin.site.index_title = "Welcome to BD Tool Portal"
 urlpatterns = [
     url(r'admin/', admin.site.urls),
     url(r'^', include('project_management.urls', namespace='project_management')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    url(r'^{}(?P<path>.+)$'.format(re.escape(settings.MEDIA_URL.lstrip('/'))),
+        media, name='media'),
+]
 
 if settings.DEBUG:
     urlpatterns += [
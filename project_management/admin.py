@@ -1,56 +1,203 @@
 # -*- coding: utf-8 -*-
 
 # Python Imports
-import csv
+import datetime
 
 # Django Imports
 from django import forms
+from django.conf.urls import url
+from django.conf import settings
 from django.contrib import admin
-from django.http import HttpResponse
-from django.shortcuts import render
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import Prefetch, Q
+from django.http import (
+    HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+)
+from django.shortcuts import get_object_or_404, render
+from django.template.response import TemplateResponse
+from django.urls import reverse
+from django.utils.html import format_html
 from mptt.admin import DraggableMPTTAdmin
 
 # Project Imports
 from import_export.admin import ImportExportModelAdmin
-from project_management.forms import ListForm
+from project_management import (
+    analytics, dedup, domains, profiling, similar
+)
+from project_management.autocomplete import search as autocomplete_search
+from project_management.changelist import (
+    EstimatedCountMixin, KeysetPaginationMixin
+)
+from project_management.exports import (
+    CSV_CONTENT_TYPE, XLSX_CONTENT_TYPE, export_rows, stream_csv, stream_xlsx
+)
+from project_management.forms import AnalyticsForm, ListForm
+from project_management.history import record_changes
+from project_management.jobs import enqueue_export, enqueue_import
 from project_management.models import (
-    Client, Domain, List, Project, Tags, Technology
+    JOB_COMPLETED, JOB_FAILED, AttachmentText, Client, ClientDuplicate,
+    Domain, ExchangeRate, Job, List, Project, RequestProfile, Tags,
+    Technology
 )
 from project_management.filters import (
-    BudgetRangeFilter, CurrencyTypeFilter, DropdownFilter,
-    RelatedDropdownFilter
+    BudgetRangeFilter, CurrencyTypeFilter, DomainTreeFilter, DropdownFilter,
+    FacetChoicesFilter, FacetRelatedDropdownFilter, LazyDropdownFilter,
+    LazyRelatedDropdownFilter, RelatedDropdownFilter
+)
+from project_management.resources import ClientResource, ProjectResource
+from project_management.search import SearchVectorMixin, union_subquery
+from project_management.selection import (
+    LIST_SELECTION_SESSION_KEY, get_preview, serialize_selection
 )
+from project_management.summary import summary_column
+from project_management.widgets import AutocompleteRawIdWidget
 from rangefilter.filter import DateRangeFilter, DateTimeRangeFilter
 from search_admin_autocomplete.admin import SearchAutoCompleteAdmin
 
 
 class ExportExcelMixin:
-    def export_as_excel(self, request, queryset):
-        meta = self.model._meta
-        field_names = [field.name for field in meta.fields]
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    # Many-to-many fields exported as comma separated names
+    export_m2m_fields = ()
+
+    # Internal columns left out of the export
+    export_exclude = ('search_vector',)
+
+    def get_export_field_names(self):
+        return [
+            field.name for field in self.model._meta.fields
+            if field.name not in self.export_exclude
+        ]
+
+    def stream_export(self, queryset, extension, content_type, stream):
+        rows = export_rows(
+            queryset, self.get_export_field_names(), self.export_m2m_fields
+        )
+        response = StreamingHttpResponse(
+            stream(rows), content_type=content_type
         )
         response['Content-Disposition'] = (
-            'attachment; filename={}.xlsx'.format(
-                meta
+            'attachment; filename={}.{}'.format(
+                self.model._meta, extension
             )
         )
-        writer = csv.writer(response)
-        writer.writerow(field_names)
-        for obj in queryset:
-            writer.writerow(
-                [getattr(obj, field) for field in field_names]
-            )
         return response
 
+    def export_as_excel(self, request, queryset):
+        return self.stream_export(
+            queryset, 'xlsx', XLSX_CONTENT_TYPE, stream_xlsx
+        )
+
     export_as_excel.short_description = (
         "Export selected %(verbose_name_plural)s"
     )
 
+    def export_as_csv(self, request, queryset):
+        return self.stream_export(
+            queryset, 'csv', CSV_CONTENT_TYPE, stream_csv
+        )
+
+    export_as_csv.short_description = (
+        "Export selected %(verbose_name_plural)s as CSV"
+    )
+
+
+class AutocompleteSearchApiMixin(object):
+    """
+    Serves SearchAutoCompleteAdmin's search box from the cached, trigram
+    indexed autocomplete API instead of an unbounded __contains query.
+    """
+
+    def search_api(self, request, search_term):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return JsonResponse([
+            {
+                'keyword': result['text'],
+                'url': reverse(
+                    'admin:%s_%s_change' % info, args=[result['id']]
+                ),
+            }
+            for result in autocomplete_search(info[1], search_term)
+        ], safe=False)
+
+
+class BackgroundJobMixin(object):
+    """
+    Runs large imports and exports through the job queue processed by the
+    process_jobs command instead of inside the request.
+    """
+    change_list_template = 'admin/project_management/change_list_jobs.html'
+
+    def get_urls(self):
+        urls = super(BackgroundJobMixin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        my_urls = [
+            url(r'^import_job/$',
+                self.admin_site.admin_view(self.import_job_view),
+                name='%s_%s_import_job' % info),
+        ]
+        return my_urls + urls
+
+    def redirect_to_job(self, request, job):
+        job_url = reverse('admin:project_management_job_change', args=[job.pk])
+        self.message_user(request, format_html(
+            'Queued <a href="{}">{}</a>, the file will be available on the '
+            'job page once it has been processed.', job_url, job
+        ))
+        return HttpResponseRedirect(job_url)
+
+    def import_job_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+
+        import_formats = self.get_import_formats()
+        form = self.get_import_form()(
+            import_formats, request.POST or None, request.FILES or None
+        )
+        if request.POST and form.is_valid():
+            input_format = import_formats[
+                int(form.cleaned_data['input_format'])
+            ]
+            job = enqueue_import(
+                self, request, form.cleaned_data['import_file'], input_format
+            )
+            return self.redirect_to_job(request, job)
+
+        resource = self.get_import_resource_class()(
+            **self.get_import_resource_kwargs(request)
+        )
+        context = dict(
+            self.admin_site.each_context(request),
+            title='Import in background',
+            form=form,
+            opts=self.model._meta,
+            fields=[
+                field.column_name
+                for field in resource.get_user_visible_fields()
+            ],
+        )
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, [self.import_template_name], context
+        )
+
+    def export_in_background(self, request, queryset):
+        job = enqueue_export(self, request, queryset)
+        return self.redirect_to_job(request, job)
+
+    export_in_background.short_description = (
+        "Export selected %(verbose_name_plural)s in background"
+    )
+
 
-class ClientAdmin(ImportExportModelAdmin, ExportExcelMixin):
+class ClientAdmin(EstimatedCountMixin, SearchVectorMixin,
+                  BackgroundJobMixin, ImportExportModelAdmin,
+                  ExportExcelMixin):
     model = Client
+    resource_class = ClientResource
     fieldsets = (
         ('Personal info', {
             'fields': (
@@ -70,10 +217,10 @@ class ClientAdmin(ImportExportModelAdmin, ExportExcelMixin):
     )
 
     list_filter = (
-        ('email', DropdownFilter), ('skype_id', DropdownFilter),
+        ('email', LazyDropdownFilter), ('skype_id', LazyDropdownFilter),
         ('country', DropdownFilter),
-        'active', ('created_by', RelatedDropdownFilter),
-        ('updated_by', RelatedDropdownFilter),
+        'active', ('created_by', LazyRelatedDropdownFilter),
+        ('updated_by', LazyRelatedDropdownFilter),
         ('created_on', DateTimeRangeFilter),
         ('updated_on', DateTimeRangeFilter),
     )
@@ -84,11 +231,85 @@ class ClientAdmin(ImportExportModelAdmin, ExportExcelMixin):
         'updated_by',
     )
 
+    list_select_related = ('created_by', 'updated_by',)
+
+    ordering = ('-created_on',)
+
+    keyset_fields = ('created_on',)
+
     search_fields = [
         'first_name', 'last_name', 'email', 'skype_id', 'platform', 'feedback'
     ]
 
-    actions = ["export_as_excel"]
+    actions = ["export_as_excel", "export_as_csv", "export_in_background"]
+
+    change_list_template = 'admin/project_management/client/change_list.html'
+
+    def get_urls(self):
+        urls = super(ClientAdmin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        my_urls = [
+            url(r'^duplicates/$',
+                self.admin_site.admin_view(self.duplicates_view),
+                name='%s_%s_duplicates' % info),
+        ]
+        return my_urls + urls
+
+    def duplicates_view(self, request):
+        """
+        Lists the pairs found by the find_duplicate_clients command. A pair
+        is merged into one of its clients or dismissed.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        if request.method == 'POST':
+            if not self.has_delete_permission(request):
+                raise PermissionDenied
+            pair = get_object_or_404(
+                ClientDuplicate.objects.select_related(
+                    'client', 'duplicate'
+                ),
+                pk=request.POST.get('pair')
+            )
+            keep = request.POST.get('keep')
+            if keep in ('client', 'duplicate'):
+                client = getattr(pair, keep)
+                duplicate = (
+                    pair.duplicate if keep == 'client' else pair.client
+                )
+                client.updated_by = request.user
+                moved = dedup.merge_clients(client, [duplicate])
+                self.message_user(request, format_html(
+                    'Merged {} into <a href="{}">{}</a>, {} projects moved.',
+                    duplicate, reverse(
+                        'admin:project_management_client_change',
+                        args=[client.pk]
+                    ), client, moved
+                ))
+            else:
+                pair.delete()
+            return HttpResponseRedirect(request.get_full_path())
+
+        paginator = Paginator(
+            ClientDuplicate.objects.select_related('client', 'duplicate'),
+            getattr(settings, 'CLIENT_DUPLICATES_PER_PAGE', 50)
+        )
+        try:
+            page = paginator.page(request.GET.get('page') or 1)
+        except InvalidPage:
+            page = paginator.page(1)
+        context = dict(
+            self.admin_site.each_context(request),
+            title='Duplicate clients',
+            opts=self.model._meta,
+            page=page,
+        )
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, 'admin/project_management/client/duplicates.html',
+            context
+        )
 
     def save_model(self, request, obj, form, change):
         if not change:
@@ -110,7 +331,8 @@ class DomainAdmin(DraggableMPTTAdmin):
     )
 
     list_filter = (
-        ('name', DropdownFilter), ('parent', RelatedDropdownFilter), 'active',
+        ('name', LazyDropdownFilter), ('parent', LazyRelatedDropdownFilter),
+        'active',
     )
 
     list_display = ('tree_actions', 'indented_title', 'active',)
@@ -119,8 +341,81 @@ class DomainAdmin(DraggableMPTTAdmin):
 
     search_fields = ['name']
 
+    def _build_tree_structure(self, queryset):
+        # the parent -> children map of the drag and drop script, built
+        # from the cached tree instead of a query of every domain per
+        # changelist; queryset is always the whole tree
+        all_nodes = {}
+        for node in domains.get_tree():
+            all_nodes.setdefault(
+                str(node.parent_id) if node.parent_id else 0, []
+            ).append(node.pk)
+        return all_nodes
 
-class ListAdmin(SearchAutoCompleteAdmin):
+
+class JobAdmin(admin.ModelAdmin):
+    model = Job
+
+    change_form_template = 'admin/project_management/job/change_form.html'
+
+    fields = (
+        ('kind', 'content_type', 'status'),
+        ('_progress', 'processed', 'total'),
+        ('source_file', '_result_file'), 'error',
+        ('created_by', 'created_on', 'started_on', 'finished_on'),
+    )
+
+    readonly_fields = (
+        'kind', 'content_type', 'status', '_progress', 'processed', 'total',
+        'source_file', '_result_file', 'error', 'created_by', 'created_on',
+        'started_on', 'finished_on',
+    )
+
+    list_filter = (
+        'kind', 'status', ('content_type', RelatedDropdownFilter),
+        ('created_on', DateTimeRangeFilter),
+    )
+
+    list_display = (
+        '__str__', 'status', '_progress', 'created_by', 'created_on',
+        'finished_on', '_result_file',
+    )
+
+    list_select_related = ('content_type', 'created_by',)
+
+    def get_queryset(self, request):
+        queryset = super(JobAdmin, self).get_queryset(request)
+        if not request.user.is_superuser:
+            queryset = queryset.filter(created_by=request.user)
+        return queryset
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = super(JobAdmin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        my_urls = [
+            url(r'^(.+)/status/$',
+                self.admin_site.admin_view(self.status_view),
+                name='%s_%s_status' % info),
+        ]
+        return my_urls + urls
+
+    def status_view(self, request, object_id):
+        job = get_object_or_404(self.get_queryset(request), pk=object_id)
+        return JsonResponse({
+            'status': job.get_status_display(),
+            'processed': job.processed,
+            'total': job.total,
+            'progress': job.progress,
+            'finished': job.status in (JOB_COMPLETED, JOB_FAILED),
+            'result_url': job.result_file.url if job.result_file else None,
+        })
+
+
+class ListAdmin(KeysetPaginationMixin, AutocompleteSearchApiMixin,
+                SearchAutoCompleteAdmin):
     model = List
     fieldsets = (
         (None, {
@@ -133,15 +428,27 @@ class ListAdmin(SearchAutoCompleteAdmin):
     filter_horizontal = ('projects',)
 
     list_filter = (
-        ('name', DropdownFilter), ('projects', RelatedDropdownFilter),
+        ('name', LazyDropdownFilter), ('projects', LazyRelatedDropdownFilter),
         ('created_on', DateTimeRangeFilter),
         ('updated_on', DateTimeRangeFilter),
     )
 
     list_display = ('name', '_projects', 'created_by', 'updated_by',)
 
+    list_select_related = ('created_by', 'updated_by',)
+
+    ordering = ('-created_on',)
+
+    keyset_fields = ('created_on',)
+
     search_fields = ['name']
 
+    def get_list_prefetch_related(self, request):
+        # _projects only renders the id and name of each project
+        return (
+            Prefetch('projects', queryset=Project.objects.only('id', 'name')),
+        )
+
     def save_model(self, request, obj, form, change):
         if not change:
             obj.created_by = request.user
@@ -151,8 +458,11 @@ class ListAdmin(SearchAutoCompleteAdmin):
         obj.save()
 
 
-class ProjectAdmin(ImportExportModelAdmin, ExportExcelMixin):
+class ProjectAdmin(EstimatedCountMixin, SearchVectorMixin,
+                   BackgroundJobMixin, ImportExportModelAdmin,
+                   ExportExcelMixin):
     model = Project
+    resource_class = ProjectResource
     fieldsets = (
         ('Project details', {
             'fields': (
@@ -184,14 +494,18 @@ class ProjectAdmin(ImportExportModelAdmin, ExportExcelMixin):
     raw_id_fields = ["client"]
 
     list_filter = (
-        ('client', RelatedDropdownFilter), 'project_type', 'project_status',
+        ('client', LazyRelatedDropdownFilter),
+        ('project_type', FacetChoicesFilter),
+        ('project_status', FacetChoicesFilter),
         ('project_start_date', DateRangeFilter),
-        ('project_end_date', DateRangeFilter), 'budget_type',
+        ('project_end_date', DateRangeFilter),
+        ('budget_type', FacetChoicesFilter),
         CurrencyTypeFilter, BudgetRangeFilter,
-        ('technologies', RelatedDropdownFilter),
-        ('domains', RelatedDropdownFilter), ('tags', RelatedDropdownFilter),
-        ('created_by', RelatedDropdownFilter),
-        ('updated_by', RelatedDropdownFilter),
+        ('technologies', FacetRelatedDropdownFilter),
+        ('domains', DomainTreeFilter),
+        ('tags', FacetRelatedDropdownFilter),
+        ('created_by', LazyRelatedDropdownFilter),
+        ('updated_by', LazyRelatedDropdownFilter),
         ('created_on', DateTimeRangeFilter),
         ('updated_on', DateTimeRangeFilter),
     )
@@ -200,24 +514,97 @@ class ProjectAdmin(ImportExportModelAdmin, ExportExcelMixin):
         'name', '_client_detail', '_url', '_mobile_url', '_tags',
         '_technologies', 'project_type', 'project_status',
         'project_start_date', 'project_end_date', 'budget_type',
-        'project_budget', '_demo_video_link', 'manager_name', 'team_members',
-        'created_by', 'updated_by',
+        '_project_budget', '_demo_video_link', 'manager_name',
+        'team_members', 'created_by', 'updated_by',
     )
 
+    list_select_related = ('client', 'created_by', 'updated_by', 'summary',)
+
+    change_list_template = 'admin/project_management/project/change_list.html'
+
+    change_form_template = 'admin/project_management/project/change_form.html'
+
+    ordering = ('-created_on',)
+
+    keyset_fields = ('created_on',)
+
+    # pre-rendered columns, see summary.py
+    _client_detail = summary_column('client_detail')
+    _demo_video_link = summary_column('demo_video_link')
+    _mobile_url = summary_column('mobile_url')
+    _tags = summary_column('tags')
+    _technologies = summary_column('technologies')
+    _url = summary_column('url')
+
+    def get_search_condition(self, query):
+        # also match the text of the attachments, see attachments.py
+        return Q(pk__in=union_subquery(
+            Project.objects.filter(
+                super(ProjectAdmin, self).get_search_condition(query)
+            ).values('pk'),
+            AttachmentText.objects.filter(
+                search_vector=query
+            ).values('project'),
+        ))
+
     def create_list(self, request, queryset):
-        form = ListForm()
-        data = []
-        for i in queryset:
-            data.append(i.id)
-            request.session['data'] = data
+        request.session[LIST_SELECTION_SESSION_KEY] = serialize_selection(
+            request, queryset
+        )
         return render(
             request, 'admin/project/create_list.html',
-            {'form': form, 'projects': queryset}
+            dict(get_preview(queryset), form=ListForm())
         )
 
     create_list.short_description = "Create custom project list"
 
-    actions = ["export_as_excel", create_list]
+    def get_urls(self):
+        urls = super(ProjectAdmin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        my_urls = [
+            url(r'^analytics/$',
+                self.admin_site.admin_view(self.analytics_view),
+                name='%s_%s_analytics' % info),
+        ]
+        return my_urls + urls
+
+    def analytics_view(self, request):
+        """
+        Projects per month, status, technology and domain, read from the
+        rollups of the refresh_pipeline_rollups command.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        form = AnalyticsForm(request.GET)
+        filters = form.cleaned_data if form.is_valid() else {}
+        today = datetime.date.today()
+        end = (filters.get('end') or today).replace(day=1)
+        start = (
+            filters.get('start') or
+            datetime.date(end.year - 1, end.month, 1)
+        ).replace(day=1)
+        context = dict(
+            self.admin_site.each_context(request),
+            analytics.dashboard(start, end, filters.get('project_type')),
+            title='Project analytics',
+            form=form,
+            opts=self.model._meta,
+            start=start,
+            end=end,
+        )
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request, 'admin/project_management/project/analytics.html',
+            context
+        )
+
+    actions = [
+        "export_as_excel", "export_as_csv", "export_in_background",
+        create_list
+    ]
+
+    export_m2m_fields = ('tags', 'technologies', 'domains',)
 
     search_fields = [
         'name', 'url', 'mobile_url', 'description', 'tags__name',
@@ -244,6 +631,34 @@ class ProjectAdmin(ImportExportModelAdmin, ExportExcelMixin):
             db_field, **kwargs
         )
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        formfield = super(ProjectAdmin, self).formfield_for_foreignkey(
+            db_field, request, **kwargs
+        )
+        # search clients by name or email instead of typing a raw id
+        if db_field.name == 'client':
+            formfield.widget = AutocompleteRawIdWidget(
+                db_field.remote_field, self.admin_site, 'client'
+            )
+        return formfield
+
+    def change_view(self, request, object_id, form_url='',
+                    extra_context=None):
+        try:
+            pk = int(unquote(object_id))
+        except ValueError:
+            similar_projects = []
+        else:
+            similar_projects = similar.recommend(
+                pk, getattr(settings, 'SIMILAR_PROJECT_LIMIT', 10)
+            )
+        extra_context = dict(
+            extra_context or {}, similar_projects=similar_projects
+        )
+        return super(ProjectAdmin, self).change_view(
+            request, object_id, form_url, extra_context
+        )
+
     def save_model(self, request, obj, form, change):
         if not change:
             obj.created_by = request.user
@@ -251,22 +666,98 @@ class ProjectAdmin(ImportExportModelAdmin, ExportExcelMixin):
         else:
             obj.updated_by = request.user
         obj.save()
+        record_changes([(
+            obj.pk, form.initial.get('project_status') if change else None,
+            obj.project_status
+        )], request.user)
+
+
+class ExchangeRateAdmin(admin.ModelAdmin):
+    model = ExchangeRate
+
+    list_display = ('currency', 'rate', 'updated_on',)
+
+    search_fields = ['currency']
+
+
+class RequestProfileAdmin(admin.ModelAdmin):
+    model = RequestProfile
+
+    change_list_template = (
+        'admin/project_management/requestprofile/change_list.html'
+    )
+
+    list_display = (
+        'created_on', 'method', 'path', 'view_name', 'status_code',
+        'duration', 'query_count', 'query_time', 'duplicate_queries',
+    )
+
+    list_filter = (
+        'method', 'status_code', ('created_on', DateTimeRangeFilter),
+    )
+
+    search_fields = ['view_name', 'path']
+
+    readonly_fields = (
+        'view_name', 'path', 'method', 'status_code', 'duration',
+        'query_count', 'query_time', 'duplicate_queries', 'duplicate_sql',
+        'created_on',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = super(RequestProfileAdmin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        my_urls = [
+            url(r'^percentiles/$',
+                self.admin_site.admin_view(self.percentiles_view),
+                name='%s_%s_percentiles' % info),
+        ]
+        return my_urls + urls
+
+    def percentiles_view(self, request):
+        """
+        Request duration percentiles and query counts per view, from the
+        requests sampled by profiling.RequestProfilingMiddleware.
+        """
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+        try:
+            days = max(int(request.GET.get('days', 1)), 1)
+        except ValueError:
+            days = 1
+        context = dict(
+            self.admin_site.each_context(request),
+            title='Request percentiles',
+            opts=self.model._meta,
+            days=days,
+            rows=profiling.percentiles(days),
+            sample_rate=profiling.get_sample_rate(),
+        )
+        request.current_app = self.admin_site.name
+        return TemplateResponse(
+            request,
+            'admin/project_management/requestprofile/percentiles.html',
+            context
+        )
 
 
-class TagsAdmin(SearchAutoCompleteAdmin):
+class TagsAdmin(AutocompleteSearchApiMixin, SearchAutoCompleteAdmin):
     model = Tags
 
-    list_filter = (('name', DropdownFilter),)
+    list_filter = (('name', LazyDropdownFilter),)
 
     list_display = ('name',)
 
     search_fields = ['name']
 
 
-class TechnologyAdmin(SearchAutoCompleteAdmin):
+class TechnologyAdmin(AutocompleteSearchApiMixin, SearchAutoCompleteAdmin):
     model = Technology
 
-    list_filter = (('name', DropdownFilter), 'category',)
+    list_filter = (('name', LazyDropdownFilter), 'category',)
 
     list_display = ('name', 'category',)
 
@@ -275,7 +766,10 @@ class TechnologyAdmin(SearchAutoCompleteAdmin):
 
 admin.site.register(Client, ClientAdmin)
 admin.site.register(Domain, DomainAdmin)
+admin.site.register(ExchangeRate, ExchangeRateAdmin)
+admin.site.register(Job, JobAdmin)
 admin.site.register(List, ListAdmin)
 admin.site.register(Project, ProjectAdmin)
+admin.site.register(RequestProfile, RequestProfileAdmin)
 admin.site.register(Tags, TagsAdmin)
 admin.site.register(Technology, TechnologyAdmin)
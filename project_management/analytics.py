@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+# Django Imports
+from django.db import transaction
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+# Project Imports
+from project_management.models import (
+    PROJECT_STATUS, Domain, ExchangeRate, PendingRollupMonth, PipelineRollup,
+    Project, RollupRefresh, Technology
+)
+
+
+# PipelineRollup column: Project field of each breakdown
+DIMENSIONS = (
+    ('technology', 'technologies'),
+    ('domain', 'domains'),
+)
+
+
+def creation_month():
+    return TruncMonth('created_on', output_field=DateField())
+
+
+def next_month(month):
+    return (month.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+
+
+def month_condition(months):
+    """
+    Matches the projects created in the given months with a created_on
+    range per month.
+    """
+    return reduce(or_, [
+        Q(
+            created_on__gte=timezone.make_aware(
+                datetime.datetime.combine(month, datetime.time())
+            ),
+            created_on__lt=timezone.make_aware(
+                datetime.datetime.combine(next_month(month), datetime.time())
+            )
+        )
+        for month in months
+    ])
+
+
+def project_months(queryset):
+    return set(
+        queryset.annotate(month=creation_month()).order_by().values_list(
+            'month', flat=True
+        ).distinct()
+    )
+
+
+def month_of(created_on):
+    return timezone.localtime(created_on).date().replace(day=1)
+
+
+def mark_pending(months):
+    """
+    Schedules months for the next refresh.
+    """
+    for month in months:
+        PendingRollupMonth.objects.get_or_create(month=month)
+
+
+def changed_months(since):
+    """
+    Returns the months of the projects changed since the last refresh:
+    saved or imported projects and projects in a currency whose rate was
+    loaded since.
+    """
+    currencies = ExchangeRate.objects.filter(
+        updated_on__gte=since
+    ).values('currency')
+    return project_months(Project.objects.filter(
+        Q(updated_on__gte=since) | Q(project_budget_currency__in=currencies)
+    ))
+
+
+def build_rollups(queryset):
+    """
+    Returns the PipelineRollup rows of the projects of the queryset, from
+    one grouped query per breakdown.
+    """
+    fields = ('month', 'project_status', 'project_type')
+    queryset = queryset.annotate(month=creation_month()).order_by()
+    rollups = [
+        PipelineRollup(**row) for row in queryset.values(*fields).annotate(
+            projects=Count('pk'), budget=Sum('project_budget_base')
+        )
+    ]
+    for column, field_name in DIMENSIONS:
+        rows = queryset.values(*(fields + (field_name,))).annotate(
+            projects=Count('pk'), budget=Sum('project_budget_base')
+        )
+        for row in rows:
+            related = row.pop(field_name)
+            if related is not None:
+                row['{}_id'.format(column)] = related
+                rollups.append(PipelineRollup(**row))
+    return rollups
+
+
+def rebuild(months=None):
+    """
+    Replaces the rollups of the given months, or of every month.
+    """
+    rollups = PipelineRollup.objects.all()
+    projects = Project.objects.all()
+    if months is not None:
+        if not months:
+            return
+        rollups = rollups.filter(month__in=months)
+        projects = projects.filter(month_condition(months))
+    rollups.delete()
+    PipelineRollup.objects.bulk_create(build_rollups(projects), 1000)
+
+
+def refresh(full=False):
+    """
+    Rebuilds the months changed since the last refresh, or every month
+    when `full` is set or on the first run, and returns the RollupRefresh.
+    """
+    started_on = timezone.now()
+    last = RollupRefresh.objects.first()
+    with transaction.atomic():
+        pending = list(
+            PendingRollupMonth.objects.select_for_update().values_list(
+                'month', flat=True
+            )
+        )
+        if full or last is None:
+            months = None
+        else:
+            months = set(pending) | changed_months(last.started_on)
+        PendingRollupMonth.objects.filter(month__in=pending).delete()
+        rebuild(months)
+        return RollupRefresh.objects.create(
+            months=(
+                PipelineRollup.objects.dates('month', 'month').count()
+                if months is None else len(months)
+            ),
+            started_on=started_on, finished_on=timezone.now()
+        )
+
+
+def pivot(rows, key, statuses):
+    """
+    Groups {key, project_status, projects, budget} rows into one row per
+    key with the number of projects per status and the total budget.
+    """
+    table = OrderedDict()
+    for row in rows:
+        entry = table.setdefault(row[key], {
+            key: row[key],
+            'statuses': OrderedDict((status, 0) for status in statuses),
+            'projects': 0,
+            'budget': 0,
+        })
+        entry['statuses'][row['project_status']] += row['projects']
+        entry['projects'] += row['projects']
+        entry['budget'] += row['budget'] or 0
+    return list(table.values())
+
+
+def dashboard(start, end, project_type=None):
+    """
+    Returns the tables of the analytics page for the months from `start`
+    to `end`, read from the rollups only.
+    """
+    statuses = [status for status, name in PROJECT_STATUS]
+    rollups = PipelineRollup.objects.filter(month__range=(start, end))
+    if project_type is not None:
+        rollups = rollups.filter(project_type=project_type)
+
+    def totals(queryset, *fields):
+        return queryset.values(*fields + ('project_status',)).annotate(
+            projects=Sum('projects'), budget=Sum('budget')
+        ).order_by(*fields)
+
+    months = pivot(
+        totals(rollups.filter(technology=None, domain=None), 'month'),
+        'month', statuses
+    )
+    breakdowns = []
+    for column, model in (('technology', Technology), ('domain', Domain)):
+        rows = pivot(
+            totals(rollups.filter(**{
+                '{}__isnull'.format(column): False
+            }), column), column, statuses
+        )
+        names = dict(model.objects.filter(
+            pk__in=[row[column] for row in rows]
+        ).values_list('pk', 'name'))
+        for row in rows:
+            row['name'] = names.get(row[column], '')
+        rows.sort(key=lambda row: (-row['projects'], row['name']))
+        breakdowns.append((model._meta.verbose_name, rows))
+    return {
+        'statuses': [name for status, name in PROJECT_STATUS],
+        'months': months,
+        'breakdowns': breakdowns,
+        'last_refresh': RollupRefresh.objects.first(),
+    }
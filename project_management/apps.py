@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ProjectManagementConfig(AppConfig):
     name = 'project_management'
     verbose_name = 'Project Management'
+
+    def ready(self):
+        from project_management import checks, signals  # noqa
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import io
+import posixpath
+import re
+import zipfile
+
+# Django Imports
+from defusedxml import ElementTree
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.utils.encoding import force_text
+from pdfminer.high_level import extract_text_to_fp
+from pdfminer.layout import LAParams
+
+# Project Imports
+from project_management.models import AttachmentText, Project
+from project_management.search import get_search_config
+from project_management.storage import file_digest, is_content_addressed
+from project_management.utils import chunked
+
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DRAWING_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+
+
+def get_max_length():
+    # PostgreSQL rejects tsvectors over 1MB
+    return getattr(settings, 'ATTACHMENT_TEXT_MAX_LENGTH', 500000)
+
+
+def xml_text(file, text_tag, paragraph_tag):
+    """
+    Returns the text of the text_tag elements of an XML file, a line per
+    paragraph_tag, parsed incrementally. The files are uploaded, so entity
+    expansion and external references are refused.
+    """
+    parts = []
+    for event, element in ElementTree.iterparse(file, events=('end',)):
+        if element.tag == text_tag and element.text:
+            parts.append(element.text)
+        elif element.tag == paragraph_tag:
+            parts.append('\n')
+            element.clear()
+    return ''.join(parts)
+
+
+def extract_docx(file):
+    with zipfile.ZipFile(file) as archive:
+        with archive.open('word/document.xml') as document:
+            return xml_text(document, WORD_NS + 't', WORD_NS + 'p')
+
+
+def extract_pptx(file):
+    with zipfile.ZipFile(file) as archive:
+        slides = sorted(
+            (int(match.group(1)), name) for name, match in (
+                (name, re.match(r'^ppt/slides/slide(\d+)\.xml$', name))
+                for name in archive.namelist()
+            ) if match
+        )
+        texts = []
+        for number, name in slides:
+            with archive.open(name) as slide:
+                texts.append(
+                    xml_text(slide, DRAWING_NS + 't', DRAWING_NS + 'p')
+                )
+        return '\n'.join(texts)
+
+
+def extract_pdf(file):
+    output = io.BytesIO()
+    extract_text_to_fp(file, output, laparams=LAParams(), codec='utf-8')
+    return output.getvalue().decode('utf-8', 'ignore')
+
+
+def extract_plain(file):
+    return force_text(file.read(get_max_length() * 4), errors='ignore')
+
+
+EXTRACTORS = {
+    '.csv': extract_plain,
+    '.docx': extract_docx,
+    '.md': extract_plain,
+    '.pdf': extract_pdf,
+    '.pptx': extract_pptx,
+    '.txt': extract_plain,
+}
+
+
+def extract_text(field_file):
+    """
+    Returns the text of an attachment, or raises ValueError for the file
+    types without an extractor.
+    """
+    extension = posixpath.splitext(field_file.name)[1].lower()
+    if extension not in EXTRACTORS:
+        raise ValueError('No text extractor for {} files'.format(extension))
+    field_file.open('rb')
+    try:
+        text = EXTRACTORS[extension](field_file)
+    finally:
+        field_file.close()
+    # NUL is not allowed in PostgreSQL text
+    return text.replace('\x00', '')[:get_max_length()]
+
+
+def attachment_hash(field_file):
+    """
+    Returns the SHA-256 of the attachment, read from the name of the files
+    of the content addressed storage.
+    """
+    if is_content_addressed(field_file.name):
+        return posixpath.splitext(posixpath.basename(field_file.name))[0]
+    field_file.open('rb')
+    try:
+        return file_digest(field_file)
+    finally:
+        field_file.close()
+
+
+def update_attachment_texts(pks, batch_size=100):
+    """
+    Extracts the text of the attachments of the given projects whose
+    content changed since their last extraction; the text of a file
+    another project already has is copied. The search vectors of each
+    batch are updated with one UPDATE. Returns the number of projects
+    whose text was extracted or copied.
+    """
+    updated = 0
+    for batch in chunked(sorted(set(pks)), batch_size):
+        projects = Project.objects.filter(pk__in=batch).only('attachments')
+        texts = dict(
+            (text.project_id, text)
+            for text in AttachmentText.objects.filter(project__in=batch)
+        )
+        changed = []
+        for project in projects:
+            text = texts.get(project.pk)
+            name = project.attachments.name
+            if not name:
+                if text is not None:
+                    text.delete()
+                continue
+            if text is not None and text.file_name == name:
+                continue
+
+            digest = attachment_hash(project.attachments)
+            if text is not None and text.file_hash == digest:
+                text.file_name = name
+                text.save(update_fields=['file_name'])
+                continue
+            text = text or AttachmentText(project=project)
+            text.file_name, text.file_hash = name, digest
+            same_file = AttachmentText.objects.filter(
+                file_hash=digest
+            ).exclude(project=project).first()
+            if same_file is not None:
+                text.text, text.error = same_file.text, same_file.error
+            else:
+                try:
+                    text.text = extract_text(project.attachments)
+                    text.error = None
+                except Exception as error:
+                    text.text, text.error = '', repr(error)
+            text.save()
+            changed.append(project.pk)
+
+        AttachmentText.objects.filter(project__in=changed).update(
+            search_vector=SearchVector('text', config=get_search_config())
+        )
+        updated += len(changed)
+    return updated
+
+
+def is_stale(project, text):
+    """
+    Returns whether the AttachmentText `text` of the project, or None, does
+    not match its attachment.
+    """
+    name = project.attachments.name
+    if text is None:
+        return bool(name)
+    return text.file_name != name
+
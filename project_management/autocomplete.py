@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import hashlib
+from functools import reduce
+from operator import or_
+
+# Django Imports
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+# Project Imports
+from project_management.models import Client, List, Tags, Technology
+from project_management.utils import bump_cache_version, get_cache_version
+
+
+def _client_text(values):
+    name = ' '.join(
+        part for part in (values['first_name'], values['last_name']) if part
+    )
+    if name and values['email']:
+        return '{} <{}>'.format(name, values['email'])
+    return name or values['email'] or ''
+
+
+def _name_text(values):
+    return values['name']
+
+
+# name: (model, trigram indexed fields, display text)
+AUTOCOMPLETE_MODELS = {
+    'client': (Client, ('first_name', 'last_name', 'email'), _client_text),
+    'list': (List, ('name',), _name_text),
+    'tags': (Tags, ('name',), _name_text),
+    'technology': (Technology, ('name',), _name_text),
+}
+
+MAX_TERM_LENGTH = 50
+
+
+def get_limit():
+    return getattr(settings, 'AUTOCOMPLETE_LIMIT', 20)
+
+
+def get_cache_timeout():
+    return getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 300)
+
+
+def _version_key(name):
+    return 'autocomplete:{}:version'.format(name)
+
+
+def get_version(name):
+    return get_cache_version(_version_key(name))
+
+
+def invalidate(name):
+    """
+    Drops every cached result of one autocomplete source.
+    """
+    bump_cache_version(_version_key(name))
+
+
+def _result_key(name, version, term):
+    return 'autocomplete:results:{}:{}:{}'.format(
+        name, version, hashlib.md5(term.encode('utf-8')).hexdigest()
+    )
+
+
+def normalize(term):
+    return ' '.join(term.lower().split())[:MAX_TERM_LENGTH]
+
+
+def query(name, term, limit):
+    """
+    Returns up to limit + 1 matches ordered by trigram similarity. The
+    icontains filters are served by the UPPER(field) gin_trgm_ops indexes.
+    """
+    model, fields, text = AUTOCOMPLETE_MODELS[name]
+    condition = reduce(or_, [
+        Q(**{'{}__icontains'.format(field): term}) for field in fields
+    ])
+    similarity = [TrigramSimilarity(field, term) for field in fields]
+    if len(similarity) > 1:
+        similarity = [Greatest(*similarity)]
+    rows = model.objects.filter(condition).annotate(
+        similarity=similarity[0]
+    ).order_by('-similarity', 'pk').values('pk', *fields)[:limit + 1]
+    return [
+        {
+            'id': row['pk'],
+            'text': text(row),
+            # matched per field, like the icontains filters
+            'search': [(row[field] or '').lower() for field in fields],
+        }
+        for row in rows
+    ]
+
+
+def search(name, term):
+    """
+    Returns at most AUTOCOMPLETE_LIMIT {'id', 'text'} matches for the term.
+
+    Results are cached per term. When the complete result list of a shorter
+    prefix is cached, the matches for the longer term are filtered from it
+    without querying the database.
+    """
+    term = normalize(term)
+    if not term:
+        return []
+
+    limit = get_limit()
+    version = get_version(name)
+    keys = [
+        _result_key(name, version, term[:length])
+        for length in range(len(term), 0, -1)
+    ]
+    cached = cache.get_many(keys)
+
+    entry = cached.get(keys[0])
+    if entry is None:
+        # the longest cached prefix holds the fewest candidates
+        prefix = next(
+            (cached[key] for key in keys[1:] if key in cached), None
+        )
+        if prefix is not None and prefix['complete']:
+            results = [
+                result for result in prefix['results']
+                if any(term in value for value in result['search'])
+            ]
+        else:
+            results = query(name, term, limit)
+        entry = {
+            'results': results[:limit],
+            'complete': len(results) <= limit,
+        }
+        cache.set(keys[0], entry, get_cache_timeout())
+
+    return [
+        {'id': result['id'], 'text': result['text']}
+        for result in entry['results']
+    ]
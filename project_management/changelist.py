@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import base64
+import binascii
+import json
+import logging
+import time
+
+# Django Imports
+from django.conf import settings
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import PAGE_VAR, ChangeList
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils import six
+from django.utils.encoding import force_bytes, force_text
+from django.utils.functional import cached_property
+
+
+logger = logging.getLogger(__name__)
+
+CURSOR_VAR = 'cursor'
+
+# full_result_count_strategy values
+FULL_COUNT_EXACT, FULL_COUNT_ESTIMATE, FULL_COUNT_NONE = (
+    'exact', 'estimate', 'none'
+)
+
+
+def get_estimate_threshold():
+    return getattr(settings, 'ESTIMATED_COUNT_THRESHOLD', 10000)
+
+
+def estimate_count(queryset):
+    """
+    Returns PostgreSQL's row estimate for the queryset: pg_class.reltuples
+    for a whole table, the planner's estimate otherwise. Returns None on
+    other databases or when the table has never been analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    query = queryset.order_by().query
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = query.sql_with_params()
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+            if not isinstance(plan, list):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    # reltuples is -1 (0 before PostgreSQL 14) until the first ANALYZE
+    return int(estimate) if estimate > 0 else None
+
+
+def count(queryset, threshold):
+    """
+    Returns (count, estimated): the estimate when it is at least
+    `threshold`, the exact COUNT(*) otherwise.
+    """
+    start = time.time()
+    estimate = estimate_count(queryset)
+    if estimate is not None and estimate >= threshold:
+        result, estimated = estimate, True
+    else:
+        result, estimated = queryset.count(), False
+    logger.debug(
+        '%s count of %s: %d in %.1fms',
+        'estimated' if estimated else 'exact',
+        queryset.model._meta.label, result, (time.time() - start) * 1000
+    )
+    return result, estimated
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator using the planner's row estimate instead of COUNT(*) for
+    results larger than ESTIMATED_COUNT_THRESHOLD, so the last pages may
+    be empty or missing when the estimate is off.
+    """
+    threshold = None
+    estimated = False
+
+    @cached_property
+    def count(self):
+        result, self.estimated = count(
+            self.object_list, self.threshold or get_estimate_threshold()
+        )
+        return result
+
+
+class PrefetchChangeList(ChangeList):
+    """
+    ChangeList that prefetches the relations rendered by list_display, so
+    every row of the page is built from the same handful of queries.
+    """
+
+    def get_queryset(self, request):
+        queryset = super(PrefetchChangeList, self).get_queryset(request)
+        prefetch_related = self.model_admin.get_list_prefetch_related(request)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        return queryset
+
+
+class PrefetchChangeListMixin(object):
+    """
+    Adds a `list_prefetch_related` option to a ModelAdmin, the many-to-many
+    counterpart of `list_select_related`. It is only applied to the
+    changelist, so change forms keep using the plain queryset.
+    """
+    list_prefetch_related = ()
+
+    def get_list_prefetch_related(self, request):
+        return self.list_prefetch_related
+
+    def get_changelist(self, request, **kwargs):
+        return PrefetchChangeList
+
+
+def keyset_condition(keys, values, forward=True):
+    """
+    Returns the filter selecting the rows after (or before, when not
+    forward) `values` in the order given by keys, a list of
+    (field name, descending) pairs.
+    """
+    condition = Q()
+    for i, (name, descending) in enumerate(keys):
+        lookup = 'lt' if descending == forward else 'gt'
+        step = Q(**{'{}__{}'.format(name, lookup): values[i]})
+        for previous, value in zip(keys[:i], values):
+            step &= Q(**{previous[0]: value})
+        condition = step if i == 0 else condition | step
+    return condition
+
+
+class KeysetChangeList(PrefetchChangeList):
+    """
+    Paginates with a cursor holding the ordering values of the first or
+    last row of the page instead of an OFFSET, when the changelist is
+    ordered by the primary key or one of the admin's `keyset_fields`.
+    Other orderings and explicit ?p= page numbers keep Django's paginator.
+    """
+    keyset = None
+    next_url = previous_url = first_url = None
+
+    def get_filters_params(self, params=None):
+        lookup_params = super(KeysetChangeList, self).get_filters_params(
+            params
+        )
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # filter, search and sort links start again from the first page
+        new_params = new_params or {}
+        if CURSOR_VAR not in new_params:
+            remove = list(remove or []) + [CURSOR_VAR]
+        return super(KeysetChangeList, self).get_query_string(
+            new_params, remove
+        )
+
+    def get_keyset(self):
+        """
+        Returns the (field name, descending) pairs of the queryset ordering
+        or None when it cannot be paginated with a cursor.
+        """
+        opts = self.lookup_opts
+        keys = []
+        for ordering in self.queryset.query.order_by:
+            if not isinstance(ordering, six.string_types):
+                return None
+            name = ordering.lstrip('-')
+            keys.append(
+                (opts.pk.name if name == 'pk' else name,
+                 ordering.startswith('-'))
+            )
+        if not keys or keys[-1][0] != opts.pk.name:
+            return None
+        allowed = self.model_admin.keyset_fields
+        if any(name not in allowed for name, descending in keys[:-1]):
+            return None
+        return keys
+
+    def encode_cursor(self, obj, forward):
+        values = [
+            self.lookup_opts.get_field(name).value_to_string(obj)
+            for name, descending in self.keyset
+        ]
+        data = force_bytes(json.dumps([forward, values]))
+        return force_text(base64.urlsafe_b64encode(data))
+
+    def decode_cursor(self, cursor):
+        try:
+            forward, values = json.loads(force_text(
+                base64.urlsafe_b64decode(force_bytes(cursor))
+            ))
+            return bool(forward), [
+                self.lookup_opts.get_field(name).to_python(value)
+                for (name, descending), value in zip(self.keyset, values)
+            ]
+        except (TypeError, ValueError, ValidationError, binascii.Error):
+            raise IncorrectLookupParameters
+
+    def get_results(self, request):
+        super(KeysetChangeList, self).get_results(request)
+        if (self.show_all and self.can_show_all) or self.list_editable or \
+                PAGE_VAR in request.GET:
+            return
+        keyset = self.get_keyset()
+        if keyset is None:
+            return
+        self.keyset = keyset
+
+        queryset = self.queryset
+        cursor = request.GET.get(CURSOR_VAR)
+        forward = True
+        if cursor:
+            forward, values = self.decode_cursor(cursor)
+            if len(values) != len(keyset):
+                raise IncorrectLookupParameters
+            queryset = queryset.filter(
+                keyset_condition(keyset, values, forward)
+            )
+        if not forward:
+            queryset = queryset.reverse()
+
+        rows = list(queryset[:self.list_per_page + 1])
+        more = len(rows) > self.list_per_page
+        rows = rows[:self.list_per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = more, bool(cursor)
+        else:
+            has_next, has_previous = True, more
+        if rows and has_next:
+            self.next_url = self.get_query_string({
+                CURSOR_VAR: self.encode_cursor(rows[-1], True)
+            })
+        if rows and has_previous:
+            self.previous_url = self.get_query_string({
+                CURSOR_VAR: self.encode_cursor(rows[0], False)
+            })
+        if cursor:
+            self.first_url = self.get_query_string()
+        self.result_list = rows
+        self.multi_page = bool(self.next_url or self.previous_url)
+
+
+class EstimatedCountChangeList(KeysetChangeList):
+
+    def get_results(self, request):
+        super(EstimatedCountChangeList, self).get_results(request)
+        strategy = self.model_admin.full_result_count_strategy
+        if strategy == FULL_COUNT_ESTIMATE:
+            self.full_result_count, estimated = count(
+                self.root_queryset, get_estimate_threshold()
+            )
+            self.show_full_result_count = True
+            self.show_admin_actions = bool(self.full_result_count)
+
+
+class KeysetPaginationMixin(PrefetchChangeListMixin):
+    """
+    Uses cursor pagination on the changelist when it is ordered by the
+    primary key or by one of `keyset_fields`. Each field needs an index
+    on (field, id) and must not be nullable.
+    """
+    keyset_fields = ()
+
+    def get_changelist(self, request, **kwargs):
+        return KeysetChangeList
+
+
+class EstimatedCountMixin(KeysetPaginationMixin):
+    """
+    Counts large changelists with PostgreSQL's estimates instead of
+    COUNT(*). `full_result_count_strategy` chooses how the unfiltered
+    total next to the search box is counted: FULL_COUNT_EXACT,
+    FULL_COUNT_ESTIMATE or FULL_COUNT_NONE to hide it.
+    """
+    paginator = EstimatedCountPaginator
+    full_result_count_strategy = FULL_COUNT_ESTIMATE
+
+    @property
+    def show_full_result_count(self):
+        # the estimate is filled in by EstimatedCountChangeList
+        return self.full_result_count_strategy == FULL_COUNT_EXACT
+
+    def get_changelist(self, request, **kwargs):
+        return EstimatedCountChangeList
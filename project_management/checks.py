@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.conf import settings
+from django.core.checks import Warning, register
+
+
+# cache backends whose entries other processes do not see
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.dummy.DummyCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warns when the default cache is local to each process: the version
+    keys invalidating the Domain tree, facet counts, autocomplete results
+    and similar project index would not reach the other processes.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            'The default cache is not shared between processes.',
+            hint=(
+                'Use memcached or another shared backend, or the other '
+                'processes keep serving stale domain trees, facet counts '
+                'and autocomplete results.'
+            ),
+            id='project_management.W001',
+        )]
+    return []
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import json
+from decimal import Decimal, InvalidOperation
+
+# Django Imports
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+# Project Imports
+from project_management import facets
+from project_management.models import ExchangeRate, Project
+
+
+def get_base_currency():
+    return getattr(settings, 'BASE_CURRENCY', 'USD')
+
+
+def get_rates(currencies=None):
+    """
+    Returns {currency: rate to the base currency}, the base currency
+    itself included.
+    """
+    rates = ExchangeRate.objects.all()
+    if currencies is not None:
+        rates = rates.filter(currency__in=currencies)
+    rates = dict(rates.values_list('currency', 'rate'))
+    rates[get_base_currency()] = Decimal(1)
+    return rates
+
+
+def to_base(money, rates=None):
+    """
+    Returns a Money amount in the base currency, or None when there is no
+    rate for its currency.
+    """
+    if money is None:
+        return None
+    currency = money.currency.code
+    if rates is None:
+        rates = get_rates([currency])
+    rate = rates.get(currency)
+    if rate is None:
+        return None
+    return (money.amount * rate).quantize(Decimal('0.01'))
+
+
+def base_budget(rates):
+    """
+    Expression converting project_budget to the base currency with the
+    given rates, NULL for the other currencies.
+    """
+    field = Project._meta.get_field('project_budget_base')
+    rate_field = ExchangeRate._meta.get_field('rate')
+    return Case(
+        *[
+            When(project_budget_currency=currency, then=(
+                F('project_budget') * Value(rate, output_field=rate_field)
+            ))
+            for currency, rate in sorted(rates.items())
+        ],
+        default=Value(None),
+        output_field=field
+    )
+
+
+def update_base_budgets(queryset=None, currencies=None):
+    """
+    Recalculates project_budget_base of the projects of the queryset, or
+    of every project in `currencies`, with one UPDATE, and drops the cached
+    facet counts.
+    """
+    if queryset is None:
+        queryset = Project.objects.all()
+    if currencies is not None:
+        queryset = queryset.filter(project_budget_currency__in=currencies)
+    updated = queryset.update(project_budget_base=base_budget(get_rates()))
+    # queryset updates send no signals; the budget range facet counts are
+    # computed from project_budget_base
+    facets.invalidate(Project)
+    return updated
+
+
+def parse_rates(text, format='csv'):
+    """
+    Reads {currency: rate} from a JSON object or from lines of currency
+    and rate separated by a comma, optionally below a header line.
+    """
+    if format == 'json':
+        items = list(json.loads(text).items())
+    else:
+        items = [
+            line.split(',')[:2] for line in text.splitlines() if line.strip()
+        ]
+        if items and items[0][0].strip().lower() == 'currency':
+            items = items[1:]
+    rates = {}
+    for currency, rate in items:
+        currency = currency.strip().upper()
+        try:
+            rate = Decimal(str(rate).strip())
+        except InvalidOperation:
+            rate = None
+        if len(currency) != 3 or rate is None or rate <= 0:
+            raise ValueError('Invalid rate for {}'.format(currency))
+        rates[currency] = rate
+    return rates
+
+
+@transaction.atomic
+def set_rates(rates):
+    """
+    Stores the rates and recalculates the budgets of the projects whose
+    currency rate changed, with one UPDATE. Returns the changed currencies.
+    """
+    current = dict(ExchangeRate.objects.values_list('currency', 'rate'))
+    changed = sorted(
+        currency for currency, rate in rates.items()
+        if current.get(currency) != rate
+    )
+    # saved without signals, the budgets are updated once below
+    for currency in changed:
+        if currency in current:
+            ExchangeRate.objects.filter(currency=currency).update(
+                rate=rates[currency], updated_on=timezone.now()
+            )
+    ExchangeRate.objects.bulk_create([
+        ExchangeRate(currency=currency, rate=rates[currency])
+        for currency in changed if currency not in current
+    ])
+    if changed:
+        update_base_budgets(currencies=changed)
+    return changed
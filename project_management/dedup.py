@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import re
+import unicodedata
+from collections import namedtuple
+from difflib import SequenceMatcher
+from itertools import combinations
+
+# Django Imports
+import phonenumbers
+from django.conf import settings
+from django.db import transaction
+from django.utils.encoding import force_text
+
+# Project Imports
+from project_management.models import Client, ClientDuplicate, Project
+from project_management.summary import refresh_summaries
+from project_management.utils import chunked
+
+
+ClientRecord = namedtuple(
+    'ClientRecord', 'pk name phonetic phone email skype country'
+)
+
+SOUNDEX_CODES = dict(
+    (letter, code)
+    for letters, code in (
+        ('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'),
+        ('mn', '5'), ('r', '6'),
+    )
+    for letter in letters
+)
+
+# evidence of a duplicate: weight of an equal normalized value
+MATCH_WEIGHTS = (
+    ('phone', 0.5),
+    ('email', 0.4),
+    ('skype', 0.5),
+    ('country', 0.1),
+)
+NAME_WEIGHT = 0.4
+
+
+def get_threshold():
+    return getattr(settings, 'CLIENT_DUPLICATE_THRESHOLD', 0.6)
+
+
+def get_max_block_size():
+    return getattr(settings, 'CLIENT_DUPLICATE_MAX_BLOCK', 50)
+
+
+def normalize_text(value):
+    """
+    Lowercases and strips accents and everything but letters and digits.
+    """
+    value = unicodedata.normalize('NFKD', force_text(value or ''))
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return re.sub(r'[\W_]+', '', value.lower())
+
+
+def soundex(value):
+    letters = [char for char in normalize_text(value) if char.isalpha()]
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    previous = SOUNDEX_CODES.get(letters[0], '')
+    for letter in letters[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+        # h and w do not separate letters with the same code
+        if letter not in 'hw':
+            previous = digit
+    return (code + '000')[:4]
+
+
+def normalize_phone(value, country=None):
+    """
+    Returns the number in E.164, or its digits when it does not parse.
+    """
+    value = force_text(value or '').strip()
+    if not value:
+        return ''
+    try:
+        number = phonenumbers.parse(value, force_text(country or '') or None)
+    except phonenumbers.NumberParseException:
+        return re.sub(r'\D', '', value)
+    return phonenumbers.format_number(
+        number, phonenumbers.PhoneNumberFormat.E164
+    )
+
+
+def normalize_email(value):
+    """
+    Returns the local part of the address without dots or a +tag, which
+    mail providers commonly ignore.
+    """
+    local = force_text(value or '').strip().lower().split('@')[0]
+    return local.split('+')[0].replace('.', '')
+
+
+def normalize_skype(value):
+    value = force_text(value or '').strip().lower()
+    if value.startswith('live:'):
+        value = value[len('live:'):]
+    return normalize_text(value)
+
+
+def make_record(pk, first_name, last_name, email, phone_number, skype_id,
+                country):
+    first, last = normalize_text(first_name), normalize_text(last_name)
+    return ClientRecord(
+        pk=pk,
+        name=' '.join(part for part in (first, last) if part),
+        phonetic='{}{}'.format(soundex(last), first[:1]) if last else '',
+        phone=normalize_phone(phone_number, country),
+        email=normalize_email(email),
+        skype=normalize_skype(skype_id),
+        country=force_text(country or ''),
+    )
+
+
+def blocking_keys(record):
+    """
+    Returns the keys a duplicate of the record most likely shares: its
+    phonetic name, phone, email local part and Skype id.
+    """
+    keys = []
+    for field in ('phonetic', 'phone', 'email', 'skype'):
+        value = getattr(record, field)
+        if value:
+            keys.append((field, value))
+    return keys
+
+
+def score(first, second):
+    """
+    Returns the likelihood that two records are the same client, from 0
+    to 1, and the fields that matched.
+    """
+    total, reasons = 0.0, []
+    for field, weight in MATCH_WEIGHTS:
+        value = getattr(first, field)
+        if value and value == getattr(second, field):
+            total += weight
+            reasons.append(field)
+    if first.name and second.name:
+        similarity = SequenceMatcher(None, first.name, second.name).ratio()
+        if similarity > 0.8:
+            total += NAME_WEIGHT * similarity
+            reasons.append('name')
+    return min(total, 1.0), reasons
+
+
+def load_records(queryset=None, chunk_size=5000):
+    """
+    Yields a ClientRecord per client, reading chunk_size clients per query
+    in primary key order.
+    """
+    if queryset is None:
+        queryset = Client.objects.all()
+    queryset = queryset.order_by('pk').values_list(
+        'pk', 'first_name', 'last_name', 'email', 'phone_number',
+        'skype_id', 'country'
+    )
+    last_pk = 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not rows:
+            return
+        for row in rows:
+            yield make_record(*row)
+        last_pk = rows[-1][0]
+
+
+def find_duplicates(records, threshold=None, max_block_size=None):
+    """
+    Returns [(pk, duplicate pk, score, reasons)] of the record pairs
+    scoring at least `threshold`. Only pairs sharing a blocking key are
+    compared; keys shared by more than max_block_size records, such as a
+    placeholder phone number, are ignored.
+    """
+    threshold = get_threshold() if threshold is None else threshold
+    max_block_size = max_block_size or get_max_block_size()
+    by_pk, blocks = {}, {}
+    for record in records:
+        by_pk[record.pk] = record
+        for key in blocking_keys(record):
+            blocks.setdefault(key, []).append(record.pk)
+
+    candidates = set()
+    for pks in blocks.values():
+        if 1 < len(pks) <= max_block_size:
+            candidates.update(combinations(sorted(pks), 2))
+
+    duplicates = []
+    for first, second in sorted(candidates):
+        value, reasons = score(by_pk[first], by_pk[second])
+        if value >= threshold:
+            duplicates.append((first, second, value, reasons))
+    return duplicates
+
+
+@transaction.atomic
+def save_duplicates(duplicates, batch_size=1000):
+    """
+    Replaces the stored ClientDuplicate pairs.
+    """
+    ClientDuplicate.objects.all().delete()
+    for batch in chunked(duplicates, batch_size):
+        ClientDuplicate.objects.bulk_create([
+            ClientDuplicate(
+                client_id=first, duplicate_id=second, score=value,
+                reasons=', '.join(reasons)
+            )
+            for first, second, value, reasons in batch
+        ])
+
+
+@transaction.atomic
+def merge_clients(client, duplicates):
+    """
+    Moves the projects of the duplicates to client with one UPDATE, fills
+    the client's empty fields from them and deletes them. Returns the
+    number of projects moved.
+    """
+    duplicates = [
+        duplicate for duplicate in duplicates if duplicate.pk != client.pk
+    ]
+    projects = Project.objects.filter(client__in=duplicates)
+    pks = list(projects.values_list('pk', flat=True))
+    projects.update(client=client)
+
+    for field in ('first_name', 'last_name', 'email', 'phone_number',
+                  'skype_id', 'platform', 'feedback'):
+        if not getattr(client, field):
+            for duplicate in duplicates:
+                if getattr(duplicate, field):
+                    setattr(client, field, getattr(duplicate, field))
+                    break
+    # email is unique, the duplicates go before the client takes theirs
+    for duplicate in duplicates:
+        duplicate.delete()
+    client.save()
+
+    # update() does not send the signals maintaining the summaries
+    refresh_summaries(pks)
+    return len(pks)
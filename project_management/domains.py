@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import uuid
+from collections import namedtuple
+
+# Django Imports
+from django.conf import settings
+from django.core.cache import cache
+
+# Project Imports
+from project_management.models import Domain
+
+
+DomainNode = namedtuple(
+    'DomainNode', 'pk name parent_id tree_id lft rght level active'
+)
+
+VERSION_KEY = 'domains:tree:version'
+
+# the tree of the last version read by this process
+_local = {}
+
+
+def get_version():
+    # a random token rather than a counter, so a flushed cache does not
+    # restart at a version some process still holds in memory
+    return cache.get_or_set(VERSION_KEY, lambda: uuid.uuid4().hex, None)
+
+
+def get_cache_timeout():
+    return getattr(settings, 'DOMAIN_TREE_CACHE_TIMEOUT', 3600)
+
+
+class DomainTree(object):
+    """
+    The whole Domain tree in (tree_id, lft) order. The descendants of a
+    node are the nodes following it up to its rght, so subtrees are
+    slices of the node list.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = list(nodes)
+        self.positions = dict(
+            (node.pk, position) for position, node in enumerate(self.nodes)
+        )
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, pk):
+        return pk in self.positions
+
+    def __getitem__(self, pk):
+        return self.nodes[self.positions[pk]]
+
+    def descendants(self, pk, include_self=False):
+        position = self.positions[pk]
+        node = self.nodes[position]
+        start = position if include_self else position + 1
+        return self.nodes[start:position + 1 + (node.rght - node.lft) // 2]
+
+    def ancestors(self, pk, include_self=False):
+        node = self[pk]
+        ancestors = [node] if include_self else []
+        while node.parent_id is not None:
+            node = self[node.parent_id]
+            ancestors.append(node)
+        ancestors.reverse()
+        return ancestors
+
+
+def load_tree():
+    rows = Domain._tree_manager.order_by('tree_id', 'lft').values_list(
+        'pk', 'name', 'parent_id', 'tree_id', 'lft', 'rght', 'mptt_level',
+        'active'
+    )
+    return DomainTree(DomainNode(*row) for row in rows)
+
+
+def get_tree():
+    """
+    Returns the DomainTree, kept in process memory and in the cache until
+    a domain is saved, moved or deleted.
+    """
+    version = get_version()
+    if _local.get('version') == version:
+        return _local['tree']
+
+    key = 'domains:tree:{}'.format(version)
+    nodes = cache.get(key)
+    if nodes is None:
+        tree = load_tree()
+        cache.set(key, tree.nodes, get_cache_timeout())
+    else:
+        tree = DomainTree(nodes)
+    _local.update(version=version, tree=tree)
+    return tree
+
+
+def invalidate():
+    """
+    Drops the cached tree in every process sharing the cache, which is why
+    CACHES must not be process local. Domain.objects.rebuild() and
+    other queryset updates of lft/rght do not send signals and must call
+    this themselves.
+    """
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def filter_subtree(queryset, field_name, pk):
+    """
+    Filters queryset to the objects whose `field_name` many-to-many
+    relation includes the domain `pk` or one of its descendants, as one
+    semi-join of the through table on a tree_id/lft range of Domain.
+    Raises KeyError for an unknown domain.
+    """
+    node = get_tree()[int(pk)]
+    field = queryset.model._meta.get_field(field_name)
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    rows = field.remote_field.through.objects.filter(**{
+        '{}__tree_id'.format(target): node.tree_id,
+        '{}__lft__range'.format(target): (node.lft, node.rght),
+    }).values('{}_id'.format(source))
+    return queryset.filter(pk__in=rows)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import csv
+import decimal
+import tempfile
+from collections import defaultdict
+
+# Django Imports
+from django.conf import settings
+from django.utils import six
+from django.utils.encoding import force_text
+from openpyxl import Workbook
+
+
+CSV_CONTENT_TYPE = 'text/csv'
+XLSX_CONTENT_TYPE = (
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+)
+
+# Size of the blocks the finished xlsx file is streamed in
+FILE_BLOCK_SIZE = 64 * 1024
+
+
+def get_chunk_size():
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+
+class Echo(object):
+    """
+    File-like object whose write() hands the value straight back, so a
+    csv.writer can be used to format a single row at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_chunks(queryset, chunk_size):
+    """
+    Yields lists of at most chunk_size objects, reading the queryset
+    through a server-side cursor.
+    """
+    chunk = []
+    for obj in queryset.iterator():
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def get_m2m_values(model, field_name, pks):
+    """
+    Returns a {pk: [related names]} map for one many-to-many field of the
+    given objects, using a single query on the through table.
+    """
+    field = model._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+
+    values = defaultdict(list)
+    rows = through.objects.filter(
+        **{'{}__in'.format(source): pks}
+    ).select_related(target).order_by('pk')
+    for row in rows:
+        values[getattr(row, '{}_id'.format(source))].append(
+            force_text(getattr(row, target))
+        )
+    return values
+
+
+def export_rows(queryset, field_names, m2m_field_names=(), chunk_size=None):
+    """
+    Yields the header followed by one list of values per object. Foreign
+    keys are joined in the main query and many-to-many fields are resolved
+    once per chunk instead of once per row.
+    """
+    model = queryset.model
+    chunk_size = chunk_size or get_chunk_size()
+    related_names = [
+        name for name in field_names
+        if model._meta.get_field(name).is_relation
+    ]
+    queryset = queryset.select_related(*related_names).prefetch_related(None)
+
+    yield list(field_names) + list(m2m_field_names)
+    for chunk in iter_chunks(queryset, chunk_size):
+        pks = [obj.pk for obj in chunk]
+        m2m_values = dict(
+            (name, get_m2m_values(model, name, pks))
+            for name in m2m_field_names
+        )
+        for obj in chunk:
+            row = [getattr(obj, name) for name in field_names]
+            for name in m2m_field_names:
+                row.append(', '.join(m2m_values[name].get(obj.pk, [])))
+            yield row
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    value = force_text(value)
+    if six.PY2:
+        return value.encode('utf-8')
+    return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def _xlsx_value(value):
+    if value is None or isinstance(
+        value, six.integer_types + (float, bool, decimal.Decimal)
+    ):
+        return value
+    return force_text(value)
+
+
+def stream_xlsx(rows):
+    """
+    Writes the rows with openpyxl's write-only workbook, which flushes each
+    row to disk instead of keeping the sheet in memory, then streams the
+    finished file back in fixed-size blocks.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            block = output.read(FILE_BLOCK_SIZE)
+            if not block:
+                break
+            yield block
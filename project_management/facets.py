@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import hashlib
+import json
+
+# Django Imports
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Case, Count, Q, Value, When
+
+# Project Imports
+from project_management.models import Project
+from project_management.utils import bump_cache_version, get_cache_version
+
+
+# (value, lower bound, upper bound) of the budget range filter, in the
+# base currency
+BUDGET_RANGES = (
+    ('0', 0, 1000),
+    ('1', 1000, 5000),
+    ('2', 5000, 10000),
+    ('3', 10000, 15000),
+    ('4', 15000, None),
+)
+
+
+def budget_range_condition(value):
+    for key, lower, upper in BUDGET_RANGES:
+        if key == value:
+            condition = Q(project_budget_base__gte=lower)
+            if upper is not None:
+                condition &= Q(project_budget_base__lt=upper)
+            return condition
+    return None
+
+
+def budget_range():
+    return Case(
+        *[
+            When(budget_range_condition(key), then=Value(key))
+            for key, lower, upper in BUDGET_RANGES
+        ],
+        output_field=CharField()
+    )
+
+
+# facet name: field name, many-to-many field name or expression per model
+FACETS = {
+    Project: {
+        'project_type': 'project_type',
+        'project_status': 'project_status',
+        'budget_type': 'budget_type',
+        'project_budget_currency': 'project_budget_currency',
+        'budget_range': budget_range,
+        'technologies': 'technologies',
+        'domains': 'domains',
+        'tags': 'tags',
+    },
+}
+
+
+def get_cache_timeout():
+    return getattr(settings, 'FACET_CACHE_TIMEOUT', 600)
+
+
+def _version_key(model):
+    return 'facets:{}:version'.format(model._meta.label_lower)
+
+
+def invalidate(model):
+    """
+    Drops the cached facet counts of every filter combination of a model.
+    """
+    bump_cache_version(_version_key(model))
+
+
+def count_values(queryset, definition):
+    """
+    Returns {value: count} of a facet over the queryset, or for
+    many-to-many facets {value: (name, count)}, in one grouped query.
+    """
+    model = queryset.model
+    pks = queryset.order_by().values('pk')
+    if callable(definition):
+        rows = model._default_manager.filter(pk__in=pks).annotate(
+            facet=definition()
+        ).order_by().values_list('facet').annotate(count=Count('pk'))
+        return dict(rows)
+
+    field = model._meta.get_field(definition)
+    if not field.many_to_many:
+        rows = model._default_manager.filter(pk__in=pks).order_by(
+        ).values_list(definition).annotate(count=Count('pk'))
+        return dict(rows)
+
+    # group the through table directly so the join used by an active
+    # filter on the same relation does not restrict the facet
+    source = field.m2m_field_name()
+    target = field.m2m_reverse_field_name()
+    rows = field.remote_field.through.objects.filter(**{
+        '{}__in'.format(source): pks
+    }).order_by().values_list(
+        '{}_id'.format(target), '{}__name'.format(target)
+    ).annotate(count=Count(source))
+    return dict((pk, (name, count)) for pk, name, count in rows)
+
+
+def get_counts(changelist, name):
+    """
+    Returns the counts of one facet for the changelist's current filters
+    and search, cached until a project changes.
+    """
+    model = changelist.model
+    active = sorted(changelist.get_filters_params().items())
+    digest = hashlib.md5(
+        json.dumps([active, changelist.query]).encode('utf-8')
+    ).hexdigest()
+    key = 'facets:{}:{}:{}:{}'.format(
+        model._meta.label_lower, get_cache_version(_version_key(model)),
+        name, digest
+    )
+    counts = cache.get(key)
+    if counts is None:
+        counts = count_values(changelist.queryset, FACETS[model][name])
+        cache.set(key, counts, get_cache_timeout())
+    return counts
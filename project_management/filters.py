@@ -1,13 +1,27 @@
 # -*- coding: utf-8 -*-
 
 # Django Imports
+from django.conf import settings
 from django.contrib.admin.filters import (
     AllValuesFieldListFilter, ChoicesFieldListFilter, RelatedFieldListFilter,
     RelatedOnlyFieldListFilter
 )
+from django.contrib.admin.utils import (
+    get_fields_from_path, get_model_from_relation, reverse_field_path
+)
 from django.contrib import admin
+from django.urls import reverse
+from django.utils.encoding import force_text
+from django.utils.http import urlencode
 from django.utils.translation import gettext_lazy as _
 
+# Project Imports
+from project_management import domains
+from project_management.facets import budget_range_condition, get_counts
+from project_management.selection import (
+    get_changelist, get_changelist_params
+)
+
 
 class DropdownFilter(AllValuesFieldListFilter):
     template = 'admin/dropdown_filter.html'
@@ -25,9 +39,295 @@ class RelatedOnlyDropdownFilter(RelatedOnlyFieldListFilter):
     template = 'admin/dropdown_filter.html'
 
 
-class BudgetRangeFilter(admin.SimpleListFilter):
+class LazyFilterMixin(object):
+    """
+    Renders only the selected option; the other options are fetched page
+    by page from the filter_choices view when the dropdown is opened.
+    """
+    template = 'admin/lazy_dropdown_filter.html'
+
+    def has_output(self):
+        return True
+
+    @property
+    def choices_url(self):
+        opts = self.model_admin.model._meta
+        return '{}?{}'.format(
+            reverse(
+                'project_management:filter_choices',
+                args=[opts.app_label, opts.model_name]
+            ),
+            urlencode({'field': self.field_path})
+        )
+
+    def selected_display(self):
+        return self.lookup_val
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None and not self.lookup_val_isnull,
+            'query_string': changelist.get_query_string(
+                {}, [self.lookup_kwarg, self.lookup_kwarg_isnull]
+            ),
+            'display': _('All'),
+        }
+        if self.lookup_val is not None:
+            yield {
+                'selected': True,
+                'query_string': changelist.get_query_string(
+                    {self.lookup_kwarg: self.lookup_val},
+                    [self.lookup_kwarg_isnull]
+                ),
+                'display': self.selected_display(),
+            }
+        if self.include_empty_choice:
+            yield {
+                'selected': bool(self.lookup_val_isnull),
+                'query_string': changelist.get_query_string(
+                    {self.lookup_kwarg_isnull: 'True'}, [self.lookup_kwarg]
+                ),
+                'display': self.empty_value_display,
+            }
+
+
+class LazyDropdownFilter(LazyFilterMixin, AllValuesFieldListFilter):
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.model_admin = model_admin
+        super(LazyDropdownFilter, self).__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    @property
+    def include_empty_choice(self):
+        return self.field.null
+
+    @classmethod
+    def get_choices_queryset(cls, request, model_admin, field_path):
+        field = get_fields_from_path(model_admin.model, field_path)[-1]
+        parent_model, reverse_path = reverse_field_path(
+            model_admin.model, field_path
+        )
+        if model_admin.model == parent_model:
+            queryset = model_admin.get_queryset(request)
+        else:
+            queryset = parent_model._default_manager.all()
+        return queryset.exclude(**{'{}__isnull'.format(field.name): True})
+
+    @classmethod
+    def get_choices_page(cls, request, model_admin, field_path, term, offset,
+                         limit):
+        field = get_fields_from_path(model_admin.model, field_path)[-1]
+        queryset = cls.get_choices_queryset(request, model_admin, field_path)
+        if term:
+            queryset = queryset.filter(
+                **{'{}__icontains'.format(field.name): term}
+            )
+        values = queryset.distinct().order_by(field.name).values_list(
+            field.name, flat=True
+        )[offset:offset + limit]
+        return [(force_text(value), force_text(value)) for value in values]
+
+
+class LazyRelatedDropdownFilter(LazyFilterMixin, RelatedFieldListFilter):
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.model_admin = model_admin
+        super(LazyRelatedDropdownFilter, self).__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    def field_choices(self, field, request, model_admin):
+        # loaded on demand by get_choices_page
+        return []
+
+    def selected_display(self):
+        related_model = get_model_from_relation(self.field)
+        obj = related_model._default_manager.filter(
+            **{self.field.target_field.name: self.lookup_val}
+        ).first()
+        return force_text(obj) if obj is not None else self.lookup_val
+
+    @classmethod
+    def get_choices_page(cls, request, model_admin, field_path, term, offset,
+                         limit):
+        field = get_fields_from_path(model_admin.model, field_path)[-1]
+        related_model = get_model_from_relation(field)
+        queryset = related_model._default_manager.all()
+        if term:
+            # search the way the related model's own changelist does
+            related_admin = model_admin.admin_site._registry.get(
+                related_model
+            )
+            if related_admin is not None and related_admin.search_fields:
+                queryset, use_distinct = related_admin.get_search_results(
+                    request, queryset, term
+                )
+                if use_distinct:
+                    queryset = queryset.distinct()
+            else:
+                queryset = queryset.none()
+        if not queryset.ordered:
+            queryset = queryset.order_by('pk')
+        return [
+            (force_text(getattr(obj, field.target_field.attname)),
+             force_text(obj))
+            for obj in queryset[offset:offset + limit]
+        ]
+
+
+def get_lazy_filter(model_admin, request, field_path):
+    """
+    Returns the lazy filter class used for field_path in the admin's
+    list_filter, or None.
+    """
+    for list_filter in model_admin.get_list_filter(request):
+        if isinstance(list_filter, (list, tuple)):
+            path, filter_class = list_filter
+            if (path == field_path and
+                    issubclass(filter_class, LazyFilterMixin)):
+                return filter_class
+    return None
+
+
+def get_filter_page_size():
+    return getattr(settings, 'FILTER_CHOICES_PAGE_SIZE', 50)
+
+
+def with_count(display, count):
+    return '%s (%d)' % (force_text(display), count)
+
+
+class FacetFilterMixin(object):
+    """
+    Appends the number of matching objects to each choice, using the cached
+    counts of the facets module. `facet` defaults to the field path.
+    """
+    facet = None
+
+    def get_facet_counts(self, changelist):
+        return get_counts(changelist, self.facet or self.field_path)
+
+    def get_lookups(self):
+        return self.lookup_choices
+
+    def choices(self, changelist):
+        counts = self.get_facet_counts(changelist)
+        choices = super(FacetFilterMixin, self).choices(changelist)
+        # "All" comes first, followed by one choice per lookup
+        yield next(choices)
+        for (lookup, title), choice in zip(self.get_lookups(), choices):
+            choice['display'] = with_count(title, counts.get(lookup, 0))
+            yield choice
+        for choice in choices:
+            yield choice
+
+
+class FacetChoicesFilter(FacetFilterMixin, ChoicesFieldListFilter):
+    def get_lookups(self):
+        return [
+            (lookup, title) for lookup, title in self.field.flatchoices
+            if lookup is not None
+        ]
+
+
+class FacetRelatedDropdownFilter(LazyRelatedDropdownFilter):
+    """
+    Lists only the related objects present in the current results, with
+    their counts, from one grouped query on the through table. Like the
+    other lazy filters only the selected option is rendered; the pages
+    loaded from filter_choices are counted for the same filters and
+    search, which the cache usually already holds.
+    """
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        # the changelist the options are counted for
+        self.changelist_params = get_changelist_params(request.GET)
+        super(FacetRelatedDropdownFilter, self).__init__(
+            field, request, params, model, model_admin, field_path
+        )
+
+    @property
+    def choices_url(self):
+        return '{}&{}'.format(
+            super(FacetRelatedDropdownFilter, self).choices_url,
+            urlencode({'params': self.changelist_params})
+        )
+
+    @classmethod
+    def get_facet_choices(cls, counts, term=''):
+        return [
+            (pk, with_count(name, count))
+            for pk, (name, count) in sorted(
+                counts.items(), key=lambda item: force_text(item[1][0])
+            )
+            if term in force_text(name).lower()
+        ]
+
+    def selected_display(self):
+        counts = get_counts(self.changelist, self.field_path)
+        for pk, display in self.get_facet_choices(counts):
+            if force_text(pk) == force_text(self.lookup_val):
+                return display
+        return with_count(
+            super(FacetRelatedDropdownFilter, self).selected_display(), 0
+        )
+
+    def choices(self, changelist):
+        self.changelist = changelist
+        return super(FacetRelatedDropdownFilter, self).choices(changelist)
+
+    @classmethod
+    def get_choices_page(cls, request, model_admin, field_path, term, offset,
+                         limit):
+        changelist = get_changelist(
+            model_admin, request, request.GET.get('params', '')
+        )
+        choices = cls.get_facet_choices(
+            get_counts(changelist, field_path), term.lower()
+        )
+        return [
+            (force_text(pk), display)
+            for pk, display in choices[offset:offset + limit]
+        ]
+
+
+class DomainTreeFilter(FacetRelatedDropdownFilter):
+    """
+    Matches the selected domain and all of its descendants. The choices
+    follow the cached domain tree, indented by level; their counts are
+    of projects tagged with the domain itself.
+    """
+
+    @classmethod
+    def get_facet_choices(cls, counts, term=''):
+        return [
+            (node.pk, with_count(
+                u'\u2014 ' * node.level + node.name, counts[node.pk][1]
+            ))
+            for node in domains.get_tree()
+            if node.pk in counts and term in node.name.lower()
+        ]
+
+    def queryset(self, request, queryset):
+        params = dict(self.used_parameters)
+        value = params.pop(self.lookup_kwarg, None)
+        if value is not None:
+            queryset = domains.filter_subtree(
+                queryset, self.field_path, value
+            )
+        return queryset.filter(**params)
+
+
+class BudgetRangeFilter(FacetFilterMixin, admin.SimpleListFilter):
+    """
+    Ranges of the budget converted to settings.BASE_CURRENCY, so amounts
+    in different currencies are compared.
+    """
     title = _('budget range')
     parameter_name = 'project_budget'
+    facet = 'budget_range'
 
     def lookups(self, request, model_admin):
         """
@@ -46,33 +346,15 @@ class BudgetRangeFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == '0':
-            return queryset.filter(
-                project_budget__gte=0, project_budget__lt=1000
-            )
-
-        if self.value() == "1":
-            return queryset.filter(
-                project_budget__gte=1000, project_budget__lt=5000
-            )
-
-        if self.value() == "2":
-            return queryset.filter(
-                project_budget__gte=5000, project_budget__lt=10000
-            )
-
-        if self.value() == "3":
-            return queryset.filter(
-                project_budget__gte=10000, project_budget__lt=15000
-            )
-
-        if self.value() == "4":
-            return queryset.filter(project_budget__gte=15000)
+        condition = budget_range_condition(self.value())
+        if condition is not None:
+            return queryset.filter(condition)
 
 
-class CurrencyTypeFilter(admin.SimpleListFilter):
+class CurrencyTypeFilter(FacetFilterMixin, admin.SimpleListFilter):
     title = _('currency type')
     parameter_name = "project_budget_currency"
+    facet = 'project_budget_currency'
 
     def lookups(self, request, model_admin):
         return (
@@ -82,9 +364,5 @@ class CurrencyTypeFilter(admin.SimpleListFilter):
         )
 
     def queryset(self, request, queryset):
-        if self.value() == "INR":
-            return queryset.filter(project_budget_currency='INR')
-        if self.value() == "USD":
-            return queryset.filter(project_budget_currency='USD')
-        if self.value() == "EUR":
-            return queryset.filter(project_budget_currency='EUR')
+        if self.value() in dict(self.lookup_choices):
+            return queryset.filter(project_budget_currency=self.value())
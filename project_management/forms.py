@@ -3,7 +3,44 @@
 # Django Imports
 from django import forms
 
+# Project Imports
+from project_management.models import PROJECT_TYPE, List
+
 
 class ListForm(forms.Form):
     # Attributes
-    name = forms.CharField(max_length=250)
+    name = forms.CharField(max_length=250, required=False)
+    project_list = forms.ModelChoiceField(
+        queryset=List.objects.order_by('name'), required=False,
+        label='Existing list'
+    )
+
+    def clean(self):
+        cleaned_data = super(ListForm, self).clean()
+        if bool(cleaned_data.get('name')) == bool(
+                cleaned_data.get('project_list')):
+            raise forms.ValidationError(
+                'Enter a name for a new list or choose an existing list.'
+            )
+        return cleaned_data
+
+
+class AnalyticsForm(forms.Form):
+    # Attributes
+    start = forms.DateField(
+        required=False, help_text='First month shown (YYYY-MM-DD)'
+    )
+    end = forms.DateField(
+        required=False, help_text='Last month shown (YYYY-MM-DD)'
+    )
+    project_type = forms.TypedChoiceField(
+        choices=(('', 'All'),) + PROJECT_TYPE, coerce=int, empty_value=None,
+        required=False
+    )
+
+    def clean(self):
+        cleaned_data = super(AnalyticsForm, self).clean()
+        start, end = cleaned_data.get('start'), cleaned_data.get('end')
+        if start and end and start > end:
+            raise forms.ValidationError('The start is after the end.')
+        return cleaned_data
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+
+# Django Imports
+from django.db import connections, router
+from django.utils import timezone
+
+# Project Imports
+from project_management.models import ProjectStatusChange
+
+
+# Stages of the sales funnel, in order
+FUNNEL = (0, 1, 2, 4)
+
+
+def record_changes(changes, user=None):
+    """
+    Appends a ProjectStatusChange per (project pk, previous status, new
+    status) whose status differs, with one bulk INSERT. The previous
+    status of a new project is None.
+    """
+    ProjectStatusChange.objects.bulk_create([
+        ProjectStatusChange(
+            project_id=pk, from_status=previous, to_status=status,
+            changed_by=user
+        )
+        for pk, previous, status in changes if previous != status
+    ])
+
+
+def _execute(sql, params, projects):
+    """
+    Runs sql with `history` bound to the status changes of the projects of
+    the `projects` queryset, or of every project.
+    """
+    opts = ProjectStatusChange._meta
+    db = router.db_for_read(ProjectStatusChange)
+    history = 'SELECT * FROM {}'
+    history_params = ()
+    if projects is not None:
+        db = projects.db
+        project_sql, history_params = projects.order_by().values(
+            'pk'
+        ).query.sql_with_params()
+        history += ' WHERE {} IN ({})'.format(
+            connections[db].ops.quote_name(opts.get_field('project').column),
+            project_sql
+        )
+    history = history.format(connections[db].ops.quote_name(opts.db_table))
+    with connections[db].cursor() as cursor:
+        cursor.execute(
+            'WITH history AS ({}) {}'.format(history, sql),
+            tuple(history_params) + tuple(params)
+        )
+        return cursor.fetchall()
+
+
+def funnel(stages=FUNNEL, since=None, until=None, projects=None):
+    """
+    Returns [(status, projects, conversion)] for each stage: the number of
+    projects that reached the stage or a later one, and that number as a
+    fraction of the previous stage. Only projects whose first status change
+    falls between since and until are counted.
+
+    The furthest stage of each project is found with one grouped query and
+    the counts are accumulated with a window function.
+    """
+    positions = ' '.join(
+        'WHEN {} THEN {}'.format(int(status), position)
+        for position, status in enumerate(stages)
+    )
+    having, params = ['TRUE'], []
+    if since is not None:
+        having.append('MIN(changed_on) >= %s')
+        params.append(since)
+    if until is not None:
+        having.append('MIN(changed_on) < %s')
+        params.append(until)
+    rows = _execute(
+        'SELECT position, SUM(COUNT(*)) OVER (ORDER BY position DESC) '
+        'FROM ('
+        '  SELECT project_id, MAX(CASE to_status {} END) AS position'
+        '  FROM history GROUP BY project_id HAVING {}'
+        ') reached '
+        'WHERE position IS NOT NULL '
+        'GROUP BY position'.format(positions, ' AND '.join(having)),
+        params, projects
+    )
+    reached = dict((position, int(count)) for position, count in rows)
+
+    result = []
+    previous = None
+    for position, status in enumerate(stages):
+        # nobody stopped at a stage without a row, take the next count
+        count = next(
+            (reached[later] for later in range(position, len(stages))
+             if later in reached), 0
+        )
+        conversion = float(count) / previous if previous else None
+        result.append((status, count, conversion))
+        previous = count
+    return result
+
+
+def time_in_stage(projects=None, include_current=False):
+    """
+    Returns {status: (median duration, number of stays)} of the time
+    projects spent in each status, the end of each stay being the next
+    change of the project found with LEAD() over the (project_id,
+    changed_on) index. Stays in the current status are counted up to now
+    when include_current is set.
+    """
+    rows = _execute(
+        'SELECT to_status, COUNT(*), percentile_cont(0.5) WITHIN GROUP ('
+        '  ORDER BY EXTRACT(EPOCH FROM COALESCE(left_on, %s) - changed_on)'
+        ') '
+        'FROM ('
+        '  SELECT to_status, changed_on, LEAD(changed_on) OVER ('
+        '    PARTITION BY project_id ORDER BY changed_on, id'
+        '  ) AS left_on'
+        '  FROM history'
+        ') stays '
+        'WHERE left_on IS NOT NULL OR %s '
+        'GROUP BY to_status',
+        (timezone.now(), include_current), projects
+    )
+    return dict(
+        (status, (datetime.timedelta(seconds=median), count))
+        for status, count, median in rows
+    )
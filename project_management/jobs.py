@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+import tempfile
+import traceback
+
+# Django Imports
+import tablib
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.contenttypes.models import ContentType
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from django.utils.encoding import force_bytes, force_text
+from django.utils.module_loading import import_string
+
+# Project Imports
+from project_management import attachments, thumbnails
+from project_management.exports import (
+    export_rows, get_chunk_size, stream_csv, stream_xlsx
+)
+from project_management.models import (
+    JOB_ATTACHMENT_TEXT, JOB_COMPLETED, JOB_EXPORT, JOB_FAILED, JOB_IMPORT,
+    JOB_PENDING, JOB_RUNNING, JOB_THUMBNAILS, Job, Project
+)
+from project_management.selection import (
+    compact_ids, get_user_request, selection_queryset, serialize_selection
+)
+
+
+EXPORT_STREAMS = {
+    'csv': stream_csv,
+    'xlsx': stream_xlsx,
+}
+
+
+def get_import_chunk_size():
+    return getattr(settings, 'JOB_IMPORT_CHUNK_SIZE', 1000)
+
+
+def get_job_timeout():
+    return getattr(settings, 'JOB_TIMEOUT', 6 * 60 * 60)
+
+
+def enqueue_export(model_admin, request, queryset, file_format='xlsx'):
+    """
+    Queues an export of the action's selection. Only the changelist query
+    string or the selected id ranges are stored, the worker runs the query.
+    """
+    return Job.objects.create(
+        kind=JOB_EXPORT,
+        content_type=ContentType.objects.get_for_model(model_admin.model),
+        created_by=request.user,
+        params={
+            'selection': serialize_selection(request, queryset),
+            'format': file_format,
+        }
+    )
+
+
+def enqueue_import(model_admin, request, import_file, input_format):
+    job = Job(
+        kind=JOB_IMPORT,
+        content_type=ContentType.objects.get_for_model(model_admin.model),
+        created_by=request.user,
+        params={'input_format': '{}.{}'.format(
+            input_format.__module__, input_format.__name__
+        )}
+    )
+    # the upload is copied to MEDIA_ROOT chunk by chunk
+    job.source_file.save(import_file.name, import_file, save=False)
+    job.save()
+    return job
+
+
+def enqueue_projects(kind, pks, user=None):
+    """
+    Queues a job of `kind` updating the given projects, e.g. the logo
+    thumbnails (JOB_THUMBNAILS) or attachment text (JOB_ATTACHMENT_TEXT).
+    """
+    pks = sorted(set(pks))
+    job = Job(
+        kind=kind,
+        content_type=ContentType.objects.get_for_model(Project),
+        params={'pks': pks},
+        total=len(pks)
+    )
+    if user is not None:
+        job.created_by = user
+    job.save()
+    return job
+
+
+def fail_stale_jobs():
+    """
+    Marks the jobs running for more than JOB_TIMEOUT seconds as failed,
+    their worker died. They are not run again: the committed chunks of an
+    import would be imported twice.
+    """
+    now = timezone.now()
+    return Job.objects.filter(
+        status=JOB_RUNNING,
+        started_on__lt=now - datetime.timedelta(seconds=get_job_timeout())
+    ).update(
+        status=JOB_FAILED, finished_on=now,
+        error='The job did not finish within {} seconds.'.format(
+            get_job_timeout()
+        )
+    )
+
+
+def claim_jobs(limit):
+    """
+    Marks up to `limit` pending jobs as running and returns their ids.
+    Rows locked by another worker are skipped, so several workers can
+    share the queue. Stale running jobs are failed first.
+    """
+    fail_stale_jobs()
+    with transaction.atomic():
+        pks = list(
+            Job.objects.select_for_update(skip_locked=True).filter(
+                status=JOB_PENDING
+            ).order_by('created_on').values_list('pk', flat=True)[:limit]
+        )
+        Job.objects.filter(pk__in=pks).update(
+            status=JOB_RUNNING, started_on=timezone.now()
+        )
+    return pks
+
+
+def update_progress(job, processed):
+    job.processed = processed
+    Job.objects.filter(pk=job.pk).update(processed=processed)
+
+
+def track_progress(job, rows, step):
+    """
+    Passes the export rows through, saving the number of rows written
+    every `step` rows. The first row is the header.
+    """
+    processed = -1
+    for row in rows:
+        yield row
+        processed += 1
+        if processed and processed % step == 0:
+            update_progress(job, processed)
+    update_progress(job, max(processed, 0))
+
+
+def run_export(job, model_admin):
+    file_format = job.params.get('format', 'xlsx')
+    # jobs queued before selections were stored list every pk
+    selection = job.params.get('selection') or {
+        'ranges': compact_ids(job.params['pks'])
+    }
+    queryset = selection_queryset(
+        model_admin, get_user_request(job.created_by), selection
+    )
+    job.total = queryset.count()
+    Job.objects.filter(pk=job.pk).update(total=job.total)
+
+    rows = export_rows(
+        queryset, model_admin.get_export_field_names(),
+        model_admin.export_m2m_fields
+    )
+    rows = track_progress(job, rows, get_chunk_size())
+
+    with tempfile.TemporaryFile() as output:
+        for block in EXPORT_STREAMS[file_format](rows):
+            output.write(force_bytes(block))
+        output.seek(0)
+        job.result_file.save(
+            '{}-{}.{}'.format(
+                model_admin.model._meta.model_name, job.pk, file_format
+            ),
+            File(output), save=False
+        )
+
+
+def run_import(job, model_admin):
+    """
+    Imports the uploaded file in chunks of JOB_IMPORT_CHUNK_SIZE rows. Each
+    chunk runs in its own transaction, so a chunk with errors is rolled
+    back and reported while the other chunks are kept. Resources with a
+    bulk_import() method, such as ProjectResource, use it instead of
+    import_data().
+    """
+    input_format = import_string(job.params['input_format'])()
+    job.source_file.open(input_format.get_read_mode())
+    try:
+        data = job.source_file.read()
+    finally:
+        job.source_file.close()
+    if not input_format.is_binary() and model_admin.from_encoding:
+        data = force_text(data, model_admin.from_encoding)
+    dataset = input_format.create_dataset(data)
+
+    job.total = len(dataset)
+    Job.objects.filter(pk=job.pk).update(total=job.total)
+
+    resource = model_admin.get_import_resource_class()()
+    chunk_size = get_import_chunk_size()
+    errors = []
+    for start in range(0, len(dataset), chunk_size):
+        chunk = tablib.Dataset(
+            *dataset[start:start + chunk_size], headers=dataset.headers
+        )
+        if hasattr(resource, 'bulk_import'):
+            result = resource.bulk_import(chunk, user=job.created_by)
+            for number, message in result.errors:
+                errors.append('Row {}: {}'.format(start + number, message))
+        else:
+            result = resource.import_data(
+                chunk, dry_run=False, raise_errors=False,
+                use_transactions=True, file_name=job.source_file.name,
+                user=job.created_by
+            )
+            for error in result.base_errors:
+                errors.append(force_text(error.error))
+            for number, row_errors in result.row_errors():
+                for error in row_errors:
+                    errors.append('Row {}: {}'.format(
+                        start + number, force_text(error.error)
+                    ))
+        update_progress(job, min(start + chunk_size, job.total))
+
+    if errors:
+        job.error = '\n'.join(errors)
+
+
+# update function of the jobs queued with enqueue_projects
+PROJECT_UPDATES = {
+    JOB_ATTACHMENT_TEXT: attachments.update_attachment_texts,
+    JOB_THUMBNAILS: thumbnails.update_thumbnails,
+}
+
+
+def run_project_updates(job, batch_size=100):
+    """
+    Runs the update function of the job kind on the projects listed in the
+    job, `batch_size` projects at a time.
+    """
+    update = PROJECT_UPDATES[job.kind]
+    pks = job.params['pks']
+    job.total = len(pks)
+    for start in range(0, len(pks), batch_size):
+        update(pks[start:start + batch_size])
+        update_progress(job, min(start + batch_size, job.total))
+
+
+def run_job(pk):
+    """
+    Runs a single job previously claimed with claim_jobs.
+    """
+    job = Job.objects.select_related('content_type', 'created_by').get(pk=pk)
+    model_admin = admin.site._registry[job.content_type.model_class()]
+    try:
+        if job.kind == JOB_EXPORT:
+            run_export(job, model_admin)
+        elif job.kind in PROJECT_UPDATES:
+            run_project_updates(job)
+        else:
+            run_import(job, model_admin)
+    except Exception:
+        job.error = traceback.format_exc()
+    job.status = JOB_FAILED if job.error else JOB_COMPLETED
+    job.finished_on = timezone.now()
+    job.save(update_fields=[
+        'status', 'error', 'total', 'processed', 'result_file', 'finished_on'
+    ])
+    return pk
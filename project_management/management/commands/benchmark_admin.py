@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+import json
+import subprocess
+import time
+
+# Django Imports
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin import AllValuesFieldListFilter, SimpleListFilter
+from django.contrib.admin.utils import get_fields_from_path
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.db.models import Max, Min
+from django.test import Client as TestClient, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rangefilter.filter import DateRangeFilter, DateTimeRangeFilter
+
+# Project Imports
+from project_management.management.commands.benchmark_project_import import (
+    Command as ImportBenchmark
+)
+from project_management.models import (
+    Client, Domain, Project, Tags, Technology
+)
+from project_management.resources import ProjectResource
+
+
+class Rollback(Exception):
+    pass
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+            stderr=subprocess.STDOUT
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def date_range(model, field):
+    """
+    Returns the last quarter of the dates of a date or datetime field.
+    """
+    values = model._default_manager.aggregate(
+        start=Min(field.name), end=Max(field.name)
+    )
+    if values['start'] is None:
+        today = datetime.date.today()
+        return today, today
+    start, end = values['start'], values['end']
+    if isinstance(field, models.DateTimeField):
+        start = timezone.localtime(start).date()
+        end = timezone.localtime(end).date()
+    return end - (end - start) // 4, end
+
+
+def filter_params(model_admin, request, list_filter):
+    """
+    Returns the name of a list_filter entry and the changelist query
+    parameters selecting one of its values in the current data.
+    """
+    model = model_admin.model
+    if not isinstance(list_filter, (list, tuple)):
+        if (isinstance(list_filter, type) and
+                issubclass(list_filter, SimpleListFilter)):
+            spec = list_filter(request, {}, model, model_admin)
+            choices = spec.lookup_choices
+            return spec.parameter_name, {
+                spec.parameter_name: choices[len(choices) // 2][0]
+            }
+        list_filter = (list_filter, None)
+    field_path, filter_class = list_filter
+    field = get_fields_from_path(model, field_path)[-1]
+
+    if filter_class and issubclass(filter_class, DateRangeFilter):
+        start, end = date_range(model, field)
+        if issubclass(filter_class, DateTimeRangeFilter):
+            # a date and a time input per bound
+            return field_path, {
+                field_path + '__gte_0': start.isoformat(),
+                field_path + '__gte_1': '00:00:00',
+                field_path + '__lte_0': end.isoformat(),
+                field_path + '__lte_1': '23:59:59',
+            }
+        return field_path, {
+            field_path + '__gte': start.isoformat(),
+            field_path + '__lte': end.isoformat(),
+        }
+    if filter_class and issubclass(filter_class, AllValuesFieldListFilter):
+        value = model._default_manager.exclude(**{
+            field_path: None
+        }).order_by('pk').values_list(field_path, flat=True).first()
+        return field_path, {field_path: value}
+    if field.remote_field:
+        # the first objects generate_benchmark_data creates are the most
+        # used, and the first domain is the root of a whole tree
+        value = field.related_model._default_manager.order_by(
+            'pk'
+        ).values_list('pk', flat=True).first()
+        return field_path, {
+            '{}__{}__exact'.format(
+                field_path, field.target_field.name
+            ): value
+        }
+    if field.flatchoices:
+        return field_path, {
+            field_path + '__exact':
+                field.flatchoices[len(field.flatchoices) // 2][0]
+        }
+    return field_path, {field_path + '__exact': '1'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the Project and Client changelists with each filter and a '
+        'search, their exports, a Project import and the creation of a '
+        'project list through the admin, and counts their queries. The '
+        'results are written to a JSON file to compare with another commit. '
+        'Nothing is saved. Generate data with generate_benchmark_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--search', default='payment')
+        parser.add_argument('--import-rows', type=int, default=1000)
+        parser.add_argument(
+            '--only', default='',
+            help='Only run the benchmarks whose name contains this text.'
+        )
+        parser.add_argument(
+            '--output', help='JSON file the results are written to.'
+        )
+        parser.add_argument(
+            '--compare', help='JSON file of an earlier run to compare with.'
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=10,
+            help='Percentage of a slower median reported as a regression.'
+        )
+
+    def check(self, response, status_code):
+        if response.status_code != status_code:
+            raise CommandError('{} returned {}'.format(
+                response.request['PATH_INFO'], response.status_code
+            ))
+
+    def get(self, url, params):
+        def request():
+            self.check(self.client.get(url, params), 200)
+        return request
+
+    def export(self, url, action, pk):
+        def request():
+            response = self.client.post(url, {
+                'action': action, 'select_across': '1',
+                '_selected_action': [pk],
+            })
+            self.check(response, 200)
+            # the rows are queried while the content is streamed
+            for chunk in response.streaming_content:
+                pass
+        return request
+
+    def create_list(self, url, pk):
+        def request():
+            try:
+                with transaction.atomic():
+                    self.check(self.client.post(url, {
+                        'action': 'create_list', 'select_across': '1',
+                        '_selected_action': [pk],
+                    }), 200)
+                    self.check(self.client.post(
+                        reverse('project_management:create_custom_list'),
+                        {'name': 'Benchmark list'}
+                    ), 302)
+                    raise Rollback
+            except Rollback:
+                pass
+        return request
+
+    def import_projects(self, rows, user):
+        dataset = ImportBenchmark().make_dataset(rows)
+        resource = ProjectResource()
+
+        def request():
+            result = resource.bulk_import(dataset, dry_run=True, user=user)
+            if result.has_errors():
+                raise CommandError('Row {}: {}'.format(*result.errors[0]))
+        return request
+
+    def benchmarks(self, user, options):
+        """
+        Yields the name and the function of each benchmark.
+        """
+        request = RequestFactory().get('/')
+        request.user = user
+        for model in (Project, Client):
+            model_admin = admin.site._registry[model]
+            name = model._meta.model_name
+            url = reverse('admin:project_management_{}_changelist'.format(
+                name
+            ))
+            yield name + ' changelist', self.get(url, {})
+            yield name + ' search', self.get(url, {'q': options['search']})
+            for list_filter in model_admin.list_filter:
+                label, params = filter_params(
+                    model_admin, request, list_filter
+                )
+                yield '{} filter {}'.format(name, label), self.get(
+                    url, params
+                )
+
+            pk = model._default_manager.values_list('pk', flat=True).first()
+            for action in ('export_as_csv', 'export_as_excel'):
+                yield '{} {}'.format(name, action), self.export(
+                    url, action, pk
+                )
+            if model is Project:
+                yield 'project import', self.import_projects(
+                    options['import_rows'], user
+                )
+                yield 'project create_list', self.create_list(
+                    url + '?project_status__exact=4', pk
+                )
+
+    def measure(self, function, repeat):
+        # the first run, which also fills the caches, counts the queries
+        with CaptureQueriesContext(connection) as context:
+            started = time.time()
+            function()
+            first = (time.time() - started) * 1000
+        timings = []
+        for i in range(repeat):
+            started = time.time()
+            function()
+            timings.append((time.time() - started) * 1000)
+        timings = timings or [first]
+        return {
+            'queries': len(context.captured_queries),
+            'first_ms': round(first, 2),
+            'median_ms': round(median(timings), 2),
+            'min_ms': round(min(timings), 2),
+        }
+
+    def compare(self, path, names, results, threshold):
+        with open(path) as file:
+            previous = json.load(file)
+        self.stdout.write('Compared with {} of {}'.format(
+            previous.get('commit') or path, previous.get('created_on')
+        ))
+        regressions = 0
+        for name in names:
+            old = previous['results'].get(name)
+            if old is None:
+                continue
+            new = results[name]
+            change = (
+                (new['median_ms'] - old['median_ms']) * 100 /
+                old['median_ms'] if old['median_ms'] else 0
+            )
+            slower = change > threshold or new['queries'] > old['queries']
+            regressions += slower
+            self.stdout.write(
+                '{:<40} {:>10.1f}ms {:>+8.1f}% {:>6} -> {:<6} queries'
+                '{}'.format(
+                    name, new['median_ms'], change, old['queries'],
+                    new['queries'], '  REGRESSION' if slower else ''
+                )
+            )
+        self.stdout.write('{} regressions'.format(regressions))
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('Create a superuser first.')
+        names, results = [], {}
+        # requests of the test client are not sampled by the profiling
+        # middleware, which would add its queries
+        with override_settings(
+                ALLOWED_HOSTS=settings.ALLOWED_HOSTS + ['testserver'],
+                REQUEST_PROFILE_SAMPLE_RATE=0):
+            self.client = TestClient()
+            self.client.force_login(user)
+            for name, function in self.benchmarks(user, options):
+                if options['only'] not in name:
+                    continue
+                result = self.measure(function, options['repeat'])
+                names.append(name)
+                results[name] = result
+                self.stdout.write(
+                    '{:<40} {:>6} queries {:>10.1f}ms median {:>10.1f}ms '
+                    'first'.format(
+                        name, result['queries'], result['median_ms'],
+                        result['first_ms']
+                    )
+                )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump({
+                    'commit': git_commit(),
+                    'created_on': timezone.now().isoformat(),
+                    'repeat': options['repeat'],
+                    'data': dict(
+                        (model._meta.model_name, model.objects.count())
+                        for model in (Client, Domain, Project, Tags,
+                                      Technology)
+                    ),
+                    'results': results,
+                }, file, indent=2, sort_keys=True)
+        if options['compare']:
+            self.compare(
+                options['compare'], names, results, options['threshold']
+            )
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import time
+
+# Django Imports
+from django.contrib import admin
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+# Project Imports
+from project_management.changelist import estimate_count
+from project_management.models import Client, Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the time of COUNT(*) with the PostgreSQL estimate used by '
+        'the Client and Project changelists, optionally for a search term.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--search', default='')
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def measure(self, function, repeat):
+        start = time.time()
+        for i in range(repeat):
+            result = function()
+        return result, (time.time() - start) * 1000 / repeat
+
+    def handle(self, *args, **options):
+        request = RequestFactory().get('/')
+        for model in (Client, Project):
+            model_admin = admin.site._registry[model]
+            queryset = model._default_manager.all()
+            if options['search']:
+                queryset, use_distinct = model_admin.get_search_results(
+                    request, queryset, options['search']
+                )
+
+            exact, exact_ms = self.measure(queryset.count, options['repeat'])
+            estimate, estimate_ms = self.measure(
+                lambda: estimate_count(queryset), options['repeat']
+            )
+            self.stdout.write(
+                '{:<8} exact {:>9} in {:>8.1f}ms  estimate {:>9} in '
+                '{:>8.1f}ms'.format(
+                    model._meta.model_name, exact, exact_ms,
+                    estimate if estimate is not None else '-', estimate_ms
+                )
+            )
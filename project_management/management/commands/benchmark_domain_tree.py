@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import random
+import time
+
+# Django Imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+# Project Imports
+from project_management import domains
+from project_management.models import Domain, Project
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Times loading the Domain tree from the database, the cache and '
+        'process memory, and filtering projects by a subtree, on a '
+        'generated tree. Nothing is saved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--nodes', type=int, default=10000)
+        parser.add_argument('--children', type=int, default=10)
+        parser.add_argument('--projects', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def measure(self, function, repeat):
+        start = time.time()
+        for i in range(repeat):
+            result = function()
+        return result, (time.time() - start) * 1000 / repeat
+
+    def report(self, label, milliseconds):
+        self.stdout.write('{:<16} {:>10.2f}ms'.format(label, milliseconds))
+
+    def make_tree(self, nodes, children):
+        # `children` per parent, breadth first; lft and rght are set by one
+        # rebuild instead of a tree update per insert
+        created = []
+        with Domain.objects.disable_mptt_updates():
+            for i in range(nodes):
+                created.append(Domain.objects.create(
+                    name='Benchmark domain {}'.format(i),
+                    parent=created[(i - 1) // children] if i else None
+                ))
+        Domain.objects.rebuild()
+        domains.invalidate()
+        return created
+
+    def tag_projects(self, created, count):
+        through = Project.domains.through
+        through.objects.bulk_create([
+            through(project_id=pk, domain_id=random.choice(created).pk)
+            for pk in Project.objects.order_by('pk').values_list(
+                'pk', flat=True
+            )[:count]
+        ])
+
+    def uncached_tree(self):
+        domains.invalidate()
+        return domains.get_tree()
+
+    def cached_tree(self):
+        domains._local.clear()
+        return domains.get_tree()
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        try:
+            with transaction.atomic():
+                created = self.make_tree(options['nodes'], options['children'])
+                self.tag_projects(created, options['projects'])
+
+                tree, milliseconds = self.measure(self.uncached_tree, repeat)
+                self.report('database', milliseconds)
+                tree, milliseconds = self.measure(self.cached_tree, repeat)
+                self.report('cache', milliseconds)
+                tree, milliseconds = self.measure(domains.get_tree, repeat)
+                self.report('memory', milliseconds)
+                self.stdout.write('{} domains'.format(len(tree)))
+
+                for node in (created[0], created[1], created[-1]):
+                    count, milliseconds = self.measure(
+                        lambda: domains.filter_subtree(
+                            Project.objects.all(), 'domains', node.pk
+                        ).count(),
+                        repeat
+                    )
+                    self.report(
+                        'subtree of {}'.format(
+                            len(tree.descendants(node.pk, include_self=True))
+                        ),
+                        milliseconds
+                    )
+                raise Rollback
+        except Rollback:
+            domains.invalidate()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import random
+import time
+
+# Django Imports
+import tablib
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.models import Client, Domain, Tags, Technology
+from project_management.resources import ProjectResource
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares rows/sec of the row by row import_export path with '
+        'ProjectResource.bulk_import on a generated dataset. Nothing is '
+        'saved.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--chunk-size', type=int, default=None)
+
+    def make_dataset(self, rows):
+        tags = list(Tags.objects.values_list('name', flat=True)[:50])
+        technologies = list(
+            Technology.objects.values_list('name', flat=True)[:50]
+        )
+        domains = list(Domain.objects.values_list('name', flat=True)[:50])
+        emails = list(
+            Client.objects.exclude(email=None).values_list(
+                'email', flat=True
+            )[:50]
+        )
+
+        def names(items):
+            return ', '.join(random.sample(items, min(3, len(items))))
+
+        dataset = tablib.Dataset(headers=[
+            'id', 'name', 'url', 'client', 'project_type', 'project_status',
+            'project_start_date', 'budget_type', 'project_budget',
+            'project_budget_currency', 'description', 'tags', 'technologies',
+            'domains',
+        ])
+        for i in range(rows):
+            dataset.append([
+                '', 'Benchmark project {}'.format(i), 'http://example.com',
+                random.choice(emails) if emails else '',
+                random.randint(0, 1), random.randint(0, 4), '2018-01-01',
+                random.randint(0, 1), random.randint(100, 20000),
+                random.choice(['EUR', 'INR', 'USD']), 'Generated project',
+                names(tags), names(technologies), names(domains),
+            ])
+        return dataset
+
+    def report(self, label, rows, seconds):
+        self.stdout.write(
+            '{:<12} {:>8} rows {:>8.2f}s {:>10.1f} rows/sec'.format(
+                label, rows, seconds, rows / seconds if seconds else 0
+            )
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        resource = ProjectResource()
+        user = User.objects.order_by('pk').first()
+        dataset = self.make_dataset(rows)
+
+        start = time.time()
+        result = resource.import_data(
+            dataset, dry_run=True, use_transactions=True, user=user
+        )
+        self.report('import_data', rows, time.time() - start)
+        if result.has_errors():
+            self.stderr.write('import_data reported errors')
+
+        start = time.time()
+        result = resource.bulk_import(
+            dataset, dry_run=True, chunk_size=options['chunk_size'], user=user
+        )
+        self.report('bulk_import', rows, time.time() - start)
+        for number, message in result.errors[:10]:
+            self.stderr.write('Row {}: {}'.format(number, message))
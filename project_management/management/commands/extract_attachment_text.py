@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.attachments import is_stale, update_attachment_texts
+from project_management.jobs import enqueue_projects
+from project_management.models import (
+    JOB_ATTACHMENT_TEXT, AttachmentText, Project
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Extracts the searchable text of the Project attachments uploaded '
+        'or changed since their last extraction.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Number of projects read per query.'
+        )
+        parser.add_argument(
+            '--queue', action='store_true',
+            help='Queue a job per batch for the process_jobs worker pool '
+                 'instead of extracting the text here.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        projects = Project.objects.only('attachments').order_by('pk')
+        checked = updated = 0
+        last_pk = 0
+        while True:
+            batch = list(projects.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            checked += len(batch)
+            texts = dict(
+                (text.project_id, text)
+                for text in AttachmentText.objects.filter(
+                    project__in=batch
+                ).only('project', 'file_name')
+            )
+            pks = [
+                project.pk for project in batch
+                if is_stale(project, texts.get(project.pk))
+            ]
+            if pks and options['queue']:
+                job = enqueue_projects(JOB_ATTACHMENT_TEXT, pks)
+                updated += len(pks)
+                self.stdout.write('Queued job {}'.format(job.pk))
+            elif pks:
+                updated += update_attachment_texts(pks, batch_size)
+            self.stdout.write('{} projects checked, {} {}'.format(
+                checked, updated, 'queued' if options['queue'] else 'updated'
+            ))
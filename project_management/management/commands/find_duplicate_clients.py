@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import time
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.dedup import (
+    find_duplicates, load_records, save_duplicates
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Finds clients that are likely duplicates by their name, phone '
+        'number, email and Skype id, and stores the pairs for review on '
+        'the client duplicates admin page.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threshold', type=float, default=None)
+        parser.add_argument('--max-block-size', type=int, default=None)
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report the pairs without storing them.'
+        )
+
+    def handle(self, *args, **options):
+        start = time.time()
+        records = list(load_records())
+        self.stdout.write('{} clients loaded in {:.1f}s'.format(
+            len(records), time.time() - start
+        ))
+
+        duplicates = find_duplicates(
+            records, options['threshold'], options['max_block_size']
+        )
+        self.stdout.write('{} pairs found in {:.1f}s'.format(
+            len(duplicates), time.time() - start
+        ))
+        if options['dry_run']:
+            for first, second, score, reasons in duplicates[:50]:
+                self.stdout.write('{} {} {:.2f} {}'.format(
+                    first, second, score, ', '.join(reasons)
+                ))
+        else:
+            save_duplicates(duplicates)
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+import random
+import time
+from decimal import Decimal
+
+# Django Imports
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+from djmoney.money import Money
+
+# Project Imports
+from project_management import (
+    analytics, autocomplete, domains, facets, similar
+)
+from project_management.currency import update_base_budgets
+from project_management.history import record_changes
+from project_management.models import (
+    BUDGET_TYPE, PROJECT_STATUS, PROJECT_TYPE, TECH_CATEGORY, Client, Domain,
+    Project, Tags, Technology
+)
+from project_management.search import update_search_vector
+from project_management.summary import refresh_summaries
+from project_management.utils import chunked
+
+
+WORDS = (
+    'account', 'analytics', 'api', 'app', 'booking', 'cart', 'chat',
+    'cloud', 'crm', 'dashboard', 'delivery', 'fitness', 'health', 'hotel',
+    'inventory', 'learning', 'logistics', 'market', 'media', 'mobile',
+    'payment', 'portal', 'real', 'estate', 'report', 'retail', 'school',
+    'social', 'stream', 'travel', 'video', 'wallet', 'web', 'workflow',
+)
+
+FIRST_NAMES = (
+    'Aarav', 'Anna', 'Carlos', 'Chen', 'David', 'Emma', 'Fatima', 'Hans',
+    'Isabel', 'James', 'Li', 'Maria', 'Mohammed', 'Olga', 'Priya', 'Sofia',
+)
+
+LAST_NAMES = (
+    'Brown', 'Garcia', 'Jones', 'Kumar', 'Martin', 'Miller', 'Mueller',
+    'Nguyen', 'Patel', 'Rossi', 'Sharma', 'Silva', 'Smith', 'Wang',
+)
+
+COUNTRIES = ('AU', 'CA', 'DE', 'FR', 'GB', 'IN', 'NL', 'SG', 'US')
+
+PLATFORMS = ('Upwork', 'Freelancer', 'LinkedIn', 'Referral', 'Website')
+
+# most budgets are in the first currency
+CURRENCIES = ('USD', 'USD', 'USD', 'EUR', 'INR')
+
+FIRST_START_DATE = datetime.date(2016, 1, 1)
+
+CREATED_ON = "now() - random() * interval '1095 days'"
+
+# the projects have 1 to `most` of each relation
+RELATIONS = (('tags', 5), ('technologies', 6), ('domains', 3))
+
+
+def skewed(items):
+    """
+    Returns an item of the list, the first ones much more often than the
+    last, like the usage of tags and technologies.
+    """
+    return items[int(len(items) * random.random() ** 3)]
+
+
+def sample(items, count):
+    return set(skewed(items) for i in range(count))
+
+
+def text(words):
+    return ' '.join(random.choice(WORDS) for i in range(words))
+
+
+class Command(BaseCommand):
+    help = (
+        'Inserts generated clients, projects, tags, technologies and a '
+        'Domain tree with bulk queries, and builds the search vectors, '
+        'summaries, status history and rollups the admin reads, for the '
+        'benchmark_admin command.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=100000)
+        parser.add_argument('--projects', type=int, default=500000)
+        parser.add_argument('--tags', type=int, default=2000)
+        parser.add_argument('--technologies', type=int, default=2000)
+        parser.add_argument(
+            '--domain-depth', type=int, default=4,
+            help='Number of levels of the Domain tree.'
+        )
+        parser.add_argument(
+            '--domain-children', type=int, default=8,
+            help='Number of children of each Domain above the last level.'
+        )
+        parser.add_argument(
+            '--prefix', default='bench',
+            help='Prefix of the generated names, unique per run.'
+        )
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Number of rows per INSERT.'
+        )
+
+    def report(self, label, count, started):
+        self.stdout.write('{:<16} {:>9} in {:>8.1f}s'.format(
+            label, count, time.time() - started
+        ))
+
+    def create_names(self, model, count, prefix, batch_size, **extra):
+        started = time.time()
+        objs = model.objects.bulk_create([
+            model(name='{} {}'.format(prefix, i), **dict(
+                (name, function()) for name, function in extra.items()
+            ))
+            for i in range(count)
+        ], batch_size)
+        self.report(model._meta.verbose_name_plural, count, started)
+        return [obj.pk for obj in objs]
+
+    def create_domains(self, depth, children, prefix, batch_size):
+        # a level at a time; lft and rght are set by one rebuild instead of
+        # a tree update per insert
+        started = time.time()
+        pks, parents = [], [None]
+        with Domain.objects.disable_mptt_updates():
+            for level in range(depth):
+                objs = Domain.objects.bulk_create([
+                    Domain(
+                        name='{} domain {}-{}-{}'.format(
+                            prefix, level, parent or 0, i
+                        ),
+                        parent_id=parent, lft=0, rght=0, tree_id=0,
+                        mptt_level=level
+                    )
+                    for parent in parents for i in range(children)
+                ], batch_size)
+                parents = [obj.pk for obj in objs]
+                pks.extend(parents)
+        Domain.objects.rebuild()
+        domains.invalidate()
+        self.report('domains', len(pks), started)
+        return pks
+
+    def create_clients(self, count, prefix, user, batch_size):
+        started = time.time()
+        pks = []
+        for batch in chunked(range(count), batch_size):
+            objs = Client.objects.bulk_create([
+                Client(
+                    first_name=random.choice(FIRST_NAMES),
+                    last_name=random.choice(LAST_NAMES),
+                    email='{}-client-{}@example.com'.format(prefix, i),
+                    skype_id='{}.client.{}'.format(prefix, i),
+                    country=random.choice(COUNTRIES),
+                    platform=random.choice(PLATFORMS),
+                    feedback=text(random.randint(0, 30)) or None,
+                    active=random.random() > 0.1,
+                    created_by=user, updated_by=user,
+                )
+                for i in batch
+            ])
+            batch_pks = [obj.pk for obj in objs]
+            self.spread_created_on(Client, batch_pks)
+            update_search_vector(Client, batch_pks)
+            pks.extend(batch_pks)
+        self.report('clients', len(pks), started)
+        return pks
+
+    def create_projects(self, count, prefix, user, related, batch_size):
+        started = time.time()
+        columns = dict(
+            (name, '{}_id'.format(
+                Project._meta.get_field(name).m2m_reverse_field_name()
+            ))
+            for name, most in RELATIONS
+        )
+        for number, batch in enumerate(chunked(range(count), batch_size)):
+            objs = []
+            for i in batch:
+                start = FIRST_START_DATE + datetime.timedelta(
+                    days=random.randint(0, 1095)
+                )
+                status = random.choice(PROJECT_STATUS)[0]
+                objs.append(Project(
+                    name='{} {} project {}'.format(
+                        random.choice(WORDS).title(), random.choice(WORDS),
+                        i
+                    ),
+                    url='http://{}-{}.example.com'.format(prefix, i),
+                    mobile_url=(
+                        'http://m.{}-{}.example.com'.format(prefix, i)
+                        if random.random() < 0.3 else None
+                    ),
+                    description=text(random.randint(10, 80)),
+                    client_id=(
+                        skewed(related['clients']) if related['clients']
+                        else None
+                    ),
+                    project_type=random.choice(PROJECT_TYPE)[0],
+                    project_status=status,
+                    budget_type=random.choice(BUDGET_TYPE)[0],
+                    project_budget=Money(
+                        Decimal(int(random.lognormvariate(8, 1.2))),
+                        random.choice(CURRENCIES)
+                    ),
+                    project_start_date=start,
+                    # completed projects
+                    project_end_date=(
+                        start + datetime.timedelta(
+                            days=random.randint(30, 365)
+                        ) if status == 4 else None
+                    ),
+                    created_by=user, updated_by=user,
+                ))
+            Project.objects.bulk_create(objs)
+            pks = [obj.pk for obj in objs]
+
+            for name, most in RELATIONS:
+                if not related[name]:
+                    continue
+                through = getattr(Project, name).through
+                through.objects.bulk_create([
+                    through(**{'project_id': pk, columns[name]: related_pk})
+                    for pk in pks
+                    for related_pk in sample(
+                        related[name], random.randint(1, most)
+                    )
+                ], batch_size)
+
+            # bulk queries do not send the signals maintaining the derived
+            # data, see ProjectResource.import_chunk
+            self.spread_created_on(Project, pks)
+            update_base_budgets(Project.objects.filter(pk__in=pks))
+            update_search_vector(Project, pks)
+            refresh_summaries(pks)
+            record_changes(
+                [(obj.pk, None, obj.project_status) for obj in objs], user
+            )
+            similar.mark_changed(pks)
+            self.report(
+                'projects', number * batch_size + len(pks), started
+            )
+
+    def spread_created_on(self, model, pks):
+        # auto_now_add sets every row to now, the changelists sort and the
+        # rollups group by it
+        queryset = model.objects.filter(pk__in=pks)
+        queryset.update(created_on=RawSQL(CREATED_ON, ()))
+        queryset.update(updated_on=F('created_on'))
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_superuser=True).order_by('pk').first()
+        if user is None:
+            raise CommandError('Create a superuser first.')
+        prefix = options['prefix']
+        if Client.objects.filter(
+                email__startswith='{}-client-'.format(prefix)).exists():
+            raise CommandError(
+                'There is data with the prefix {}, use another '
+                '--prefix.'.format(prefix)
+            )
+        random.seed(options['seed'])
+        batch_size = options['batch_size']
+
+        with transaction.atomic():
+            related = {}
+            related['tags'] = self.create_names(
+                Tags, options['tags'], prefix + ' tag', batch_size
+            )
+            related['technologies'] = self.create_names(
+                Technology, options['technologies'], prefix + ' technology',
+                batch_size, category=lambda: random.choice(TECH_CATEGORY)[0]
+            )
+            related['domains'] = self.create_domains(
+                options['domain_depth'], options['domain_children'], prefix,
+                batch_size
+            )
+            related['clients'] = self.create_clients(
+                options['clients'], prefix, user, batch_size
+            )
+            self.create_projects(
+                options['projects'], prefix, user, related, batch_size
+            )
+
+            started = time.time()
+            analytics.rebuild()
+            self.report('rollups', 0, started)
+
+        facets.invalidate(Project)
+        for name in ('client', 'tags', 'technology'):
+            autocomplete.invalidate(name)
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management import thumbnails
+from project_management.jobs import enqueue_projects
+from project_management.models import JOB_THUMBNAILS, Project
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates the missing or outdated Project logo thumbnails, e.g. '
+        'for logos uploaded before thumbnails existed or after changing '
+        'LOGO_THUMBNAIL_SIZES.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Number of projects read per query.'
+        )
+        parser.add_argument(
+            '--queue', action='store_true',
+            help='Queue a job per batch for process_jobs instead of '
+                 'generating the thumbnails here.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        projects = Project.objects.only('logo', 'logo_thumbnails').order_by(
+            'pk'
+        )
+        checked = updated = 0
+        last_pk = 0
+        while True:
+            batch = list(projects.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            checked += len(batch)
+            pks = [
+                project.pk for project in batch
+                if thumbnails.is_stale(project)
+            ]
+            if pks and options['queue']:
+                job = enqueue_projects(JOB_THUMBNAILS, pks)
+                updated += len(pks)
+                self.stdout.write('Queued job {}'.format(job.pk))
+            elif pks:
+                updated += thumbnails.update_thumbnails(pks, batch_size)
+            self.stdout.write('{} projects checked, {} {}'.format(
+                checked, updated, 'queued' if options['queue'] else 'updated'
+            ))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import io
+
+# Django Imports
+from django.core.management.base import BaseCommand, CommandError
+
+# Project Imports
+from project_management.currency import (
+    get_base_currency, parse_rates, set_rates
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads exchange rates to the base currency from a CSV file of '
+        'currency,rate lines or a JSON object, and recalculates the base '
+        'currency budgets of the projects whose rate changed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        try:
+            with io.open(path, encoding='utf-8') as rates_file:
+                rates = parse_rates(
+                    rates_file.read(),
+                    'json' if path.lower().endswith('.json') else 'csv'
+                )
+        except (IOError, ValueError) as e:
+            raise CommandError(e)
+        rates.pop(get_base_currency(), None)
+
+        changed = set_rates(rates)
+        self.stdout.write('{} rates loaded, {} changed: {}'.format(
+            len(rates), len(changed), ', '.join(changed) or '-'
+        ))
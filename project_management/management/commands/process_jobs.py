@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import multiprocessing
+import time
+
+# Django Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+# Project Imports
+from project_management.jobs import claim_jobs, run_job
+
+
+def process_job(pk):
+    """
+    Entry point of the worker processes; database connections are handled
+    the same way as around a request.
+    """
+    close_old_connections()
+    try:
+        return run_job(pk)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        'Processes queued import and export jobs with a pool of worker '
+        'processes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int,
+            default=getattr(settings, 'JOB_WORKER_PROCESSES', 2),
+            help='Number of worker processes.'
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            default=getattr(settings, 'JOB_POLL_INTERVAL', 5),
+            help='Seconds to wait between polls of an empty queue.'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling forever.'
+        )
+
+    def handle(self, *args, **options):
+        processes = options['processes']
+
+        # Worker processes must not share the parent's database connection
+        connections.close_all()
+        pool = multiprocessing.Pool(processes)
+        running = []
+        try:
+            while True:
+                running = [result for result in running if not result.ready()]
+                pks = []
+                if len(running) < processes:
+                    pks = claim_jobs(processes - len(running))
+                    connections.close_all()
+                for pk in pks:
+                    self.stdout.write('Starting job {}'.format(pk))
+                    running.append(pool.apply_async(process_job, (pk,)))
+
+                if not pks:
+                    if options['once'] and not running:
+                        break
+                    time.sleep(options['interval'] if not running else 0.5)
+        finally:
+            pool.close()
+            pool.join()
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.profiling import prune
+
+
+class Command(BaseCommand):
+    help = 'Deletes the old request profiles of the profiling middleware.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'REQUEST_PROFILE_RETENTION_DAYS', 30),
+            help='Number of days of profiles to keep.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('{} request profiles deleted'.format(
+            prune(options['days'])
+        ))
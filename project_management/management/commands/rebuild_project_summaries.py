@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.models import Project
+from project_management.summary import refresh_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the pre-rendered Project changelist columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of projects rebuilt per query.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        done = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                Project.objects.filter(pk__gt=last_pk).order_by(
+                    'pk'
+                ).values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            refresh_summaries(pks, batch_size)
+            done += len(pks)
+            last_pk = pks[-1]
+            self.stdout.write('{} project summaries rebuilt'.format(done))
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.search import SEARCH_VECTORS, update_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the full-text search vectors of clients and projects.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of rows updated per query.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        for model in SEARCH_VECTORS:
+            done = 0
+            last_pk = 0
+            while True:
+                pks = list(
+                    model.objects.filter(pk__gt=last_pk).order_by(
+                        'pk'
+                    ).values_list('pk', flat=True)[:batch_size]
+                )
+                if not pks:
+                    break
+                update_search_vector(model, pks)
+                done += len(pks)
+                last_pk = pks[-1]
+                self.stdout.write('{}: {} rows indexed'.format(
+                    model._meta.verbose_name_plural, done
+                ))
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.analytics import refresh
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the project analytics rollups of the months with projects '
+        'changed since the last run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Rebuild every month.'
+        )
+
+    def handle(self, *args, **options):
+        run = refresh(full=options['full'])
+        self.stdout.write('{} months rebuilt in {:.2f}s'.format(
+            run.months, (run.finished_on - run.started_on).total_seconds()
+        ))
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+
+# Project Imports
+from project_management.models import Project
+from project_management.storage import content_storage, is_content_addressed
+
+
+FIELDS = ('attachments', 'logo')
+
+
+class Command(BaseCommand):
+    help = (
+        'Moves Project attachments and logos uploaded before the content '
+        'addressed storage into it, storing identical files once.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Number of projects read per query.'
+        )
+        parser.add_argument(
+            '--keep-originals', action='store_true',
+            help='Leave the original files in place.'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Only count the files to move.'
+        )
+
+    def handle(self, *args, **options):
+        # the flat MEDIA_ROOT layout the fields used before
+        source_storage = FileSystemStorage()
+        projects = Project.objects.only(*FIELDS + ('logo_thumbnails',))
+        moved = {}
+        missing = updated = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                projects.filter(pk__gt=last_pk).order_by('pk')[
+                    :options['batch_size']
+                ]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            for project in batch:
+                changes = {}
+                for field_name in FIELDS:
+                    name = getattr(project, field_name).name
+                    if not name or is_content_addressed(name):
+                        continue
+                    if options['dry_run']:
+                        moved.setdefault(name, None)
+                        changes[field_name] = None
+                        continue
+                    if name in moved:
+                        # another project has the same file
+                        content_storage.add_reference(
+                            moved[name], source_storage.size(name)
+                        )
+                    elif source_storage.exists(name):
+                        with source_storage.open(name) as content:
+                            moved[name] = content_storage.save(name, content)
+                    else:
+                        missing += 1
+                        self.stderr.write('Missing file {}'.format(name))
+                        continue
+                    changes[field_name] = moved[name]
+                thumbnails = project.logo_thumbnails or {}
+                if changes.get('logo') and thumbnails.get('source'):
+                    # the renditions stay valid for the moved logo
+                    thumbnails['source'] = changes['logo']
+                    changes['logo_thumbnails'] = thumbnails
+                if changes and not options['dry_run']:
+                    # queryset updates do not release the original names
+                    Project.objects.filter(pk=project.pk).update(**changes)
+                if changes:
+                    updated += 1
+            self.stdout.write('{} projects {}, {} files'.format(
+                updated, 'to update' if options['dry_run'] else 'updated',
+                len(moved)
+            ))
+
+        if not options['dry_run'] and not options['keep_originals']:
+            for name in moved:
+                source_storage.delete(name)
+        self.stdout.write('{} files moved, {} missing'.format(
+            len(moved), missing
+        ))
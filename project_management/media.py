@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import mimetypes
+import os
+import posixpath
+import re
+import stat
+
+# Django Imports
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.db.models import Q
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag, urlquote
+from django.utils._os import safe_join
+
+# Project Imports
+from project_management.models import Job
+from project_management.storage import is_content_addressed
+from project_management.thumbnails import RENDITION_NAME
+
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+SENDFILE_HEADERS = {
+    'x-accel-redirect': 'X-Accel-Redirect',
+    'x-sendfile': 'X-Sendfile',
+}
+
+
+def get_sendfile_backend():
+    """
+    Returns 'x-accel-redirect' (nginx), 'x-sendfile' (Apache mod_xsendfile,
+    lighttpd) or None to send files from Django.
+    """
+    return getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+
+
+def get_accel_redirect_prefix():
+    return getattr(
+        settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/'
+    )
+
+
+def get_max_age():
+    return getattr(settings, 'MEDIA_CACHE_MAX_AGE', 0)
+
+
+def resolve(path):
+    """
+    Returns the normalized storage name and the absolute path of a file of
+    MEDIA_ROOT, raising Http404 for directories, missing files and paths
+    outside MEDIA_ROOT.
+    """
+    # the URL resolver has already percent-decoded path
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404
+    try:
+        stat_result = os.stat(full_path)
+    except OSError:
+        raise Http404
+    if not stat.S_ISREG(stat_result.st_mode):
+        raise Http404
+    return name, full_path, stat_result
+
+
+def has_permission(request, name):
+    """
+    Returns whether the staff user may download the file: the files of a
+    background job are only served to its creator, like in JobAdmin.
+    """
+    if not name.startswith('jobs/') or request.user.is_superuser:
+        return True
+    return Job.objects.filter(
+        Q(source_file=name) | Q(result_file=name), created_by=request.user
+    ).exists()
+
+
+def make_etag(stat_result):
+    return quote_etag('{:x}-{:x}'.format(
+        int(stat_result.st_mtime * 1000000), stat_result.st_size
+    ))
+
+
+def parse_range(header, size):
+    """
+    Returns the (start, end) of a single byte range, inclusive, None to
+    send the whole file, or False when the range is not satisfiable.
+    Multiple ranges are answered with the whole file, as RFC 7233 allows.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # the last `last` bytes
+        length = int(last)
+        if not length or not size:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        # invalid, the header is ignored
+        return None
+    if start >= size:
+        return False
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class FileRange(object):
+    """
+    Reads `length` bytes of file from `start`. It has no fileno(), so WSGI
+    servers read it rather than sendfile() the rest of the file.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def serve(request, path):
+    """
+    Returns the response of a GET or HEAD of the MEDIA_ROOT file `path`,
+    answering If-None-Match and If-Modified-Since with 304 and Range with
+    206.
+
+    With MEDIA_SENDFILE_BACKEND set, the web server sends the file from
+    the X-Accel-Redirect or X-Sendfile header. Otherwise whole files are
+    sent with FileResponse, which WSGI servers providing wsgi.file_wrapper
+    (gunicorn, uWSGI) send with sendfile().
+    """
+    name, full_path, stat_result = resolve(path)
+    if not has_permission(request, name):
+        raise Http404
+
+    content_type, encoding = mimetypes.guess_type(full_path)
+    headers = HttpResponse()
+    headers['ETag'] = make_etag(stat_result)
+    headers['Last-Modified'] = http_date(stat_result.st_mtime)
+    # renditions and stored uploads are named after their content
+    if RENDITION_NAME.search(name) or is_content_addressed(name):
+        patch_cache_control(headers, private=True, max_age=31536000)
+    else:
+        patch_cache_control(headers, private=True, max_age=get_max_age())
+    response = get_conditional_response(
+        request, etag=headers['ETag'],
+        last_modified=int(stat_result.st_mtime), response=headers
+    )
+    if response is not headers:
+        return response
+
+    backend = get_sendfile_backend()
+    size = stat_result.st_size
+    if backend == 'x-accel-redirect':
+        headers[SENDFILE_HEADERS[backend]] = urlquote(
+            get_accel_redirect_prefix() + name
+        )
+        response = headers
+    elif backend:
+        headers[SENDFILE_HEADERS[backend]] = full_path
+        response = headers
+    else:
+        byte_range = None
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if (request.META.get('HTTP_RANGE') and
+                if_range in (None, headers['ETag'], headers['Last-Modified'])):
+            byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */{}'.format(size)
+            return response
+
+        if request.method == 'HEAD':
+            response = HttpResponse()
+        elif byte_range:
+            start, end = byte_range
+            response = FileResponse(
+                FileRange(open(full_path, 'rb'), start, end - start + 1)
+            )
+        else:
+            response = FileResponse(open(full_path, 'rb'))
+        if byte_range:
+            start, end = byte_range
+            response.status_code = 206
+            response['Content-Range'] = 'bytes {}-{}/{}'.format(
+                start, end, size
+            )
+            size = end - start + 1
+        response['Content-Length'] = size
+        response['Accept-Ranges'] = 'bytes'
+        for header in ('ETag', 'Last-Modified', 'Cache-Control'):
+            response[header] = headers[header]
+
+    response['Content-Type'] = content_type or 'application/octet-stream'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# The indexes are built on the UPPER(column::text) expression that Django
+# generates for icontains lookups, so those lookups can use them.
+TRIGRAM_INDEXES = (
+    ('project_management_client', 'first_name'),
+    ('project_management_client', 'last_name'),
+    ('project_management_client', 'email'),
+    ('project_management_list', 'name'),
+    ('project_management_tags', 'name'),
+    ('project_management_technology', 'name'),
+)
+
+
+def create_index_sql(table, column):
+    return (
+        'CREATE INDEX {table}_{column}_trgm ON {table} '
+        'USING gin (UPPER("{column}"::text) gin_trgm_ops);'
+    ).format(table=table, column=column)
+
+
+def drop_index_sql(table, column):
+    return 'DROP INDEX IF EXISTS {table}_{column}_trgm;'.format(
+        table=table, column=column
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0008_search_vector'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ] + [
+        migrations.RunSQL(
+            create_index_sql(table, column), drop_index_sql(table, column)
+        )
+        for table, column in TRIGRAM_INDEXES
+    ]
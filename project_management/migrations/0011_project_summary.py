@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 16:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0010_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSummary',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='project_management.Project')),
+                ('client_detail', models.TextField(blank=True)),
+                ('demo_video_link', models.TextField(blank=True)),
+                ('domains', models.TextField(blank=True)),
+                ('mobile_url', models.TextField(blank=True)),
+                ('tags', models.TextField(blank=True)),
+                ('technologies', models.TextField(blank=True)),
+                ('url', models.TextField(blank=True)),
+                ('updated_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'project summaries',
+            },
+        ),
+    ]
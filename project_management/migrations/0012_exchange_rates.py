@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 17:10
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_base_budgets(apps, schema_editor):
+    # only the base currency has a rate until rates are loaded
+    Project = apps.get_model('project_management', 'Project')
+    Project.objects.filter(
+        project_budget_currency=getattr(settings, 'BASE_CURRENCY', 'USD')
+    ).update(project_budget_base=F('project_budget'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0011_project_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExchangeRate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('currency', models.CharField(max_length=3, unique=True)),
+                ('rate', models.DecimalField(decimal_places=8, max_digits=18)),
+                ('updated_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['currency'],
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='project_budget_base',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=20, null=True),
+        ),
+        migrations.RunPython(set_base_budgets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 17:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0012_exchange_rates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingRollupMonth',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PipelineRollup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('project_status', models.IntegerField(choices=[(0, 'Lead'), (1, 'In Communication'), (2, 'Closed (In Progress)'), (3, 'Not Pursue'), (4, 'Completed')])),
+                ('project_type', models.IntegerField(choices=[(0, 'Mobile Application'), (1, 'Web Application')])),
+                ('projects', models.PositiveIntegerField()),
+                ('budget', models.DecimalField(blank=True, decimal_places=2, max_digits=24, null=True)),
+                ('domain', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='project_management.Domain')),
+                ('technology', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='project_management.Technology')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupRefresh',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('months', models.PositiveIntegerField(default=0)),
+                ('started_on', models.DateTimeField(db_index=True)),
+                ('finished_on', models.DateTimeField()),
+            ],
+            options={
+                'ordering': ['-started_on'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='pipelinerollup',
+            index=models.Index(fields=['month', 'project_type'], name='project_man_month_211fc7_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 18:05
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('project_management', '0013_pipeline_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStatusChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.IntegerField(blank=True, choices=[(0, 'Lead'), (1, 'In Communication'), (2, 'Closed (In Progress)'), (3, 'Not Pursue'), (4, 'Completed')], null=True)),
+                ('to_status', models.IntegerField(choices=[(0, 'Lead'), (1, 'In Communication'), (2, 'Closed (In Progress)'), (3, 'Not Pursue'), (4, 'Completed')])),
+                ('changed_on', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_changes', to='project_management.Project')),
+            ],
+            options={
+                'ordering': ['changed_on'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='projectstatuschange',
+            index=models.Index(fields=['project', 'changed_on'], name='project_man_project_4c6827_idx'),
+        ),
+        # the current status of existing projects, as of their creation
+        migrations.RunSQL(
+            'INSERT INTO project_management_projectstatuschange '
+            '(project_id, changed_by_id, from_status, to_status, changed_on) '
+            'SELECT id, created_by_id, NULL, project_status, created_on '
+            'FROM project_management_project',
+            migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 18:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0014_project_status_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClientDuplicate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(db_index=True)),
+                ('reasons', models.CharField(blank=True, max_length=100)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='project_management.Client')),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='project_management.Client')),
+            ],
+            options={
+                'ordering': ['-score', 'client'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='clientduplicate',
+            unique_together=set([('client', 'duplicate')]),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 19:55
+from __future__ import unicode_literals
+
+import django.contrib.postgres.fields.jsonb
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0015_client_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='logo_thumbnails',
+            field=django.contrib.postgres.fields.jsonb.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.IntegerField(choices=[(0, 'Export'), (1, 'Import'), (2, 'Thumbnails')]),
+        ),
+    ]
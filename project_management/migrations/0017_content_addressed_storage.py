@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 20:40
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import project_management.storage
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0016_project_logo_thumbnails'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('size', models.BigIntegerField()),
+                ('references', models.PositiveIntegerField(default=0)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='attachments',
+            field=models.FileField(blank=True, null=True, storage=project_management.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='logo',
+            field=models.ImageField(blank=True, null=True, storage=project_management.storage.ContentAddressedStorage(), upload_to=''),
+        ),
+    ]
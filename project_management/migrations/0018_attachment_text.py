@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 21:25
+from __future__ import unicode_literals
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0017_content_addressed_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentText',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=100)),
+                ('file_hash', models.CharField(db_index=True, max_length=64)),
+                ('text', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True)),
+                ('extracted_on', models.DateTimeField(auto_now=True)),
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='attachment_text', to='project_management.Project')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='attachmenttext',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='project_man_search__a18e8f_gin'),
+        ),
+        migrations.AlterField(
+            model_name='job',
+            name='kind',
+            field=models.IntegerField(choices=[(0, 'Export'), (1, 'Import'), (2, 'Thumbnails'), (3, 'Attachment text')]),
+        ),
+    ]
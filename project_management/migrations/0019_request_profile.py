@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.15 on 2026-10-17 22:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_management', '0018_attachment_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('view_name', models.CharField(max_length=200)),
+                ('path', models.CharField(max_length=200)),
+                ('method', models.CharField(max_length=10)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('duration', models.FloatField()),
+                ('query_count', models.PositiveIntegerField()),
+                ('query_time', models.FloatField()),
+                ('duplicate_queries', models.PositiveIntegerField()),
+                ('duplicate_sql', models.TextField(blank=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'ordering': ['-created_on'],
+            },
+        ),
+    ]
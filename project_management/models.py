@@ -2,14 +2,23 @@
 
 # Django Imports
 from django.contrib.auth.models import User
-from django.db import models
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connections, models
 from django_countries.fields import CountryField
 from django.template.defaultfilters import truncatechars
+from django.utils import timezone
+from django.utils.encoding import force_text
 from django.utils.html import format_html
 from djmoney.models.fields import MoneyField
 from mptt.models import MPTTModel
 from phonenumber_field.modelfields import PhoneNumberField
 
+# Project Imports
+from project_management.storage import content_storage
+
 
 BUDGET_TYPE = (
     (0, 'Hourly'),
@@ -29,6 +38,24 @@ PROJECT_TYPE = (
     (1, 'Web Application'),
 )
 
+JOB_EXPORT, JOB_IMPORT, JOB_THUMBNAILS, JOB_ATTACHMENT_TEXT = range(4)
+
+JOB_KIND = (
+    (JOB_EXPORT, 'Export'),
+    (JOB_IMPORT, 'Import'),
+    (JOB_THUMBNAILS, 'Thumbnails'),
+    (JOB_ATTACHMENT_TEXT, 'Attachment text'),
+)
+
+JOB_PENDING, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED = range(4)
+
+JOB_STATUS = (
+    (JOB_PENDING, 'Pending'),
+    (JOB_RUNNING, 'Running'),
+    (JOB_COMPLETED, 'Completed'),
+    (JOB_FAILED, 'Failed'),
+)
+
 TECH_CATEGORY = (
     (0, 'Full Stack'),
     (1, 'Frontend'),
@@ -72,9 +99,19 @@ class Client(models.Model):
 
     phone_number = PhoneNumberField(blank=True, null=True)
 
+    # Maintained by project_management.signals, see search.py
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
     created_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            # keyset pagination of the changelist, see changelist.py
+            models.Index(fields=['created_on', 'id']),
+        ]
+
     def __str__(self):
         return '{} {}'.format(
             self.first_name, self.last_name
@@ -85,6 +122,33 @@ class Client(models.Model):
         return truncatechars(self.feedback, 80)
 
 
+class ClientDuplicate(models.Model):
+    """
+    A pair of clients that are likely the same, stored by the
+    find_duplicate_clients command, see dedup.py.
+    """
+    # Relations
+    client = models.ForeignKey(
+        Client, related_name='+', on_delete=models.CASCADE
+    )
+    duplicate = models.ForeignKey(
+        Client, related_name='+', on_delete=models.CASCADE
+    )
+
+    # Attributes
+    score = models.FloatField(db_index=True)
+    reasons = models.CharField(max_length=100, blank=True)
+
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-score', 'client']
+        unique_together = ('client', 'duplicate')
+
+    def __str__(self):
+        return '{} / {}'.format(self.client_id, self.duplicate_id)
+
+
 class Domain(MPTTModel):
     # Relations
     parent = models.ForeignKey(
@@ -164,23 +228,44 @@ class Project(models.Model):
     )
     url = models.URLField()
 
-    attachments = models.FileField(blank=True, null=True, upload_to='')
+    attachments = models.FileField(
+        blank=True, null=True, upload_to='', storage=content_storage
+    )
 
-    logo = models.ImageField(blank=True, null=True, upload_to='')
+    logo = models.ImageField(
+        blank=True, null=True, upload_to='', storage=content_storage
+    )
+    # Renditions of logo, maintained by project_management.thumbnails
+    logo_thumbnails = JSONField(default=dict, blank=True, editable=False)
 
     project_budget = MoneyField(
         max_digits=14, decimal_places=2, default_currency='USD'
     )
+    # project_budget in settings.BASE_CURRENCY, see currency.py
+    project_budget_base = models.DecimalField(
+        max_digits=20, decimal_places=2, blank=True, null=True,
+        db_index=True, editable=False
+    )
 
     budget_type = models.IntegerField(choices=BUDGET_TYPE, default=0)
     project_status = models.IntegerField(choices=PROJECT_STATUS, default=0)
     project_type = models.IntegerField(choices=PROJECT_TYPE, default=0)
 
+    # Maintained by project_management.signals, see search.py
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
     created_on = models.DateTimeField(auto_now_add=True)
     project_end_date = models.DateField(blank=True, null=True)
     project_start_date = models.DateField()
     updated_on = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            # keyset pagination of the changelist, see changelist.py
+            models.Index(fields=['created_on', 'id']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -203,13 +288,15 @@ class Project(models.Model):
             )
         )
 
+    def _project_budget(self):
+        return self.project_budget
+    _project_budget.admin_order_field = 'project_budget_base'
+    _project_budget.short_description = 'Project budget'
+
     def _logo(self):
         if self.logo:
-            return format_html(
-                '<img src="/media/{}" width="150" height="150" />'.format(
-                    self.logo
-                )
-            )
+            from project_management.thumbnails import logo_html
+            return logo_html(self)
     _logo.short_description = 'Project Logo'
 
     def _client_detail(self):
@@ -245,6 +332,181 @@ class Project(models.Model):
         )
 
 
+class AttachmentText(models.Model):
+    """
+    Text of Project.attachments, extracted by the process_jobs worker (see
+    attachments.py) and searched by the Project admin. file_hash is the
+    SHA-256 of the file the text was extracted from.
+    """
+    # Relations
+    project = models.OneToOneField(
+        Project, related_name='attachment_text', on_delete=models.CASCADE
+    )
+
+    # Attributes
+    file_name = models.CharField(max_length=100)
+    file_hash = models.CharField(max_length=64, db_index=True)
+
+    text = models.TextField(blank=True)
+    error = models.TextField(blank=True, null=True)
+
+    search_vector = SearchVectorField(blank=True, null=True, editable=False)
+
+    extracted_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector']),
+        ]
+
+    def __str__(self):
+        return self.file_name
+
+
+class ProjectSummary(models.Model):
+    """
+    Changelist columns of a project rendered ahead of time, so a page of
+    the Project changelist is read with one SELECT. Maintained by
+    project_management.signals, see summary.py.
+    """
+    # Relations
+    project = models.OneToOneField(
+        Project, primary_key=True, related_name='summary',
+        on_delete=models.CASCADE
+    )
+
+    # Attributes
+    client_detail = models.TextField(blank=True)
+    demo_video_link = models.TextField(blank=True)
+    domains = models.TextField(blank=True)
+    mobile_url = models.TextField(blank=True)
+    tags = models.TextField(blank=True)
+    technologies = models.TextField(blank=True)
+    url = models.TextField(blank=True)
+
+    updated_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = 'project summaries'
+
+    def __str__(self):
+        return force_text(self.project_id)
+
+
+class ExchangeRate(models.Model):
+    """
+    Amount of settings.BASE_CURRENCY per unit of `currency`, loaded with
+    the load_exchange_rates command.
+    """
+    # Attributes
+    currency = models.CharField(max_length=3, unique=True)
+    rate = models.DecimalField(max_digits=18, decimal_places=8)
+
+    updated_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['currency']
+
+    def __str__(self):
+        return self.currency
+
+
+class ProjectStatusChange(models.Model):
+    """
+    Append-only log of project_status transitions, written by the admin
+    and the imports, see history.py. from_status is empty for the status
+    a project was created with.
+    """
+    # Relations
+    project = models.ForeignKey(
+        Project, related_name='status_changes', on_delete=models.CASCADE
+    )
+
+    changed_by = models.ForeignKey(
+        User, blank=True, null=True, related_name='+',
+        on_delete=models.SET_NULL
+    )
+
+    # Attributes
+    from_status = models.IntegerField(
+        choices=PROJECT_STATUS, blank=True, null=True
+    )
+    to_status = models.IntegerField(choices=PROJECT_STATUS)
+
+    changed_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'changed_on']),
+        ]
+        ordering = ['changed_on']
+
+    def __str__(self):
+        return '{}: {}'.format(self.project_id, self.get_to_status_display())
+
+
+class PipelineRollup(models.Model):
+    """
+    Number of projects and their budget in the base currency per month of
+    creation, status and type: overall when technology and domain are
+    empty, otherwise for one technology or domain. Rebuilt a month at a
+    time by the refresh_pipeline_rollups command, see analytics.py.
+    """
+    # Relations
+    domain = models.ForeignKey(
+        Domain, blank=True, null=True, related_name='+',
+        on_delete=models.CASCADE
+    )
+    technology = models.ForeignKey(
+        Technology, blank=True, null=True, related_name='+',
+        on_delete=models.CASCADE
+    )
+
+    # Attributes
+    month = models.DateField()
+    project_status = models.IntegerField(choices=PROJECT_STATUS)
+    project_type = models.IntegerField(choices=PROJECT_TYPE)
+
+    projects = models.PositiveIntegerField()
+    budget = models.DecimalField(
+        max_digits=24, decimal_places=2, blank=True, null=True
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['month', 'project_type']),
+        ]
+
+    def __str__(self):
+        return '{} {}'.format(self.month, self.get_project_status_display())
+
+
+class PendingRollupMonth(models.Model):
+    """
+    A month of PipelineRollup to rebuild for a change that does not update
+    Project.updated_on, such as a deleted project.
+    """
+    # Attributes
+    month = models.DateField(unique=True)
+
+    def __str__(self):
+        return force_text(self.month)
+
+
+class RollupRefresh(models.Model):
+    # Attributes
+    months = models.PositiveIntegerField(default=0)
+
+    started_on = models.DateTimeField(db_index=True)
+    finished_on = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-started_on']
+
+    def __str__(self):
+        return force_text(self.started_on)
+
+
 class List(models.Model):
     # Relations
     projects = models.ManyToManyField(Project)
@@ -265,6 +527,10 @@ class List(models.Model):
     updated_on = models.DateTimeField(auto_now=True)
 
     class Meta:
+        indexes = [
+            # keyset pagination of the changelist, see changelist.py
+            models.Index(fields=['created_on', 'id']),
+        ]
         verbose_name_plural = "Custom Project List"
 
     def __str__(self):
@@ -279,3 +545,128 @@ class List(models.Model):
                 ) for project in self.projects.all()]
             )
         )
+
+    def add_projects(self, queryset):
+        """
+        Adds the projects of the queryset with a single INSERT ... SELECT,
+        skipping the ones already in the list, and returns how many were
+        added. m2m_changed is not sent.
+        """
+        through = self.projects.through
+        opts = through._meta
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'INSERT INTO {table} ({list_column}, {project_column}) '
+                'SELECT DISTINCT %s, selection.{pk} FROM ({sql}) selection '
+                'ON CONFLICT DO NOTHING'.format(
+                    table=quote(opts.db_table),
+                    list_column=quote(opts.get_field('list').column),
+                    project_column=quote(opts.get_field('project').column),
+                    pk=quote(Project._meta.pk.column),
+                    sql=sql
+                ),
+                (self.pk,) + tuple(params)
+            )
+            return cursor.rowcount
+
+
+class Job(models.Model):
+    # Relations
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+
+    created_by = models.ForeignKey(
+        User, related_name='created_jobs', on_delete=models.CASCADE,
+        default=1
+    )
+
+    # Attributes
+    kind = models.IntegerField(choices=JOB_KIND)
+    status = models.IntegerField(
+        choices=JOB_STATUS, default=JOB_PENDING, db_index=True
+    )
+
+    params = JSONField(default=dict, blank=True)
+
+    processed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+
+    error = models.TextField(blank=True, null=True)
+
+    source_file = models.FileField(blank=True, null=True, upload_to='jobs/')
+    result_file = models.FileField(blank=True, null=True, upload_to='jobs/')
+
+    created_on = models.DateTimeField(auto_now_add=True)
+    started_on = models.DateTimeField(blank=True, null=True)
+    finished_on = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_on']
+
+    def __str__(self):
+        return '{} {} #{}'.format(
+            self.get_kind_display(), self.content_type.name, self.pk
+        )
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100 if self.status == JOB_COMPLETED else 0
+        return min(100, int(self.processed * 100 / self.total))
+
+    def _progress(self):
+        return '{}%'.format(self.progress)
+    _progress.short_description = 'Progress'
+
+    def _result_file(self):
+        if self.result_file:
+            return format_html(
+                '<a href="{}">Download</a>', self.result_file.url
+            )
+        return u""
+    _result_file.short_description = 'Result'
+
+
+class StoredFile(models.Model):
+    """
+    A file of storage.ContentAddressedStorage and the number of model
+    fields referencing it.
+    """
+    # Attributes
+    name = models.CharField(max_length=100, unique=True)
+    size = models.BigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.name
+
+
+class RequestProfile(models.Model):
+    """
+    Timings of a sampled request, saved by
+    profiling.RequestProfilingMiddleware. Times are in milliseconds.
+    """
+    # Attributes
+    view_name = models.CharField(max_length=200)
+    path = models.CharField(max_length=200)
+    method = models.CharField(max_length=10)
+    status_code = models.PositiveSmallIntegerField()
+
+    duration = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_time = models.FloatField()
+    # queries repeating the signature of an earlier query, see profiling.py
+    duplicate_queries = models.PositiveIntegerField()
+    duplicate_sql = models.TextField(blank=True)
+
+    created_on = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-created_on']
+
+    def __str__(self):
+        return '{} {}'.format(self.method, self.path)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import datetime
+import itertools
+import logging
+import random
+import re
+import time
+from collections import Counter
+
+# Django Imports
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+from django.utils import timezone
+
+# Project Imports
+from project_management.models import RequestProfile
+
+
+logger = logging.getLogger(__name__)
+
+LITERAL_RE = re.compile(r"'(?:''|[^'])*'|\b\d+(?:\.\d+)?\b")
+IN_LIST_RE = re.compile(r'\(\?(?:, \?)*\)')
+
+
+def get_sample_rate():
+    return getattr(settings, 'REQUEST_PROFILE_SAMPLE_RATE', 0)
+
+
+def get_slow_request_ms():
+    return getattr(settings, 'REQUEST_PROFILE_SLOW_MS', 1000)
+
+
+def query_signature(sql):
+    """
+    Returns the query with its literals replaced by ?, so the queries of
+    an N+1 loop share a signature.
+    """
+    return IN_LIST_RE.sub('(...)', LITERAL_RE.sub('?', sql))
+
+
+class QueryRecorder(object):
+    """
+    Records the queries of every database connection with the debug cursor
+    Django uses for connection.queries when DEBUG is set.
+    """
+
+    def __enter__(self):
+        self.states = []
+        for connection in connections.all():
+            self.states.append((
+                connection, connection.force_debug_cursor,
+                len(connection.queries_log)
+            ))
+            connection.force_debug_cursor = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.queries = []
+        for connection, force_debug_cursor, start in self.states:
+            connection.force_debug_cursor = force_debug_cursor
+            self.queries.extend(
+                itertools.islice(connection.queries_log, start, None)
+            )
+
+
+def summarize(queries):
+    """
+    Returns the number of queries, their total time in milliseconds, the
+    number of queries repeating an earlier signature and the most repeated
+    signature.
+    """
+    signatures = Counter(query_signature(query['sql']) for query in queries)
+    duplicates = len(queries) - len(signatures)
+    top = signatures.most_common(1)
+    return (
+        len(queries),
+        sum(float(query['time']) for query in queries) * 1000,
+        duplicates,
+        top[0][0] if duplicates else '',
+    )
+
+
+class RequestProfilingMiddleware(object):
+    """
+    Saves the wall time, number of queries, SQL time and duplicate queries
+    of a REQUEST_PROFILE_SAMPLE_RATE fraction of the requests as
+    RequestProfile rows, shown per view by the Request profiles admin.
+    Streamed content is not included in the time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= get_sample_rate():
+            return self.get_response(request)
+
+        started = time.time()
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+        duration = (time.time() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        count, sql_time, duplicates, duplicate_sql = summarize(
+            recorder.queries
+        )
+        profile = RequestProfile(
+            view_name=(match.view_name if match else '')[:200],
+            path=request.path[:200],
+            method=request.method,
+            status_code=response.status_code,
+            duration=duration,
+            query_count=count,
+            query_time=sql_time,
+            duplicate_queries=duplicates,
+            duplicate_sql=duplicate_sql,
+        )
+        if duration >= get_slow_request_ms():
+            logger.warning(
+                'Slow request %s %s: %.0f ms, %d queries in %.0f ms, '
+                '%d duplicates', request.method, request.path, duration,
+                count, sql_time, duplicates
+            )
+        try:
+            profile.save(using=router.db_for_write(RequestProfile))
+        except DatabaseError:
+            # never fail a request for its profile
+            logger.exception('Could not save the request profile')
+        return response
+
+
+def percentiles(days=1):
+    """
+    Returns a row per view of the requests profiled in the last `days`:
+    view_name, requests, p50, p95 and p99 of the duration, mean number of
+    queries, mean SQL time, requests with duplicate queries and the most
+    duplicated query.
+    """
+    db = router.db_for_read(RequestProfile)
+    quote = connections[db].ops.quote_name
+    with connections[db].cursor() as cursor:
+        cursor.execute(
+            'SELECT view_name, COUNT(*), percentile_cont(ARRAY[0.5, 0.95, '
+            '0.99]) WITHIN GROUP (ORDER BY duration), AVG(query_count), '
+            'AVG(query_time), COUNT(*) FILTER (WHERE duplicate_queries > 0), '
+            'MODE() WITHIN GROUP (ORDER BY duplicate_sql) FILTER ('
+            "  WHERE duplicate_sql <> ''"
+            ') '
+            'FROM {} WHERE created_on >= %s '
+            'GROUP BY view_name '
+            'ORDER BY percentile_cont(0.95) WITHIN GROUP (ORDER BY duration) '
+            'DESC'.format(
+                quote(RequestProfile._meta.db_table)
+            ),
+            (timezone.now() - datetime.timedelta(days=days),)
+        )
+        return [
+            {
+                'view_name': view_name or '(unresolved)',
+                'requests': requests,
+                'p50': durations[0],
+                'p95': durations[1],
+                'p99': durations[2],
+                'queries': query_count,
+                'query_time': query_time,
+                'duplicates': duplicates,
+                'duplicate_sql': duplicate_sql,
+            }
+            for view_name, requests, durations, query_count, query_time,
+            duplicates, duplicate_sql in cursor.fetchall()
+        ]
+
+
+def prune(days):
+    """
+    Deletes the profiles older than `days` and returns their number.
+    """
+    return RequestProfile.objects.filter(
+        created_on__lt=timezone.now() - datetime.timedelta(days=days)
+    ).delete()[0]
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.encoding import force_text
+from import_export import fields, resources, widgets
+
+# Project Imports
+from project_management import facets, similar
+from project_management.currency import update_base_budgets
+from project_management.history import record_changes
+from project_management.models import (
+    Client, Domain, Project, Tags, Technology
+)
+from project_management.search import update_search_vector
+from project_management.summary import refresh_summaries
+from project_management.utils import bulk_update
+
+
+# Many-to-many columns and the model their names are looked up in
+PROJECT_M2M_FIELDS = (
+    ('tags', Tags),
+    ('technologies', Technology),
+    ('domains', Domain),
+)
+
+
+class BulkImportResult(object):
+    def __init__(self):
+        self.new = 0
+        self.updated = 0
+        self.errors = []
+
+    def add_error(self, number, message):
+        self.errors.append((number, message))
+
+    def has_errors(self):
+        return bool(self.errors)
+
+
+class ClientResource(resources.ModelResource):
+    class Meta:
+        model = Client
+        exclude = ('search_vector',)
+
+    def after_import_instance(self, instance, new, **kwargs):
+        # the importing user owns the clients, as in ClientAdmin.save_model
+        user = kwargs.get('user')
+        if user is not None:
+            if new:
+                instance.created_by = user
+            instance.updated_by = user
+
+
+class ProjectResource(resources.ModelResource):
+    """
+    Imports and exports projects with the client referenced by email and
+    tags, technologies and domains by comma separated names.
+
+    import_data() keeps import_export's row by row workflow used by the
+    admin preview; bulk_import() is the fast path used for large files.
+    """
+    client = fields.Field(
+        column_name='client', attribute='client',
+        widget=widgets.ForeignKeyWidget(Client, 'email')
+    )
+    tags = fields.Field(
+        column_name='tags', attribute='tags',
+        widget=widgets.ManyToManyWidget(Tags, field='name')
+    )
+    technologies = fields.Field(
+        column_name='technologies', attribute='technologies',
+        widget=widgets.ManyToManyWidget(Technology, field='name')
+    )
+    domains = fields.Field(
+        column_name='domains', attribute='domains',
+        widget=widgets.ManyToManyWidget(Domain, field='name')
+    )
+
+    class Meta:
+        model = Project
+        fields = (
+            'id', 'name', 'url', 'mobile_url', 'client', 'project_type',
+            'project_status', 'project_start_date', 'project_end_date',
+            'budget_type', 'project_budget', 'project_budget_currency',
+            'description', 'responsibilities', 'manager_name', 'team_members',
+            'additional_detail', 'demo_video_link', 'tags', 'technologies',
+            'domains',
+        )
+        export_order = fields
+
+    def import_obj(self, obj, data, dry_run):
+        # compared with the imported status in after_save_instance
+        obj._previous_status = obj.project_status if obj.pk else None
+        super(ProjectResource, self).import_obj(obj, data, dry_run)
+
+    def after_save_instance(self, instance, using_transactions, dry_run):
+        # a dry run without a transaction to roll back saved nothing
+        if dry_run and not using_transactions:
+            return
+        if instance.pk:
+            record_changes([(
+                instance.pk, instance._previous_status,
+                instance.project_status
+            )])
+
+    def load_lookups(self):
+        """
+        Loads the name -> id maps used to resolve the relation columns,
+        one query per model for the whole import.
+        """
+        lookups = dict(
+            (name, dict(model.objects.order_by().values_list('name', 'pk')))
+            for name, model in PROJECT_M2M_FIELDS
+        )
+        lookups['client'] = dict(
+            Client.objects.exclude(email=None).values_list('email', 'pk')
+        )
+        return lookups
+
+    def split_names(self, value):
+        if not value:
+            return []
+        names = [name.strip() for name in force_text(value).split(',')]
+        return [name for name in names if name]
+
+    def get_row_pk(self, row):
+        try:
+            return int(row.get('id') or 0) or None
+        except (TypeError, ValueError):
+            raise ValueError("Invalid id '{}'".format(row.get('id')))
+
+    def build_instance(self, row, lookups, user):
+        """
+        Returns an unsaved Project for the row and the ids of its related
+        objects per many-to-many column.
+        """
+        obj = Project(pk=self.get_row_pk(row))
+        for field in self.get_import_fields():
+            if field.column_name not in row or field.column_name == 'id':
+                continue
+            if field.column_name == 'client':
+                email = force_text(row['client'] or '').strip()
+                if email and email not in lookups['client']:
+                    raise ValueError(
+                        "Client with email '{}' does not exist".format(email)
+                    )
+                obj.client_id = lookups['client'].get(email)
+            elif not isinstance(field.widget, widgets.ManyToManyWidget):
+                try:
+                    self.import_field(field, obj, row)
+                except ArithmeticError:
+                    # decimal.InvalidOperation has no readable message
+                    raise ValueError("Invalid {} '{}'".format(
+                        field.column_name, row[field.column_name]
+                    ))
+
+        if user is not None:
+            obj.created_by = user
+            obj.updated_by = user
+
+        related = {}
+        for name, model in PROJECT_M2M_FIELDS:
+            if name in row:
+                # unknown names are skipped, like ManyToManyWidget does
+                related[name] = set(
+                    lookups[name][item] for item in self.split_names(row[name])
+                    if item in lookups[name]
+                )
+        return obj, related
+
+    def validate_instance(self, obj, row, new):
+        """
+        Validates every field of a new project, or the columns of the row
+        for an updated one, like the admin form would: a missing or invalid
+        value would otherwise fail the bulk INSERT of the whole chunk. The
+        relations are resolved from the lookups already.
+        """
+        exclude = ['project_budget']
+        for field in Project._meta.concrete_fields:
+            if field.is_relation or not field.editable or not new and (
+                    field.name not in row and field.attname not in row):
+                exclude.append(field.name)
+        errors = {}
+        try:
+            obj.clean_fields(exclude=exclude)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        # cleaning the MoneyField would replace the Money by its amount
+        if new or 'project_budget' in row:
+            budget = obj.project_budget
+            try:
+                Project._meta.get_field('project_budget').clean(
+                    budget.amount if budget is not None else None, obj
+                )
+            except ValidationError as e:
+                errors['project_budget'] = e.messages
+        if errors:
+            raise ValidationError(errors)
+
+    def format_error(self, error):
+        if not isinstance(error, ValidationError):
+            return force_text(error)
+        if hasattr(error, 'error_dict'):
+            return '; '.join(
+                '{}: {}'.format(name, ' '.join(messages))
+                for name, messages in sorted(error.message_dict.items())
+            )
+        return ' '.join(error.messages)
+
+    def save_relations(self, objs, related):
+        """
+        Replaces the many-to-many rows of the saved objects with one DELETE
+        and one bulk INSERT per relation.
+        """
+        for name, model in PROJECT_M2M_FIELDS:
+            field = Project._meta.get_field(name)
+            through = field.remote_field.through
+            source = '{}_id'.format(field.m2m_field_name())
+            target = '{}_id'.format(field.m2m_reverse_field_name())
+
+            pks = [
+                obj.pk for obj, values in zip(objs, related) if name in values
+            ]
+            if not pks:
+                continue
+            through.objects.filter(**{'{}__in'.format(source): pks}).delete()
+            through.objects.bulk_create([
+                through(**{source: obj.pk, target: value})
+                for obj, values in zip(objs, related)
+                for value in values.get(name, ())
+            ])
+
+    def import_chunk(self, rows, offset, lookups, result, user):
+        objs, related, numbers = [], [], []
+        for number, row in enumerate(rows, offset + 1):
+            try:
+                obj, values = self.build_instance(row, lookups, user)
+            except (ArithmeticError, KeyError, ValueError,
+                    ValidationError) as e:
+                result.add_error(number, self.format_error(e))
+                continue
+            objs.append(obj)
+            related.append(values)
+            numbers.append(number)
+
+        previous_statuses = dict(Project.objects.filter(
+            pk__in=[obj.pk for obj in objs if obj.pk]
+        ).values_list('pk', 'project_status'))
+        valid = []
+        for obj, values, number in zip(objs, related, numbers):
+            try:
+                self.validate_instance(
+                    obj, rows[number - offset - 1],
+                    obj.pk not in previous_statuses
+                )
+            except ValidationError as e:
+                result.add_error(number, self.format_error(e))
+                continue
+            valid.append((obj, values))
+        objs = [obj for obj, values in valid]
+        related = [values for obj, values in valid]
+        new_objs = [obj for obj in objs if obj.pk not in previous_statuses]
+        updated_objs = [obj for obj in objs if obj.pk in previous_statuses]
+
+        # bulk_create returns primary keys on PostgreSQL
+        Project.objects.bulk_create(new_objs)
+        if updated_objs:
+            update_fields = [
+                field.attname for field in Project._meta.concrete_fields
+                if not field.primary_key and field.name not in (
+                    'created_by', 'created_on', 'updated_by', 'updated_on'
+                ) and any(
+                    column in rows[0] for column in (field.name, field.attname)
+                )
+            ] + ['updated_on']
+            if user is not None:
+                update_fields.append('updated_by')
+            bulk_update(
+                Project.objects.all(), updated_objs, update_fields,
+                batch_size=len(updated_objs)
+            )
+        self.save_relations(objs, related)
+        # updated projects keep their status without a project_status column
+        record_changes([
+            (obj.pk, previous_statuses.get(obj.pk), obj.project_status)
+            for obj in objs
+            if obj.pk not in previous_statuses or 'project_status' in rows[0]
+        ], user)
+        # bulk queries do not send the signals maintaining the base currency
+        # budgets, the search index, the changelist summaries and the
+        # similar project index
+        pks = [obj.pk for obj in objs]
+        update_base_budgets(Project.objects.filter(pk__in=pks))
+        update_search_vector(Project, pks)
+        refresh_summaries(pks)
+        similar.mark_changed(pks)
+
+        result.new += len(new_objs)
+        result.updated += len(updated_objs)
+
+    def bulk_import(self, dataset, dry_run=False, chunk_size=None,
+                    user=None):
+        """
+        Imports the dataset with bulk queries, IMPORT_CHUNK_SIZE rows at a
+        time, in one transaction. Nothing is saved on a dry run or when
+        any row fails.
+        """
+        chunk_size = chunk_size or getattr(settings, 'IMPORT_CHUNK_SIZE', 500)
+        result = BulkImportResult()
+        lookups = self.load_lookups()
+        rows = dataset.dict
+
+        with transaction.atomic():
+            for offset in range(0, len(rows), chunk_size):
+                self.import_chunk(
+                    rows[offset:offset + chunk_size], offset, lookups,
+                    result, user
+                )
+            if dry_run or result.has_errors():
+                transaction.set_rollback(True)
+            else:
+                facets.invalidate(Project)
+        return result
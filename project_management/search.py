@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.conf import settings
+from django.contrib.admin.views.main import ORDER_VAR
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector
+)
+from django.db.models import F, OuterRef, Q, Subquery, TextField
+from django.db.models.expressions import RawSQL
+
+# Project Imports
+from project_management.models import Client, Project, Tags, Technology
+
+
+def get_search_config():
+    return getattr(settings, 'SEARCH_CONFIG', 'english')
+
+
+def related_names(model):
+    """
+    Subquery returning the space separated names of the `model` objects
+    linked to the outer project.
+    """
+    return Subquery(
+        model.objects.filter(project=OuterRef('pk')).order_by().values(
+            'project'
+        ).annotate(
+            names=StringAgg('name', ' ')
+        ).values('names'),
+        output_field=TextField()
+    )
+
+
+def project_search_vector():
+    config = get_search_config()
+    return (
+        SearchVector('name', weight='A', config=config) +
+        SearchVector(
+            related_names(Tags), related_names(Technology),
+            weight='B', config=config
+        ) +
+        SearchVector('url', 'mobile_url', weight='C', config=config) +
+        SearchVector('description', weight='D', config=config)
+    )
+
+
+def client_search_vector():
+    config = get_search_config()
+    return (
+        SearchVector('first_name', 'last_name', weight='A', config=config) +
+        SearchVector('email', 'skype_id', weight='B', config=config) +
+        SearchVector('platform', weight='C', config=config) +
+        SearchVector('feedback', weight='D', config=config)
+    )
+
+
+SEARCH_VECTORS = {
+    Client: client_search_vector,
+    Project: project_search_vector,
+}
+
+
+def update_search_vector(model, pks):
+    """
+    Recomputes the search vector of the given objects in a single UPDATE.
+    """
+    pks = list(pks)
+    if pks:
+        model.objects.filter(pk__in=pks).update(
+            search_vector=SEARCH_VECTORS[model]()
+        )
+
+
+def union_subquery(*querysets):
+    """
+    Returns the UNION of single column querysets as an expression for an
+    __in filter. Each side is planned on its own, so each can use the GIN
+    index of its search vector, which an OR of the conditions prevents.
+    """
+    parts, params = [], []
+    for queryset in querysets:
+        sql, query_params = queryset.order_by().query.sql_with_params()
+        parts.append(sql)
+        params.extend(query_params)
+    return RawSQL(' UNION '.join(parts), params)
+
+
+class SearchVectorMixin(object):
+    """
+    Replaces the admin's icontains search with a ranked full-text search
+    on the model's search_vector column. Results are ordered by rank unless
+    the user sorted the changelist by a column.
+    """
+
+    def get_search_condition(self, query):
+        return Q(search_vector=query)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+
+        query = SearchQuery(search_term, config=get_search_config())
+        queryset = queryset.filter(self.get_search_condition(query))
+        if ORDER_VAR not in request.GET:
+            queryset = queryset.annotate(
+                rank=SearchRank(F('search_vector'), query)
+            ).order_by('-rank', '-pk')
+        return queryset, False
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+from copy import copy
+from functools import reduce
+from operator import or_
+
+# Django Imports
+from django.contrib.admin.views.main import ERROR_FLAG, PAGE_VAR
+from django.db.models import Q
+from django.http import HttpRequest, QueryDict
+
+# Project Imports
+from project_management.changelist import CURSOR_VAR
+
+
+# selection the "Create custom project list" action was applied to
+LIST_SELECTION_SESSION_KEY = 'project_list_selection'
+
+PREVIEW_SIZE = 20
+
+
+def compact_ids(pks):
+    """
+    Returns the sorted pks as [first, last] ranges of consecutive ids.
+    """
+    ranges = []
+    for pk in sorted(set(pks)):
+        if ranges and ranges[-1][1] == pk - 1:
+            ranges[-1][1] = pk
+        else:
+            ranges.append([pk, pk])
+    return ranges
+
+
+def ranges_condition(ranges):
+    singles = [first for first, last in ranges if first == last]
+    conditions = [
+        Q(pk__range=(first, last)) for first, last in ranges if first != last
+    ]
+    if singles:
+        conditions.append(Q(pk__in=singles))
+    return reduce(or_, conditions) if conditions else Q(pk__in=[])
+
+
+def get_changelist_params(params):
+    """
+    Returns the query string of the changelist params without the page
+    and error flag, which do not change the selected objects.
+    """
+    params = params.copy()
+    for name in (PAGE_VAR, CURSOR_VAR, ERROR_FLAG):
+        params.pop(name, None)
+    return params.urlencode()
+
+
+def serialize_selection(request, queryset):
+    """
+    Returns a small JSON serializable description of the objects an admin
+    action was applied to: the changelist query string when "select all"
+    was used, the id ranges of the ticked rows otherwise.
+    """
+    if request.POST.get('select_across') == '1':
+        return {'params': get_changelist_params(request.GET)}
+    return {
+        'ranges': compact_ids(queryset.values_list('pk', flat=True))
+    }
+
+
+def get_changelist(model_admin, request, params):
+    """
+    Returns the changelist of the admin for the query string params, with
+    its filters, search and ordering but without counting or fetching a
+    page.
+    """
+    request = copy(request)
+    request.GET = QueryDict(params)
+    list_display = model_admin.get_list_display(request)
+    changelist_class = model_admin.get_changelist(request)
+    changelist_class = type(
+        'Selection' + changelist_class.__name__, (changelist_class,),
+        {'get_results': lambda self, request: None}
+    )
+    return changelist_class(
+        request, model_admin.model, list_display,
+        model_admin.get_list_display_links(request, list_display),
+        model_admin.get_list_filter(request), model_admin.date_hierarchy,
+        model_admin.get_search_fields(request),
+        model_admin.get_list_select_related(request),
+        model_admin.list_per_page, model_admin.list_max_show_all,
+        model_admin.list_editable, model_admin
+    )
+
+
+def get_changelist_queryset(model_admin, request, params):
+    return get_changelist(model_admin, request, params).queryset
+
+
+def selection_queryset(model_admin, request, selection):
+    """
+    Rebuilds the queryset described by serialize_selection().
+    """
+    if 'params' in selection:
+        return get_changelist_queryset(
+            model_admin, request, selection['params']
+        )
+    return model_admin.get_queryset(request).filter(
+        ranges_condition(selection['ranges'])
+    )
+
+
+def get_user_request(user):
+    """
+    Returns a bare request for rebuilding a selection outside of a view,
+    e.g. in the process_jobs worker, with the permissions of `user`.
+    """
+    request = HttpRequest()
+    request.user = user
+    return request
+
+
+def get_preview(queryset):
+    """
+    Returns the first PREVIEW_SIZE objects of a selection and its size.
+    """
+    objects = list(queryset[:PREVIEW_SIZE])
+    count = len(objects)
+    if count == PREVIEW_SIZE:
+        count = queryset.count()
+    return {
+        'objects': objects,
+        'count': count,
+        'remaining': count - len(objects),
+    }
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete, pre_save
+)
+from django.dispatch import receiver
+from mptt.signals import node_moved
+
+# Project Imports
+from project_management import (
+    analytics, autocomplete, domains, facets, similar
+)
+from project_management.currency import to_base, update_base_budgets
+from project_management.jobs import enqueue_projects
+from project_management.models import (
+    JOB_ATTACHMENT_TEXT, JOB_THUMBNAILS, Client, Domain, ExchangeRate, List,
+    Project, Tags, Technology
+)
+from project_management.search import update_search_vector
+from project_management.summary import refresh_summaries
+
+
+@receiver(post_save, sender=Client)
+def update_client_search_vector(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vector(Client, [instance.pk])
+
+
+@receiver(post_save, sender=Project)
+def update_project_search_vector(sender, instance, raw=False, **kwargs):
+    if not raw:
+        update_search_vector(Project, [instance.pk])
+
+
+def changed_project_pks(instance, action, reverse, pk_set):
+    """
+    Returns the pks of the projects whose relation changed for a post_*
+    m2m_changed action and None for the pre_* actions.
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            return [instance.pk]
+    elif action == 'pre_clear':
+        # pk_set is not provided on clear, remember the affected projects
+        instance._cleared_project_pks = list(
+            instance.project_set.values_list('pk', flat=True)
+        )
+    elif action == 'post_clear':
+        return getattr(instance, '_cleared_project_pks', [])
+    elif action in ('post_add', 'post_remove'):
+        return pk_set
+    return None
+
+
+@receiver(m2m_changed, sender=Project.tags.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def update_project_search_vector_m2m(sender, instance, action, reverse,
+                                     pk_set, **kwargs):
+    pks = changed_project_pks(instance, action, reverse, pk_set)
+    if pks is not None:
+        update_search_vector(Project, pks)
+
+
+@receiver(post_save, sender=Tags)
+def update_tag_projects_search_vector(sender, instance, created, raw=False,
+                                      **kwargs):
+    if not created and not raw:
+        update_search_vector(
+            Project, instance.project_set.values_list('pk', flat=True)
+        )
+
+
+@receiver(post_save, sender=Technology)
+def update_technology_projects_search_vector(sender, instance, created,
+                                             raw=False, **kwargs):
+    if not created and not raw:
+        update_search_vector(
+            Project, instance.project_set.values_list('pk', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=List)
+@receiver(post_delete, sender=Tags)
+@receiver(post_delete, sender=Technology)
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=List)
+@receiver(post_save, sender=Tags)
+@receiver(post_save, sender=Technology)
+def invalidate_autocomplete(sender, **kwargs):
+    autocomplete.invalidate(sender._meta.model_name)
+
+
+@receiver(post_delete, sender=Domain)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Tags)
+@receiver(post_delete, sender=Technology)
+@receiver(post_save, sender=Domain)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Tags)
+@receiver(post_save, sender=Technology)
+@receiver(m2m_changed, sender=Project.domains.through)
+@receiver(m2m_changed, sender=Project.tags.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def invalidate_project_facets(sender, **kwargs):
+    facets.invalidate(Project)
+
+
+@receiver(post_save, sender=Project)
+def refresh_project_summary(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_summaries([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.domains.through)
+@receiver(m2m_changed, sender=Project.tags.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def refresh_project_summary_m2m(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    pks = changed_project_pks(instance, action, reverse, pk_set)
+    if pks is not None:
+        refresh_summaries(pks)
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Domain)
+@receiver(post_save, sender=Tags)
+@receiver(post_save, sender=Technology)
+def refresh_related_project_summaries(sender, instance, created, raw=False,
+                                      **kwargs):
+    if not created and not raw:
+        refresh_summaries(instance.project_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Domain)
+@receiver(pre_delete, sender=Tags)
+@receiver(pre_delete, sender=Technology)
+def remember_deleted_relation_projects(sender, instance, **kwargs):
+    # the through rows are deleted without m2m_changed
+    instance._deleted_project_pks = list(
+        instance.project_set.values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=Domain)
+@receiver(post_delete, sender=Tags)
+@receiver(post_delete, sender=Technology)
+def refresh_deleted_relation_project_summaries(sender, instance, **kwargs):
+    refresh_summaries(getattr(instance, '_deleted_project_pks', []))
+
+
+@receiver(node_moved, sender=Domain)
+@receiver(post_delete, sender=Domain)
+@receiver(post_save, sender=Domain)
+def invalidate_domain_tree(sender, **kwargs):
+    domains.invalidate()
+
+
+@receiver(pre_save, sender=Project)
+def set_project_budget_base(sender, instance, **kwargs):
+    instance.project_budget_base = to_base(instance.project_budget)
+
+
+@receiver(post_delete, sender=ExchangeRate)
+@receiver(post_save, sender=ExchangeRate)
+def update_currency_budgets(sender, instance, **kwargs):
+    update_base_budgets(currencies=[instance.currency])
+
+
+@receiver(post_delete, sender=Project)
+def schedule_deleted_project_rollup(sender, instance, **kwargs):
+    analytics.mark_pending([analytics.month_of(instance.created_on)])
+
+
+@receiver(m2m_changed, sender=Project.domains.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def schedule_project_rollups_m2m(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    # adding or removing relations does not update Project.updated_on
+    pks = changed_project_pks(instance, action, reverse, pk_set)
+    if pks:
+        analytics.mark_pending(
+            analytics.project_months(Project.objects.filter(pk__in=pks))
+        )
+
+
+@receiver(post_delete, sender=ExchangeRate)
+def schedule_currency_rollups(sender, instance, **kwargs):
+    analytics.mark_pending(analytics.project_months(
+        Project.objects.filter(project_budget_currency=instance.currency)
+    ))
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=Project)
+def mark_similar_project_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        similar.mark_changed([instance.pk])
+
+
+@receiver(m2m_changed, sender=Project.domains.through)
+@receiver(m2m_changed, sender=Project.tags.through)
+@receiver(m2m_changed, sender=Project.technologies.through)
+def mark_similar_projects_changed_m2m(sender, instance, action, reverse,
+                                      pk_set, **kwargs):
+    pks = changed_project_pks(instance, action, reverse, pk_set)
+    if pks:
+        similar.mark_changed(pks)
+
+
+@receiver(post_delete, sender=Domain)
+@receiver(post_delete, sender=Tags)
+@receiver(post_delete, sender=Technology)
+def mark_deleted_relation_similar_projects(sender, instance, **kwargs):
+    similar.mark_changed(getattr(instance, '_deleted_project_pks', []))
+
+
+@receiver(post_save, sender=Project)
+def queue_logo_thumbnails(sender, instance, raw=False, **kwargs):
+    # rendered by the process_jobs worker, outside the request, when the
+    # logo was uploaded, replaced or removed
+    replaced = getattr(instance, '_replaced_files', [])
+    if any(field_name == 'logo' for field_name, name in replaced):
+        enqueue_projects(JOB_THUMBNAILS, [instance.pk], instance.updated_by)
+
+
+@receiver(pre_save, sender=Project)
+def remember_replaced_files(sender, instance, raw=False, **kwargs):
+    # (field name, previous name) of the file fields set to another file
+    instance._replaced_files = []
+    if raw:
+        return
+    fields = ('attachments', 'logo')
+    previous = {}
+    if instance.pk is not None:
+        previous = Project.objects.filter(pk=instance.pk).values(
+            *fields
+        ).first() or {}
+    for field_name in fields:
+        name = previous.get(field_name) or None
+        if name != (getattr(instance, field_name).name or None):
+            instance._replaced_files.append((field_name, name))
+
+
+@receiver(post_save, sender=Project)
+def release_replaced_files(sender, instance, **kwargs):
+    # each upload referenced its stored file, see storage.py
+    for field_name, name in getattr(instance, '_replaced_files', []):
+        if name:
+            getattr(instance, field_name).storage.delete(name)
+
+
+@receiver(post_delete, sender=Project)
+def release_deleted_project_files(sender, instance, **kwargs):
+    for field_name in ('attachments', 'logo'):
+        field_file = getattr(instance, field_name)
+        if field_file:
+            field_file.storage.delete(field_file.name)
+
+
+@receiver(post_save, sender=Project)
+def queue_attachment_text(sender, instance, raw=False, **kwargs):
+    replaced = getattr(instance, '_replaced_files', [])
+    if any(field_name == 'attachments' for field_name, name in replaced):
+        enqueue_projects(
+            JOB_ATTACHMENT_TEXT, [instance.pk], instance.updated_by
+        )
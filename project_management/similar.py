@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import random
+import threading
+
+# Django Imports
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+# Project Imports
+from project_management.models import Project
+
+
+# many-to-many fields compared with the Jaccard index
+FIELDS = ('technologies', 'domains', 'tags')
+
+VERSION_KEY = 'similar:version'
+
+# changes applied to an index before it is rebuilt instead
+MAX_CHANGES = 1000
+
+# the index of this process
+_local = {}
+_lock = threading.Lock()
+
+
+def get_weights():
+    return getattr(settings, 'SIMILAR_PROJECT_WEIGHTS', {
+        'technologies': 3, 'domains': 2, 'tags': 1, 'project_type': 1,
+    })
+
+
+def get_cache_timeout():
+    return getattr(settings, 'SIMILAR_PROJECT_CACHE_TIMEOUT', 86400)
+
+
+def _changes_key(version):
+    return 'similar:changes:{}'.format(version)
+
+
+def get_version():
+    # starts at a random number, so a flushed cache does not restart at a
+    # version some process has already applied
+    return cache.get_or_set(
+        VERSION_KEY, lambda: random.randint(1, 2 ** 31), None
+    )
+
+
+def mark_changed(pks):
+    """
+    Records that the features of the projects changed, for every process
+    to update its index on the next query.
+    """
+    pks = list(pks)
+    if not pks:
+        return
+    get_version()
+    while True:
+        try:
+            version = cache.incr(VERSION_KEY)
+        except ValueError:
+            version = get_version()
+        # incr is not atomic on every backend (DatabaseCache): a version
+        # another process took is skipped rather than overwritten
+        if cache.add(_changes_key(version), pks, get_cache_timeout()):
+            return
+
+
+def load_features(pks=None):
+    """
+    Returns {pk: project_type} and, per field, {pk: set of related ids}
+    of the given projects or of every project, one query per field.
+    """
+    projects = Project.objects.order_by()
+    if pks is not None:
+        projects = projects.filter(pk__in=pks)
+    types = dict(projects.values_list('pk', 'project_type'))
+    features = {}
+    for name in FIELDS:
+        field = Project._meta.get_field(name)
+        source = '{}_id'.format(field.m2m_field_name())
+        target = '{}_id'.format(field.m2m_reverse_field_name())
+        rows = field.remote_field.through.objects.order_by()
+        if pks is not None:
+            rows = rows.filter(**{'{}__in'.format(source): pks})
+        features[name] = {}
+        for pk, related in rows.values_list(source, target):
+            features[name].setdefault(pk, set()).add(related)
+    return types, features
+
+
+class SimilarityIndex(object):
+    """
+    Projects as rows of a sparse binary feature matrix, stored per field
+    as posting arrays: the rows of the projects having each related
+    object. Deleted projects keep their row with a pk of 0.
+    """
+
+    def __init__(self, types, features):
+        self.rows = {}
+        self.pks = np.zeros(0, dtype=np.int64)
+        self.types = np.zeros(0, dtype=np.int16)
+        self.sizes = dict(
+            (name, np.zeros(0, dtype=np.int32)) for name in FIELDS
+        )
+        self.postings = dict((name, {}) for name in FIELDS)
+        self.features = dict((name, []) for name in FIELDS)
+        self.version = None
+        self.add(types, features)
+
+    def add(self, types, features):
+        pks = sorted(types)
+        start = len(self.pks)
+        self.rows.update(
+            (pk, row) for row, pk in enumerate(pks, start)
+        )
+        self.pks = np.concatenate([self.pks, np.array(pks, dtype=np.int64)])
+        self.types = np.concatenate([
+            self.types, np.array([types[pk] for pk in pks], dtype=np.int16)
+        ])
+        for name in FIELDS:
+            row_features = [
+                frozenset(features[name].get(pk, ())) for pk in pks
+            ]
+            self.features[name].extend(row_features)
+            self.sizes[name] = np.concatenate([
+                self.sizes[name],
+                np.array([len(items) for items in row_features], np.int32)
+            ])
+            postings = {}
+            for row, items in enumerate(row_features, start):
+                for item in items:
+                    postings.setdefault(item, []).append(row)
+            for item, rows in postings.items():
+                rows = np.array(rows, dtype=np.int32)
+                current = self.postings[name].get(item)
+                if current is not None:
+                    rows = np.concatenate([current, rows])
+                self.postings[name][item] = rows
+
+    def remove(self, pk):
+        row = self.rows.pop(pk)
+        self.pks[row] = 0
+        for name in FIELDS:
+            for item in self.features[name][row]:
+                rows = self.postings[name][item]
+                self.postings[name][item] = rows[rows != row]
+            self.features[name][row] = frozenset()
+            self.sizes[name][row] = 0
+
+    def update(self, pks):
+        """
+        Reloads the features of the given projects.
+        """
+        types, features = load_features(pks)
+        for pk in pks:
+            if pk in self.rows:
+                self.remove(pk)
+        self.add(types, features)
+
+    def scores(self, row):
+        """
+        Returns the similarity of every row to `row`: the weighted mean of
+        the Jaccard index of each field and of an equal project_type, zero
+        for the rows sharing no related object.
+        """
+        weights = get_weights()
+        scores = np.zeros(len(self.pks))
+        shared = np.zeros(len(self.pks), dtype=bool)
+        for name in FIELDS:
+            items = self.features[name][row]
+            if not items or not weights.get(name):
+                continue
+            postings = self.postings[name]
+            intersection = np.bincount(
+                np.concatenate([postings[item] for item in items]),
+                minlength=len(self.pks)
+            )
+            union = len(items) + self.sizes[name] - intersection
+            scores += weights[name] * np.true_divide(intersection, union)
+            shared |= intersection > 0
+        scores += weights.get('project_type', 0) * (
+            self.types == self.types[row]
+        )
+        scores /= sum(weights.values()) or 1
+        scores[~shared] = 0
+        scores[row] = 0
+        return scores
+
+    def similar(self, pk, limit):
+        """
+        Returns up to `limit` (pk, score) of the projects most similar to
+        the project `pk`, best first.
+        """
+        row = self.rows.get(pk)
+        if row is None:
+            return []
+        scores = self.scores(row)
+        limit = min(limit, len(scores))
+        if not limit:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind='mergesort')]
+        return [
+            (int(self.pks[i]), float(scores[i])) for i in top if scores[i] > 0
+        ]
+
+
+def get_index():
+    """
+    Returns the index of this process, applying the changes recorded by
+    mark_changed since it was last used, or rebuilding it when they are no
+    longer in the cache.
+    """
+    version = get_version()
+    with _lock:
+        index = _local.get('index')
+        if index is not None and index.version != version:
+            # a flushed cache restarts the version at a random number, so
+            # the distance is checked before building the keys
+            if not 0 < version - index.version <= MAX_CHANGES:
+                keys, changes = [], {}
+            else:
+                keys = [
+                    _changes_key(number)
+                    for number in range(index.version + 1, version + 1)
+                ]
+                changes = cache.get_many(keys)
+            # rebuilt when changes expired or removed rows pile up
+            if (not keys or len(changes) != len(keys) or
+                    len(index.pks) > 2 * len(index.rows) + MAX_CHANGES):
+                index = None
+            else:
+                index.update(sorted(set(
+                    pk for pks in changes.values() for pk in pks
+                )))
+                index.version = version
+        if index is None:
+            index = SimilarityIndex(*load_features())
+            index.version = version
+        _local['index'] = index
+        return index
+
+
+def recommend(pk, limit=10):
+    """
+    Returns up to `limit` (project, score) of the projects most similar to
+    the project `pk`.
+    """
+    ranked = get_index().similar(pk, limit)
+    projects = Project.objects.select_related('client').in_bulk(
+        [similar_pk for similar_pk, score in ranked]
+    )
+    return [
+        (projects[similar_pk], score) for similar_pk, score in ranked
+        if similar_pk in projects
+    ]
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import errno
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+# Django Imports
+from django.apps import apps
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+
+def get_directory():
+    return getattr(settings, 'CONTENT_STORAGE_DIRECTORY', 'files')
+
+
+def stored_files():
+    # models.py uses the storage, so the model is looked up when used
+    return apps.get_model('project_management', 'StoredFile').objects
+
+
+def is_content_addressed(name):
+    """
+    Returns whether name is a file of ContentAddressedStorage, which never
+    changes content.
+    """
+    return re.match(
+        r'^{}/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[0-9a-f]{{64}}(\.\w+)?$'.format(
+            re.escape(get_directory())
+        ), name
+    ) is not None
+
+
+def file_digest(content, chunk_size=None):
+    """
+    Returns the SHA-256 of a File, read chunk by chunk.
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks(chunk_size):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores files of MEDIA_ROOT under the SHA-256 of their content, as
+    files/ab/cd/abcd....ext, so identical uploads share one file.
+
+    Each save adds a reference to the StoredFile row of the file and each
+    delete removes one; the file is deleted with its last reference.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # the name is chosen by _save from the content
+        return name
+
+    def content_name(self, digest, name):
+        extension = posixpath.splitext(name)[1].lower()
+        if not re.match(r'^\.\w+$', extension):
+            extension = ''
+        return posixpath.join(
+            get_directory(), digest[:2], digest[2:4], digest + extension
+        )
+
+    def _save(self, name, content):
+        name = self.content_name(file_digest(content), name)
+        full_path = self.path(name)
+        if not os.path.exists(full_path):
+            self.write(full_path, content)
+        self.add_reference(name, content.size)
+        return name
+
+    def write(self, full_path, content):
+        """
+        Writes content to a temporary file next to full_path and renames it,
+        so a concurrent upload of the same content never sees a partial
+        file. Uploads Django spooled to disk are moved instead of copied.
+        """
+        directory = os.path.dirname(full_path)
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+        fd, temporary = tempfile.mkstemp(dir=directory)
+        try:
+            if hasattr(content, 'temporary_file_path'):
+                os.close(fd)
+                file_move_safe(
+                    content.temporary_file_path(), temporary,
+                    allow_overwrite=True
+                )
+            else:
+                with os.fdopen(fd, 'wb') as output:
+                    for chunk in content.chunks():
+                        output.write(chunk)
+            os.chmod(temporary, self.file_permissions_mode or 0o644)
+            os.rename(temporary, full_path)
+        except Exception:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+    def add_reference(self, name, size):
+        files = stored_files()
+        if files.filter(name=name).update(references=F('references') + 1):
+            return
+        try:
+            with transaction.atomic():
+                files.create(name=name, size=size, references=1)
+        except IntegrityError:
+            # created by a concurrent save
+            files.filter(name=name).update(references=F('references') + 1)
+
+    def delete(self, name):
+        """
+        Removes a reference to the file, deleting it once the transaction
+        commits if it was the last one.
+        """
+        with transaction.atomic():
+            stored = stored_files().select_for_update().filter(
+                name=name
+            ).first()
+            if stored is None:
+                return
+            if stored.references > 1:
+                stored_files().filter(pk=stored.pk).update(
+                    references=F('references') - 1
+                )
+                return
+            stored.delete()
+        transaction.on_commit(lambda: self.delete_unreferenced(name))
+
+    def delete_unreferenced(self, name):
+        # unless saved again since the last reference was removed
+        if not stored_files().filter(name=name).exists():
+            super(ContentAddressedStorage, self).delete(name)
+
+
+content_storage = ContentAddressedStorage()
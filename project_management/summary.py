@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+# Project Imports
+from project_management.models import Project, ProjectSummary
+from project_management.utils import chunked
+
+
+def build_summary(project):
+    """
+    Renders the changelist columns of a project with tags, technologies
+    and domains prefetched and the client selected.
+    """
+    return ProjectSummary(
+        project=project,
+        client_detail=project._client_detail(),
+        demo_video_link=project._demo_video_link(),
+        domains=', '.join(domain.name for domain in project.domains.all()),
+        mobile_url=project._mobile_url(),
+        tags=project._tags(),
+        technologies=project._technologies(),
+        url=project._url(),
+    )
+
+
+def refresh_summaries(pks, batch_size=500):
+    """
+    Rebuilds the summaries of the given projects, `batch_size` projects
+    per DELETE and bulk INSERT.
+    """
+    pks = sorted(set(pks))
+    for batch in chunked(pks, batch_size):
+        projects = Project.objects.filter(pk__in=batch).select_related(
+            'client'
+        ).prefetch_related('domains', 'tags', 'technologies')
+        summaries = [build_summary(project) for project in projects]
+        with transaction.atomic(savepoint=False):
+            ProjectSummary.objects.filter(project__in=batch).delete()
+            ProjectSummary.objects.bulk_create(summaries)
+
+
+def summary_column(name):
+    """
+    Returns a list_display callable showing the pre-rendered `name` column
+    of the project's summary, falling back to the Project method of the
+    same name until the summary has been built.
+    """
+    method_name = '_{}'.format(name)
+
+    def column(self, obj):
+        try:
+            return mark_safe(getattr(obj.summary, name))
+        except ObjectDoesNotExist:
+            return getattr(obj, method_name)()
+
+    column.__name__ = method_name
+    return column
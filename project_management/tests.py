@@ -1,3 +1,1794 @@
-from django.test import TestCase
+# -*- coding: utf-8 -*-
 
-# Create your tests here.
+# Python Imports
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from decimal import Decimal
+
+# Django Imports
+import tablib
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+from PIL import Image
+
+# Project Imports
+from project_management import (
+    analytics, attachments, autocomplete, checks, dedup, domains, facets,
+    history, profiling, similar, thumbnails
+)
+from project_management.changelist import EstimatedCountPaginator
+from project_management.currency import parse_rates, set_rates
+from project_management.jobs import claim_jobs, run_job
+from project_management.models import (
+    JOB_ATTACHMENT_TEXT, JOB_COMPLETED, JOB_FAILED, JOB_RUNNING,
+    JOB_THUMBNAILS, AttachmentText, Client, ClientDuplicate, Domain,
+    ExchangeRate, Job, List, PipelineRollup, Project, ProjectStatusChange,
+    RequestProfile, StoredFile, Tags, Technology
+)
+from project_management.resources import ProjectResource
+from project_management.storage import content_storage
+
+
+class ChangeListQueryCountTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.domain = Domain.objects.create(name='Finance')
+        cls.tags = [Tags.objects.create(name='tag-%d' % i) for i in range(3)]
+        cls.technologies = [
+            Technology.objects.create(name='tech-%d' % i) for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def create_projects(self, count):
+        for i in range(count):
+            client = Client.objects.create(
+                first_name='First', last_name='Last',
+                email='client-%d-%d@example.com' % (Client.objects.count(), i),
+                country='IN', created_by=self.user, updated_by=self.user
+            )
+            project = Project.objects.create(
+                name='Project %d' % i, url='http://example.com',
+                description='Description', client=client,
+                project_budget=1000,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=self.user, updated_by=self.user
+            )
+            project.domains.add(self.domain)
+            project.tags.add(*self.tags)
+            project.technologies.add(*self.technologies)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_project_changelist_query_count_is_constant(self):
+        url = reverse('admin:project_management_project_changelist')
+        self.create_projects(2)
+        small_page = self.count_queries(url)
+        self.create_projects(20)
+        large_page = self.count_queries(url)
+        self.assertEqual(small_page, large_page)
+
+    def test_list_changelist_query_count_is_constant(self):
+        url = reverse('admin:project_management_list_changelist')
+        self.create_projects(5)
+        for i in range(2):
+            List.objects.create(
+                name='List %d' % i, created_by=self.user, updated_by=self.user
+            ).projects.add(*Project.objects.all())
+        small_page = self.count_queries(url)
+        for i in range(10):
+            List.objects.create(
+                name='More %d' % i, created_by=self.user, updated_by=self.user
+            ).projects.add(*Project.objects.all())
+        large_page = self.count_queries(url)
+        self.assertEqual(small_page, large_page)
+
+
+class ExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        domain = Domain.objects.create(name='Finance')
+        tag = Tags.objects.create(name='payments')
+        for i in range(3):
+            project = Project.objects.create(
+                name='Project %d' % i, url='http://example.com',
+                description='Description', project_budget=1000,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            project.domains.add(domain)
+            project.tags.add(tag)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, action):
+        return self.client.post(
+            reverse('admin:project_management_project_changelist'), {
+                'action': action,
+                '_selected_action': list(
+                    Project.objects.values_list('pk', flat=True)
+                ),
+            }
+        )
+
+    def test_export_as_csv_streams_m2m_columns(self):
+        response = self.export('export_as_csv')
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].endswith('tags,technologies,domains'))
+        self.assertTrue(lines[1].endswith('payments,,Finance'))
+
+    def test_export_as_excel_is_xlsx(self):
+        response = self.export('export_as_excel')
+        self.assertTrue(response.streaming)
+        content = b''.join(response.streaming_content)
+        # xlsx files are zip archives
+        self.assertEqual(content[:2], b'PK')
+
+
+class BackgroundJobTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_export_job(self):
+        for i in range(3):
+            Client.objects.create(
+                first_name='First', email='client-%d@example.com' % i,
+                country='IN', created_by=self.user, updated_by=self.user
+            )
+        response = self.client.post(
+            reverse('admin:project_management_client_changelist'), {
+                'action': 'export_in_background',
+                '_selected_action': list(
+                    Client.objects.values_list('pk', flat=True)
+                ),
+            }
+        )
+        job = Job.objects.get()
+        self.assertRedirects(
+            response,
+            reverse('admin:project_management_job_change', args=[job.pk])
+        )
+
+        self.assertEqual(claim_jobs(5), [job.pk])
+        self.assertEqual(Job.objects.get().status, JOB_RUNNING)
+        run_job(job.pk)
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertEqual((job.processed, job.total), (3, 3))
+        self.assertTrue(job.result_file.name.endswith('.xlsx'))
+
+        status = self.client.get(
+            reverse('admin:project_management_job_status', args=[job.pk])
+        ).json()
+        self.assertTrue(status['finished'])
+        self.assertEqual(status['progress'], 100)
+
+    def test_select_all_export_job_stores_the_filters(self):
+        for i in range(4):
+            Client.objects.create(
+                first_name='First', email='client-%d@example.com' % i,
+                country='IN', active=bool(i % 2),
+                created_by=self.user, updated_by=self.user
+            )
+        self.client.post(
+            reverse('admin:project_management_client_changelist') +
+            '?active__exact=1', {
+                'action': 'export_in_background',
+                'select_across': '1',
+                '_selected_action': list(
+                    Client.objects.values_list('pk', flat=True)[:1]
+                ),
+            }
+        )
+        job = Job.objects.get()
+        self.assertEqual(
+            job.params['selection'], {'params': 'active__exact=1'}
+        )
+
+        claim_jobs(1)
+        run_job(job.pk)
+        job = Job.objects.get()
+        self.assertEqual(job.status, JOB_COMPLETED)
+        self.assertEqual((job.processed, job.total), (2, 2))
+
+    def test_stale_running_jobs_are_failed(self):
+        content_type = ContentType.objects.get_for_model(Client)
+        stale = Job.objects.create(
+            kind=0, content_type=content_type, created_by=self.user,
+            status=JOB_RUNNING,
+            started_on=timezone.now() - datetime.timedelta(hours=1)
+        )
+        running = Job.objects.create(
+            kind=0, content_type=content_type, created_by=self.user,
+            status=JOB_RUNNING, started_on=timezone.now()
+        )
+        pending = Job.objects.create(
+            kind=0, content_type=content_type, created_by=self.user
+        )
+
+        with self.settings(JOB_TIMEOUT=60):
+            self.assertEqual(claim_jobs(5), [pending.pk])
+        self.assertEqual(Job.objects.get(pk=stale.pk).status, JOB_FAILED)
+        self.assertEqual(Job.objects.get(pk=running.pk).status, JOB_RUNNING)
+
+    def test_import_job(self):
+        data = b'id,first_name,email,country\n' + b''.join(
+            b',Imported,imported-%d@example.com,IN\n' % i for i in range(5)
+        )
+        self.client.post(
+            reverse('admin:project_management_client_import_job'), {
+                'import_file': SimpleUploadedFile('clients.csv', data),
+                'input_format': '0',
+            }
+        )
+        job = Job.objects.get()
+        claim_jobs(1)
+        run_job(job.pk)
+
+        job = Job.objects.get()
+        self.assertEqual(job.status, JOB_COMPLETED, job.error)
+        self.assertEqual((job.processed, job.total), (5, 5))
+        self.assertEqual(
+            Client.objects.filter(
+                first_name='Imported', created_by=self.user,
+                updated_by=self.user
+            ).count(), 5
+        )
+
+
+class ProjectBulkImportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.client_obj = Client.objects.create(
+            email='client@example.com', country='IN',
+            created_by=cls.user, updated_by=cls.user
+        )
+        Domain.objects.create(name='Finance')
+        Tags.objects.create(name='payments')
+        Technology.objects.create(name='Django')
+        Technology.objects.create(name='React')
+
+    def make_dataset(self, *rows):
+        dataset = tablib.Dataset(headers=[
+            'id', 'name', 'url', 'client', 'project_start_date',
+            'project_budget', 'project_budget_currency', 'description',
+            'tags', 'technologies', 'domains',
+        ])
+        for row in rows:
+            dataset.append(row)
+        return dataset
+
+    def test_bulk_import_creates_and_updates(self):
+        project = Project.objects.create(
+            name='Old name', url='http://example.com', description='Old',
+            project_budget=10, project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user
+        )
+        project.technologies.add(Technology.objects.get(name='React'))
+        dataset = self.make_dataset(
+            ['', 'New', 'http://new.example.com', 'client@example.com',
+             '2018-02-01', '500', 'INR', 'Description', 'payments',
+             'Django, React', 'Finance'],
+            [project.pk, 'Renamed', 'http://example.com', '', '2018-03-01',
+             '750', 'EUR', 'Updated', '', 'Django, Unknown', ''],
+        )
+
+        result = ProjectResource().bulk_import(dataset, user=self.user)
+
+        self.assertFalse(result.has_errors())
+        self.assertEqual((result.new, result.updated), (1, 1))
+        new = Project.objects.get(name='New')
+        self.assertEqual(new.client, self.client_obj)
+        self.assertEqual(new.project_budget.currency.code, 'INR')
+        self.assertEqual(
+            sorted(new.technologies.values_list('name', flat=True)),
+            ['Django', 'React']
+        )
+        project.refresh_from_db()
+        self.assertEqual(project.name, 'Renamed')
+        self.assertEqual(project.project_start_date, datetime.date(2018, 3, 1))
+        self.assertEqual(project.project_budget.amount, 750)
+        self.assertEqual(
+            list(project.technologies.values_list('name', flat=True)),
+            ['Django']
+        )
+
+    def count_queries(self, count):
+        rows = []
+        for i in range(count // 2):
+            project = Project.objects.create(
+                name='Old %d' % i, url='http://example.com',
+                description='Old', project_budget=10,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=self.user, updated_by=self.user
+            )
+            rows.append([
+                '', 'New %d' % i, 'http://new.example.com',
+                'client@example.com', '2018-02-01', '500', 'INR',
+                'Description', 'payments', 'Django, React', 'Finance'
+            ])
+            rows.append([
+                project.pk, 'Renamed %d' % i, 'http://example.com', '',
+                '2018-03-01', '750', 'EUR', 'Updated', '', 'Django', ''
+            ])
+        with CaptureQueriesContext(connection) as context:
+            result = ProjectResource().bulk_import(
+                self.make_dataset(*rows), user=self.user
+            )
+        self.assertEqual((result.new, result.updated), (count // 2,) * 2)
+        return len(context.captured_queries)
+
+    def test_bulk_import_query_count_is_constant(self):
+        self.assertEqual(self.count_queries(2), self.count_queries(20))
+
+    def test_invalid_values_are_reported_per_row(self):
+        row = ['', 'New', 'http://example.com', '', '2018-02-01', '500',
+               'USD', 'Description', '', '', '']
+        bad_budget = list(row)
+        bad_budget[5] = 'a lot'
+        no_start_date = list(row)
+        no_start_date[4] = ''
+        no_name = list(row)
+        no_name[1] = ''
+        result = ProjectResource().bulk_import(
+            self.make_dataset(row, bad_budget, no_start_date, no_name),
+            user=self.user
+        )
+        self.assertEqual(result.errors, [
+            (2, "Invalid project_budget 'a lot'"),
+            (3, 'project_start_date: This field cannot be null.'),
+            (4, 'name: This field cannot be blank.'),
+        ])
+        self.assertFalse(Project.objects.exists())
+
+    def test_bulk_import_dry_run_and_errors_save_nothing(self):
+        row = ['', 'New', 'http://example.com', '', '2018-02-01', '500',
+               'USD', 'Description', '', '', '']
+        result = ProjectResource().bulk_import(
+            self.make_dataset(row), dry_run=True
+        )
+        self.assertEqual(result.new, 1)
+        self.assertFalse(Project.objects.exists())
+
+        bad_row = list(row)
+        bad_row[3] = 'missing@example.com'
+        result = ProjectResource().bulk_import(
+            self.make_dataset(row, bad_row), user=self.user
+        )
+        self.assertEqual([number for number, _ in result.errors], [2])
+        self.assertFalse(Project.objects.exists())
+
+
+class SearchVectorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.project = Project.objects.create(
+            name='Payment gateway', url='http://example.com',
+            description='Integration of card payments',
+            project_start_date=datetime.date(2018, 1, 1), project_budget=100,
+            created_by=cls.user, updated_by=cls.user
+        )
+        Project.objects.create(
+            name='Travel portal', url='http://example.com',
+            description='Booking engine with payments',
+            project_start_date=datetime.date(2018, 1, 1), project_budget=100,
+            created_by=cls.user, updated_by=cls.user
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def search(self, term):
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'q': term}
+        )
+        return [
+            project.name for project in response.context['cl'].result_list
+        ]
+
+    def test_search_ranks_name_matches_first(self):
+        self.assertEqual(
+            self.search('payment'), ['Payment gateway', 'Travel portal']
+        )
+
+    def test_search_vector_follows_m2m_changes(self):
+        technology = Technology.objects.create(name='Django')
+        self.assertEqual(self.search('django'), [])
+        self.project.technologies.add(technology)
+        self.assertEqual(self.search('django'), ['Payment gateway'])
+
+        technology.name = 'Flask'
+        technology.save()
+        self.assertEqual(self.search('django'), [])
+        self.assertEqual(self.search('flask'), ['Payment gateway'])
+
+        technology.project_set.clear()
+        self.assertEqual(self.search('flask'), [])
+
+
+class AutocompleteTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        for name in ('Django', 'Django REST framework', 'Flask'):
+            Technology.objects.create(name=name)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def search(self, name, term):
+        response = self.client.get(
+            reverse('project_management:autocomplete', args=[name]),
+            {'q': term}
+        )
+        return [result['text'] for result in response.json()['results']]
+
+    def test_results_are_ranked_and_limited(self):
+        self.assertEqual(
+            self.search('technology', 'django'),
+            ['Django', 'Django REST framework']
+        )
+        with self.settings(AUTOCOMPLETE_LIMIT=1):
+            cache.clear()
+            self.assertEqual(self.search('technology', 'django'), ['Django'])
+
+    def test_longer_terms_are_served_from_cached_prefix(self):
+        self.search('technology', 'dj')
+        with self.assertNumQueries(0):
+            results = autocomplete.search('technology', 'django r')
+        self.assertEqual(
+            [result['text'] for result in results], ['Django REST framework']
+        )
+
+    def test_cached_prefix_matches_per_field(self):
+        Client.objects.create(
+            first_name='John', last_name='Smith', email='js@example.com',
+            country='IN', created_by=self.user, updated_by=self.user
+        )
+        self.assertEqual(self.search('client', 'j'), [
+            'John Smith <js@example.com>'
+        ])
+        # like the database, a term spanning two fields does not match
+        self.assertEqual(self.search('client', 'john smith'), [])
+        self.assertEqual(self.search('client', 'smi'), [
+            'John Smith <js@example.com>'
+        ])
+
+    def test_staff_without_permission_is_denied(self):
+        staff = User.objects.create_user(
+            'staff', 'staff@example.com', 'password', is_staff=True
+        )
+        self.client.force_login(staff)
+        response = self.client.get(
+            reverse('project_management:autocomplete', args=['client']),
+            {'q': 'john'}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_cache_is_invalidated_on_save(self):
+        self.assertEqual(self.search('technology', 'flask'), ['Flask'])
+        Technology.objects.filter(name='Flask').get().delete()
+        self.assertEqual(self.search('technology', 'flask'), [])
+
+    def test_unknown_source(self):
+        response = self.client.get(
+            reverse('project_management:autocomplete', args=['project'])
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class LazyFilterTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        for i in range(5):
+            Client.objects.create(
+                first_name='First', last_name='Last',
+                email='client-%d@example.com' % i, country='IN',
+                created_by=cls.user, updated_by=cls.user
+            )
+        User.objects.create_user('editor', 'editor@example.com')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def choices(self, model_name, field, **params):
+        params['field'] = field
+        return self.client.get(
+            reverse(
+                'project_management:filter_choices',
+                args=['project_management', model_name]
+            ),
+            params
+        )
+
+    def test_changelist_does_not_load_filter_values(self):
+        response = self.client.get(
+            reverse('admin:project_management_client_changelist')
+        )
+        self.assertContains(response, 'data-lookup="email"')
+        self.assertNotContains(
+            response, 'value="?email=client-0%40example.com"'
+        )
+
+    def test_selected_related_value_is_displayed(self):
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'created_by__id__exact': self.user.pk}
+        )
+        self.assertContains(response, '>admin</option>')
+
+    def test_choices_are_paginated_and_searchable(self):
+        with self.settings(FILTER_CHOICES_PAGE_SIZE=2):
+            data = self.choices('client', 'email', page=3).json()
+            self.assertEqual(
+                [result['value'] for result in data['results']],
+                ['client-4@example.com']
+            )
+            self.assertFalse(data['more'])
+            self.assertTrue(self.choices('client', 'email').json()['more'])
+
+        data = self.choices('project', 'created_by', q='admin').json()
+        self.assertEqual(
+            data['results'], [{'value': str(self.user.pk), 'display': 'admin'}]
+        )
+
+    def test_only_lazy_filters_are_served(self):
+        self.assertEqual(self.choices('client', 'country').status_code, 404)
+        self.assertEqual(self.choices('client', 'feedback').status_code, 404)
+
+
+class FacetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.tag = Tags.objects.create(name='payments')
+        for i, budget in enumerate((500, 2000, 20000)):
+            project = Project.objects.create(
+                name='Project %d' % i, url='http://example.com',
+                description='Description', project_budget=budget,
+                project_status=4 if i else 0,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            if i:
+                project.tags.add(cls.tag)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def changelist(self, **params):
+        return self.client.get(
+            reverse('admin:project_management_project_changelist'), params
+        )
+
+    def choices(self, field, **params):
+        response = self.client.get(
+            reverse(
+                'project_management:filter_choices',
+                args=['project_management', 'project']
+            ),
+            {'field': field, 'params': urlencode(params)}
+        )
+        return [result['display'] for result in response.json()['results']]
+
+    def test_sidebar_shows_counts(self):
+        response = self.changelist()
+        self.assertContains(response, 'Completed (2)')
+        self.assertContains(response, 'Over 15,000 (1)')
+        self.assertNotContains(response, 'payments (')
+        self.assertEqual(self.choices('tags'), ['payments (2)'])
+
+        response = self.changelist(project_status__exact=0)
+        self.assertContains(response, 'Completed (0)')
+        self.assertEqual(self.choices('tags', project_status__exact=0), [])
+
+        response = self.changelist(tags__id__exact=self.tag.pk)
+        self.assertContains(response, 'payments (2)')
+
+    def test_counts_are_cached_until_projects_change(self):
+        with CaptureQueriesContext(connection) as first:
+            self.changelist()
+        with CaptureQueriesContext(connection) as second:
+            self.changelist()
+        # the relation facets are only counted for their options
+        self.assertEqual(
+            len(first.captured_queries) - len(second.captured_queries), 5
+        )
+        with CaptureQueriesContext(connection) as first:
+            self.choices('tags')
+        with CaptureQueriesContext(connection) as second:
+            self.choices('tags')
+        self.assertEqual(
+            len(first.captured_queries) - len(second.captured_queries), 1
+        )
+
+        Project.objects.get(project_status=0).tags.add(self.tag)
+        self.assertEqual(self.choices('tags'), ['payments (3)'])
+
+
+class EstimatedCountTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        for i in range(3):
+            Client.objects.create(
+                first_name='First', email='client-%d@example.com' % i,
+                country='IN', created_by=cls.user, updated_by=cls.user
+            )
+
+    def test_paginator_estimates_above_threshold(self):
+        queryset = Client.objects.filter(first_name='First').order_by('pk')
+        paginator = EstimatedCountPaginator(queryset, 10)
+        self.assertEqual((paginator.count, paginator.estimated), (3, False))
+
+        with self.settings(ESTIMATED_COUNT_THRESHOLD=1):
+            paginator = EstimatedCountPaginator(queryset, 10)
+            with self.assertNumQueries(1):
+                self.assertGreater(paginator.count, 0)
+            self.assertTrue(paginator.estimated)
+
+    def test_changelist_shows_full_result_count(self):
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:project_management_client_changelist'),
+            {'q': 'client'}
+        )
+        changelist = response.context['cl']
+        self.assertTrue(changelist.show_full_result_count)
+        self.assertEqual(changelist.full_result_count, 3)
+
+
+class KeysetPaginationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        # rows sharing created_on values are ordered by id
+        List.objects.bulk_create([
+            List(name='List %d' % i, created_by=cls.user, updated_by=cls.user)
+            for i in range(205)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, url='', **params):
+        response = self.client.get(
+            reverse('admin:project_management_list_changelist') + url, params
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.context['cl']
+
+    def pks(self, changelist):
+        return [obj.pk for obj in changelist.result_list]
+
+    def test_pages_follow_cursors(self):
+        expected = list(
+            List.objects.order_by('-created_on', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+        changelist = self.get()
+        self.assertTrue(changelist.keyset)
+        self.assertIsNone(changelist.previous_url)
+        pages = [self.pks(changelist)]
+        while changelist.next_url:
+            changelist = self.get(changelist.next_url)
+            pages.append(self.pks(changelist))
+        self.assertEqual([len(page) for page in pages], [100, 100, 5])
+        self.assertEqual(sum(pages, []), expected)
+
+        changelist = self.get(changelist.previous_url)
+        self.assertEqual(self.pks(changelist), pages[1])
+        changelist = self.get(changelist.previous_url)
+        self.assertEqual(self.pks(changelist), pages[0])
+        self.assertIsNone(changelist.previous_url)
+
+    def test_offset_pages_and_bad_cursors(self):
+        changelist = self.get(p=1)
+        self.assertIsNone(changelist.keyset)
+        self.assertEqual(len(changelist.result_list), 100)
+
+        response = self.client.get(
+            reverse('admin:project_management_list_changelist'),
+            {'cursor': 'invalid'}
+        )
+        self.assertRedirects(
+            response,
+            reverse('admin:project_management_list_changelist') + '?e=1',
+            fetch_redirect_response=False
+        )
+
+
+class ListCreationTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        for i in range(6):
+            Project.objects.create(
+                name='Project %d' % i, url='http://example.com',
+                description='Description', project_budget=1000,
+                project_status=4 if i % 2 else 0,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def select(self, pks=(), query=''):
+        data = {'action': 'create_list', '_selected_action': list(pks)}
+        if not pks:
+            data.update({
+                'select_across': '1',
+                '_selected_action': Project.objects.values_list(
+                    'pk', flat=True
+                )[:1],
+            })
+        return self.client.post(
+            reverse('admin:project_management_project_changelist') + query,
+            data
+        )
+
+    def add_to_list(self, **data):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse('project_management:create_custom_list'), data
+            )
+        self.assertRedirects(
+            response, '/admin/project_management/list/',
+            fetch_redirect_response=False
+        )
+        return [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith(
+                'INSERT INTO "project_management_list_projects"'
+            )
+        ]
+
+    def test_selected_rows_are_inserted_at_once(self):
+        pks = list(Project.objects.values_list('pk', flat=True)[:3])
+        response = self.select(pks)
+        self.assertContains(response, 'The following 3 projects')
+
+        inserts = self.add_to_list(name='Selected')
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            sorted(List.objects.get().projects.values_list('pk', flat=True)),
+            sorted(pks)
+        )
+
+    def test_select_all_appends_without_duplicates(self):
+        completed = Project.objects.filter(project_status=4)
+        project_list = List.objects.create(
+            name='Existing', created_by=self.user, updated_by=self.user
+        )
+        project_list.projects.add(completed[0])
+
+        self.select(query='?project_status__exact=4')
+        self.add_to_list(project_list=project_list.pk)
+        self.assertEqual(
+            set(project_list.projects.all()), set(completed)
+        )
+
+    def test_name_or_existing_list_is_required(self):
+        self.select(Project.objects.values_list('pk', flat=True)[:1])
+        response = self.client.post(
+            reverse('project_management:create_custom_list'), {}
+        )
+        self.assertContains(response, 'Enter a name for a new list')
+
+
+class ProjectSummaryTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.customer = Client.objects.create(
+            first_name='Ada', last_name='Lovelace',
+            email='ada@example.com', country='IN',
+            created_by=cls.user, updated_by=cls.user
+        )
+        cls.tag = Tags.objects.create(name='payments')
+        cls.project = Project.objects.create(
+            name='Ledger', url='http://example.com',
+            description='Description', client=cls.customer,
+            project_budget=1000,
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=cls.user, updated_by=cls.user
+        )
+
+    def summary(self):
+        return Project.objects.get(pk=self.project.pk).summary
+
+    def test_summary_follows_related_changes(self):
+        self.assertIn('Ada Lovelace', self.summary().client_detail)
+
+        self.project.tags.add(self.tag)
+        self.assertIn('payments', self.summary().tags)
+
+        self.tag.name = 'billing'
+        self.tag.save()
+        self.customer.first_name = 'Grace'
+        self.customer.save()
+        summary = self.summary()
+        self.assertIn('billing', summary.tags)
+        self.assertIn('Grace Lovelace', summary.client_detail)
+
+        self.tag.delete()
+        self.assertEqual(self.summary().tags, '')
+
+    def test_changelist_renders_from_summaries(self):
+        self.client.force_login(self.user)
+        self.project.tags.add(self.tag)
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist')
+        )
+        self.assertContains(response, 'payments')
+        self.assertContains(response, 'Ada Lovelace')
+
+
+class DomainTreeTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.finance = Domain.objects.create(name='Finance')
+        cls.banking = Domain.objects.create(name='Banking', parent=cls.finance)
+        cls.loans = Domain.objects.create(name='Loans', parent=cls.banking)
+        cls.health = Domain.objects.create(name='Health')
+        for domain in (cls.finance, cls.loans, cls.health):
+            project = Project.objects.create(
+                name=domain.name, url='http://example.com',
+                description='Description', project_budget=1000,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            project.domains.add(domain)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_process_local_cache_is_reported(self):
+        self.assertEqual(checks.check_shared_cache(None), [])
+        with self.settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }}):
+            self.assertEqual(
+                [warning.id for warning in checks.check_shared_cache(None)],
+                ['project_management.W001']
+            )
+
+    def names(self, domain):
+        return sorted(
+            domains.filter_subtree(
+                Project.objects.all(), 'domains', domain.pk
+            ).values_list('name', flat=True)
+        )
+
+    def test_tree_is_cached_until_a_domain_moves(self):
+        tree = domains.get_tree()
+        self.assertEqual(
+            [node.name for node in tree.descendants(self.finance.pk)],
+            ['Banking', 'Loans']
+        )
+        with self.assertNumQueries(0):
+            self.assertIs(domains.get_tree(), tree)
+
+        self.banking.move_to(self.health, 'last-child')
+        tree = domains.get_tree()
+        self.assertEqual(
+            [node.name for node in tree.ancestors(self.loans.pk)],
+            ['Health', 'Banking']
+        )
+        self.assertEqual(tree.descendants(self.finance.pk), [])
+
+    def test_changelist_tree_is_built_from_the_cached_tree(self):
+        model_admin = admin.site._registry[Domain]
+        domains.get_tree()
+        with self.assertNumQueries(0):
+            structure = model_admin._build_tree_structure(None)
+        self.assertEqual(structure, {
+            0: [self.finance.pk, self.health.pk],
+            str(self.finance.pk): [self.banking.pk],
+            str(self.banking.pk): [self.loans.pk],
+        })
+
+    def test_filter_matches_descendants(self):
+        self.assertEqual(self.names(self.finance), ['Finance', 'Loans'])
+        self.assertEqual(self.names(self.banking), ['Loans'])
+
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'domains__id__exact': self.finance.pk}
+        )
+        self.assertEqual(
+            sorted(obj.name for obj in response.context['cl'].result_list),
+            ['Finance', 'Loans']
+        )
+
+
+@override_settings(BASE_CURRENCY='USD')
+class BaseCurrencyBudgetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        ExchangeRate.objects.create(currency='INR', rate='0.0125')
+        for currency, budget in (('USD', 5000), ('INR', 5000), ('EUR', 10)):
+            Project.objects.create(
+                name=currency, url='http://example.com',
+                description='Description', project_budget=budget,
+                project_budget_currency=currency,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+
+    def base_budgets(self):
+        return dict(
+            Project.objects.values_list('name', 'project_budget_base')
+        )
+
+    def test_budgets_are_converted_on_save(self):
+        self.assertEqual(self.base_budgets(), {
+            'USD': Decimal('5000.00'), 'INR': Decimal('62.50'), 'EUR': None,
+        })
+
+    def test_loading_rates_updates_budgets(self):
+        rates = parse_rates('currency,rate\nEUR,1.15\nINR,0.0125\n')
+        version = cache.get(facets._version_key(Project))
+        self.assertEqual(set_rates(rates), ['EUR'])
+        # the budget range counts are computed again
+        self.assertNotEqual(cache.get(facets._version_key(Project)), version)
+        self.assertEqual(self.base_budgets()['EUR'], Decimal('11.50'))
+
+        ExchangeRate.objects.filter(currency='INR').get().delete()
+        self.assertIsNone(self.base_budgets()['INR'])
+
+        with self.assertRaises(ValueError):
+            parse_rates('EUR,-1')
+
+    def test_budget_range_compares_base_amounts(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'project_budget': '0'}
+        )
+        self.assertEqual(
+            [obj.name for obj in response.context['cl'].result_list],
+            ['INR']
+        )
+
+
+class PipelineRollupTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.django = Technology.objects.create(name='Django')
+        cls.finance = Domain.objects.create(name='Finance')
+        for status in (0, 0, 2):
+            project = Project.objects.create(
+                name='Project', url='http://example.com',
+                description='Description', project_budget=1000,
+                project_status=status,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            project.technologies.add(cls.django)
+        project.domains.add(cls.finance)
+
+    def totals(self, **filters):
+        return dict(
+            PipelineRollup.objects.filter(**filters).values_list(
+                'project_status', 'projects'
+            )
+        )
+
+    def test_refresh_rebuilds_changed_months(self):
+        analytics.refresh()
+        overall = {'technology': None, 'domain': None}
+        self.assertEqual(self.totals(**overall), {0: 2, 2: 1})
+        self.assertEqual(self.totals(technology=self.django), {0: 2, 2: 1})
+        self.assertEqual(self.totals(domain=self.finance), {2: 1})
+        self.assertEqual(analytics.refresh().months, 0)
+
+        project = Project.objects.filter(project_status=0).first()
+        project.project_status = 2
+        project.save()
+        Project.objects.filter(project_status=0).delete()
+        self.assertEqual(analytics.refresh().months, 1)
+        self.assertEqual(self.totals(**overall), {2: 2})
+
+    def test_dashboard(self):
+        analytics.refresh()
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse('admin:project_management_project_analytics')
+        )
+        self.assertContains(response, 'Closed (In Progress)')
+        months = response.context['months']
+        self.assertEqual(len(months), 1)
+        self.assertEqual(months[0]['projects'], 3)
+        self.assertEqual(months[0]['budget'], Decimal('3000.00'))
+
+
+class StatusHistoryTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        start = timezone.now() - datetime.timedelta(days=30)
+        # statuses of each project, a day apart
+        for statuses in ((0,), (0, 1), (0, 1, 3), (0, 2, 4), (1, 2)):
+            project = Project.objects.create(
+                name='Project', url='http://example.com',
+                description='Description', project_budget=1000,
+                project_status=statuses[-1],
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            previous = None
+            for day, status in enumerate(statuses):
+                ProjectStatusChange.objects.create(
+                    project=project, from_status=previous, to_status=status,
+                    changed_on=start + datetime.timedelta(days=day)
+                )
+                previous = status
+
+    def test_funnel(self):
+        self.assertEqual(history.funnel(), [
+            (0, 5, None), (1, 4, 0.8), (2, 2, 0.5), (4, 1, 0.5),
+        ])
+        self.assertEqual(
+            history.funnel(projects=Project.objects.filter(project_status=2)),
+            [(0, 1, None), (1, 1, 1.0), (2, 1, 1.0), (4, 0, 0.0)]
+        )
+        self.assertEqual(
+            history.funnel(since=timezone.now())[0], (0, 0, None)
+        )
+
+    def test_time_in_stage(self):
+        stays = history.time_in_stage()
+        self.assertEqual(stays[0], (datetime.timedelta(days=1), 3))
+        self.assertEqual(stays[1], (datetime.timedelta(days=1), 2))
+        self.assertNotIn(3, stays)
+        current = history.time_in_stage(include_current=True)
+        self.assertEqual(current[3][1], 1)
+        self.assertGreater(current[3][0], datetime.timedelta(days=27))
+
+    def test_import_preview_without_transaction_records_nothing(self):
+        project = Project.objects.filter(project_status=1).first()
+        dataset = tablib.Dataset(headers=['id', 'project_status'])
+        dataset.append([project.pk, 2])
+        count = ProjectStatusChange.objects.count()
+        ProjectResource().import_data(
+            dataset, dry_run=True, use_transactions=False
+        )
+        self.assertEqual(ProjectStatusChange.objects.count(), count)
+
+    def test_bulk_import_records_changes(self):
+        project = Project.objects.filter(project_status=1).first()
+        dataset = tablib.Dataset(headers=['id', 'project_status'])
+        dataset.append([project.pk, 2])
+        ProjectResource().bulk_import(dataset, user=self.user)
+        change = project.status_changes.last()
+        self.assertEqual(
+            (change.from_status, change.to_status, change.changed_by),
+            (1, 2, self.user)
+        )
+
+
+class SimilarProjectTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.django, cls.react = [
+            Technology.objects.create(name=name)
+            for name in ('Django', 'React')
+        ]
+        cls.finance = Domain.objects.create(name='Finance')
+        cls.projects = {}
+        for name, technologies, domains in (
+                ('Bid', (cls.django, cls.react), (cls.finance,)),
+                ('Same stack', (cls.django, cls.react), ()),
+                ('Same domain', (cls.django,), (cls.finance,)),
+                ('Unrelated', (), ())):
+            project = Project.objects.create(
+                name=name, url='http://example.com',
+                description='Description', project_budget=1000,
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=cls.user, updated_by=cls.user
+            )
+            project.technologies.add(*technologies)
+            project.domains.add(*domains)
+            cls.projects[name] = project
+
+    def setUp(self):
+        cache.clear()
+        similar._local.clear()
+
+    def names(self, name):
+        return [
+            project.name for project, score in
+            similar.recommend(self.projects[name].pk)
+        ]
+
+    def test_projects_are_ranked_by_shared_features(self):
+        self.assertEqual(self.names('Bid'), ['Same domain', 'Same stack'])
+
+    def test_index_follows_relation_changes(self):
+        self.names('Bid')
+        self.projects['Unrelated'].domains.add(self.finance)
+        self.projects['Unrelated'].technologies.add(
+            self.django, self.react
+        )
+        with self.assertNumQueries(5):
+            self.assertEqual(self.names('Bid')[0], 'Unrelated')
+
+    def test_index_is_rebuilt_after_a_version_jump(self):
+        self.names('Bid')
+        # a flushed cache restarts the version at a random number
+        cache.set(similar.VERSION_KEY, similar.get_version() + 10 ** 9, None)
+        self.assertEqual(self.names('Bid'), ['Same domain', 'Same stack'])
+        self.assertEqual(
+            similar._local['index'].version, similar.get_version()
+        )
+
+    def test_change_form_shows_similar_projects(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse(
+            'admin:project_management_project_change',
+            args=[self.projects['Bid'].pk]
+        ))
+        self.assertContains(response, 'Similar projects')
+        self.assertContains(response, 'Same domain')
+
+
+class ClientDuplicateTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        cls.clients = {}
+        for key, first_name, last_name, email, phone_number in (
+                ('original', 'José', 'Smith', 'jose.smith@example.com',
+                 '+919876543210'),
+                ('duplicate', 'Jose', 'Smyth', 'josesmith+bd@example.org',
+                 '+91 98765 43210'),
+                ('other', 'Ann', 'Lee', 'ann@example.com', None)):
+            cls.clients[key] = Client.objects.create(
+                first_name=first_name, last_name=last_name, email=email,
+                phone_number=phone_number, country='IN',
+                created_by=cls.user, updated_by=cls.user
+            )
+        cls.project = Project.objects.create(
+            name='Project', url='http://example.com',
+            description='Description', client=cls.clients['duplicate'],
+            project_budget=1000,
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=cls.user, updated_by=cls.user
+        )
+
+    def test_normalization(self):
+        self.assertEqual(dedup.soundex('Robert'), 'R163')
+        self.assertEqual(dedup.soundex('Rupert'), 'R163')
+        self.assertEqual(dedup.soundex('Ashcraft'), 'A261')
+        self.assertEqual(
+            dedup.normalize_phone('098765 43210', 'IN'), '+919876543210'
+        )
+        self.assertEqual(
+            dedup.normalize_email('Jose.Smith+bd@gmail.com'), 'josesmith'
+        )
+        self.assertEqual(dedup.normalize_skype('live:J.Smith'), 'jsmith')
+
+    def test_find_duplicates(self):
+        duplicates = dedup.find_duplicates(dedup.load_records(chunk_size=2))
+        self.assertEqual(len(duplicates), 1)
+        first, second, value, reasons = duplicates[0]
+        self.assertEqual(
+            (first, second),
+            (self.clients['original'].pk, self.clients['duplicate'].pk)
+        )
+        self.assertIn('phone', reasons)
+        self.assertIn('email', reasons)
+
+    def test_merge_moves_projects(self):
+        original = self.clients['original']
+        self.assertEqual(
+            dedup.merge_clients(original, [self.clients['duplicate']]), 1
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.client, original)
+        self.assertFalse(
+            Client.objects.filter(pk=self.clients['duplicate'].pk).exists()
+        )
+
+    def test_duplicates_page(self):
+        dedup.save_duplicates(dedup.find_duplicates(dedup.load_records()))
+        self.client.force_login(self.user)
+        url = reverse('admin:project_management_client_duplicates')
+        self.assertContains(self.client.get(url), 'Smyth')
+        pair = ClientDuplicate.objects.get()
+        self.client.post(url, {'pair': pair.pk, 'keep': 'client'})
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.client_id, pair.client_id)
+        self.assertFalse(ClientDuplicate.objects.exists())
+
+
+@override_settings(
+    LOGO_THUMBNAIL_SIZES=((150, 150), (48, 48)),
+    LOGO_THUMBNAIL_FORMATS=('jpeg',)
+)
+class LogoThumbnailTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def upload(self, color):
+        output = io.BytesIO()
+        Image.new('RGBA', (600, 400), color).save(output, 'PNG')
+        return SimpleUploadedFile(
+            'logo.png', output.getvalue(), content_type='image/png'
+        )
+
+    def test_upload_queues_thumbnails(self):
+        project = Project.objects.create(
+            name='Project', url='http://example.com',
+            description='Description', project_budget=1000,
+            logo=self.upload((255, 0, 0, 255)),
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user
+        )
+        job = Job.objects.get(kind=JOB_THUMBNAILS)
+        self.assertEqual(job.params['pks'], [project.pk])
+        self.assertIn('width="150"', project._logo())
+
+        self.assertEqual(claim_jobs(5), [job.pk])
+        run_job(job.pk)
+        self.assertEqual(Job.objects.get().status, JOB_COMPLETED)
+
+        project.refresh_from_db()
+        self.assertFalse(thumbnails.is_stale(project))
+        renditions = project.logo_thumbnails['sizes']
+        self.assertEqual(set(renditions), {'150x150', '48x48'})
+        name = renditions['48x48']['jpeg']
+        self.assertTrue(name.endswith('.jpg'))
+        self.assertIn('.48x48.', name)
+        with Image.open(default_storage.path(name)) as image:
+            self.assertEqual(image.size, (48, 48))
+        self.assertIn(renditions['150x150']['jpeg'], project._logo())
+
+        # a new logo replaces the renditions of the previous one
+        project.logo = self.upload((0, 0, 255, 255))
+        project.save()
+        thumbnails.update_thumbnails([project.pk])
+        self.assertFalse(default_storage.exists(name))
+
+    def test_shared_renditions_are_kept(self):
+        projects = [
+            Project.objects.create(
+                name='Project %d' % i, url='http://example.com',
+                description='Description', project_budget=1000,
+                logo=self.upload((255, 0, 0, 255)),
+                project_start_date=datetime.date(2018, 1, 1),
+                created_by=self.user, updated_by=self.user
+            )
+            for i in range(2)
+        ]
+        # identical uploads are one stored file with the same renditions
+        self.assertEqual(projects[0].logo.name, projects[1].logo.name)
+        thumbnails.update_thumbnails([project.pk for project in projects])
+        for project in projects:
+            project.refresh_from_db()
+        self.assertEqual(
+            projects[0].logo_thumbnails, projects[1].logo_thumbnails
+        )
+        names = thumbnails.rendition_names(projects[1].logo_thumbnails)
+
+        projects[0].logo = self.upload((0, 0, 255, 255))
+        projects[0].save()
+        thumbnails.update_thumbnails([projects[0].pk])
+        for name in names:
+            self.assertTrue(default_storage.exists(name))
+        projects[1].refresh_from_db()
+        self.assertFalse(thumbnails.is_stale(projects[1]))
+
+    def test_undecodable_logo_is_recorded(self):
+        project = Project.objects.create(
+            name='Project', url='http://example.com',
+            description='Description', project_budget=1000,
+            logo=SimpleUploadedFile('logo.png', b'not an image'),
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user
+        )
+        self.assertEqual(thumbnails.update_thumbnails([project.pk]), 1)
+        project.refresh_from_db()
+        self.assertIn('error', project.logo_thumbnails)
+        self.assertFalse(thumbnails.is_stale(project))
+        self.assertIn('width="150"', project._logo())
+
+        # saving the project again does not queue the logo again
+        Job.objects.all().delete()
+        project.name = 'Renamed'
+        project.save()
+        self.assertFalse(Job.objects.filter(kind=JOB_THUMBNAILS).exists())
+
+    def test_backfill_command(self):
+        project = Project.objects.create(
+            name='Project', url='http://example.com',
+            description='Description', project_budget=1000,
+            logo=self.upload((0, 255, 0, 128)),
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user
+        )
+        call_command('generate_logo_thumbnails', stdout=io.StringIO())
+        project.refresh_from_db()
+        self.assertFalse(thumbnails.is_stale(project))
+
+
+class MediaServingTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.name = default_storage.save(
+            'attachment.txt', ContentFile(b'0123456789')
+        )
+        self.url = reverse('media', args=[self.name])
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_whole_file(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(response['Content-Length'], '10')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_percent_in_name_is_not_decoded_twice(self):
+        for name, content in (('report%2041.txt', b'percent'),
+                              ('report 41.txt', b'space')):
+            with open(os.path.join(self.media_root, name), 'wb') as file:
+                file.write(content)
+        response = self.client.get(reverse('media', args=['report%2041.txt']))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'percent')
+
+    def test_byte_ranges(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=2-4')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 2-4/10')
+        self.assertEqual(b''.join(response.streaming_content), b'234')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), b'789')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-')
+        self.assertEqual(response.status_code, 416)
+
+        # a stale If-Range gets the whole file
+        response = self.client.get(
+            self.url, HTTP_RANGE='bytes=2-4', HTTP_IF_RANGE='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect')
+    def test_accel_redirect(self):
+        response = self.client.get(self.url)
+        self.assertEqual(
+            response['X-Accel-Redirect'], '/protected-media/attachment.txt'
+        )
+        self.assertEqual(response.content, b'')
+
+    def test_permissions(self):
+        outside = reverse('media', args=['../settings.py'])
+        self.assertEqual(self.client.get(outside).status_code, 404)
+        staff = User.objects.create_user(
+            'staff', 'staff@example.com', 'password', is_staff=True
+        )
+        job = Job.objects.create(
+            kind=0, content_type=ContentType.objects.get_for_model(Client),
+            created_by=self.user
+        )
+        job.result_file.save('export.csv', ContentFile(b'a,b'))
+        url = reverse('media', args=[job.result_file.name])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class ContentAddressedStorageTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_project(self, **kwargs):
+        return Project.objects.create(
+            name='Project', url='http://example.com',
+            description='Description', project_budget=1000,
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user, **kwargs
+        )
+
+    def test_identical_uploads_share_a_file(self):
+        first, second = [
+            self.create_project(attachments=SimpleUploadedFile(
+                name, b'proposal', content_type='application/pdf'
+            ))
+            for name in ('Proposal.PDF', 'proposal (1).pdf')
+        ]
+        name = first.attachments.name
+        self.assertEqual(second.attachments.name, name)
+        self.assertTrue(name.startswith('files/'))
+        self.assertTrue(name.endswith('.pdf'))
+        self.assertEqual(StoredFile.objects.get(name=name).references, 2)
+
+        second.delete()
+        self.assertEqual(StoredFile.objects.get(name=name).references, 1)
+        self.assertTrue(content_storage.exists(name))
+
+        first.attachments = SimpleUploadedFile('notes.txt', b'notes')
+        first.save()
+        self.assertFalse(StoredFile.objects.filter(name=name).exists())
+
+    def test_rehome_uploads(self):
+        flat = FileSystemStorage()
+        names = [
+            flat.save(name, ContentFile(b'deck'))
+            for name in ('deck.pdf', 'deck-copy.pdf')
+        ]
+        for name in names:
+            Project.objects.filter(
+                pk=self.create_project().pk
+            ).update(attachments=name)
+
+        call_command('rehome_uploads', stdout=io.StringIO())
+        stored = set(Project.objects.values_list('attachments', flat=True))
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(
+            StoredFile.objects.get(name=stored.pop()).references, 2
+        )
+        self.assertFalse(any(flat.exists(name) for name in names))
+
+
+class AttachmentTextTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.client.force_login(self.user)
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def create_project(self, name, content):
+        return Project.objects.create(
+            name=name, url='http://example.com',
+            description='Description', project_budget=1000,
+            attachments=SimpleUploadedFile('proposal.txt', content),
+            project_start_date=datetime.date(2018, 1, 1),
+            created_by=self.user, updated_by=self.user
+        )
+
+    def search(self, term):
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'q': term}
+        )
+        return [
+            project.name for project in response.context['cl'].result_list
+        ]
+
+    def test_attachment_text_is_searchable(self):
+        project = self.create_project('Bid', b'Built on Elasticsearch')
+        job = Job.objects.get(kind=JOB_ATTACHMENT_TEXT)
+        self.assertEqual(self.search('elasticsearch'), [])
+
+        self.assertEqual(claim_jobs(5), [job.pk])
+        run_job(job.pk)
+        self.assertEqual(Job.objects.get(pk=job.pk).status, JOB_COMPLETED)
+        self.assertEqual(
+            project.attachment_text.text, 'Built on Elasticsearch'
+        )
+        self.assertEqual(self.search('elasticsearch'), ['Bid'])
+
+    def test_search_is_a_union_of_the_indexed_searches(self):
+        self.create_project('Elasticsearch bid', b'Built on Django')
+        response = self.client.get(
+            reverse('admin:project_management_project_changelist'),
+            {'q': 'elasticsearch'}
+        )
+        sql = str(response.context['cl'].queryset.query)
+        self.assertIn(' UNION ', sql)
+        self.assertNotIn(' OR ', sql)
+        self.assertEqual(self.search('elasticsearch'), ['Elasticsearch bid'])
+
+    def test_xml_entities_are_refused(self):
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as archive:
+            archive.writestr(
+                'word/document.xml',
+                '<!DOCTYPE d [<!ENTITY a "aaaaaaaaaa">'
+                '<!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">]>'
+                '<d>&b;</d>'
+            )
+        output.seek(0)
+        with self.assertRaises(ValueError):
+            attachments.extract_docx(output)
+
+    def test_unchanged_files_are_not_extracted_again(self):
+        first = self.create_project('First', b'Kafka pipeline')
+        attachments.update_attachment_texts([first.pk])
+        second = self.create_project('Second', b'Kafka pipeline')
+        self.assertEqual(attachments.update_attachment_texts([first.pk]), 0)
+        self.assertEqual(attachments.update_attachment_texts([second.pk]), 1)
+        self.assertEqual(
+            AttachmentText.objects.get(project=second).file_hash,
+            AttachmentText.objects.get(project=first).file_hash
+        )
+
+    def test_docx_text(self):
+        output = io.BytesIO()
+        with zipfile.ZipFile(output, 'w') as archive:
+            archive.writestr(
+                'word/document.xml',
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+                'wordprocessingml/2006/main"><w:body>'
+                '<w:p><w:r><w:t>React</w:t></w:r><w:r><w:t> Native</w:t>'
+                '</w:r></w:p><w:p><w:r><w:t>GraphQL</w:t></w:r></w:p>'
+                '</w:body></w:document>'
+            )
+        output.seek(0)
+        self.assertEqual(
+            attachments.extract_docx(output), 'React Native\nGraphQL\n'
+        )
+
+
+@override_settings(REQUEST_PROFILE_SAMPLE_RATE=1)
+class RequestProfileTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_query_signature(self):
+        self.assertEqual(
+            profiling.query_signature(
+                "SELECT * FROM t WHERE id = 12 AND name = 'it''s' "
+                "AND pk IN (1, 2, 3)"
+            ),
+            'SELECT * FROM t WHERE id = ? AND name = ? AND pk IN (...)'
+        )
+        count, sql_time, duplicates, sql = profiling.summarize([
+            {'sql': 'SELECT * FROM t WHERE id = %d' % i, 'time': '0.001'}
+            for i in range(3)
+        ])
+        self.assertEqual((count, duplicates), (3, 2))
+        self.assertAlmostEqual(sql_time, 3)
+        self.assertEqual(sql, 'SELECT * FROM t WHERE id = ?')
+
+    def test_requests_are_profiled(self):
+        url = reverse('admin:project_management_project_changelist')
+        self.client.get(url)
+        profile = RequestProfile.objects.get()
+        self.assertEqual(
+            profile.view_name, 'admin:project_management_project_changelist'
+        )
+        self.assertEqual((profile.path, profile.status_code), (url, 200))
+        self.assertGreater(profile.query_count, 0)
+
+        response = self.client.get(
+            reverse('admin:project_management_requestprofile_percentiles')
+        )
+        self.assertContains(
+            response, 'admin:project_management_project_changelist'
+        )
+
+    @override_settings(REQUEST_PROFILE_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_profiled(self):
+        self.client.get(reverse('admin:project_management_project_changelist'))
+        self.assertFalse(RequestProfile.objects.exists())
+
+
+class BenchmarkCommandTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        call_command(
+            'generate_benchmark_data', clients=5, projects=20, tags=4,
+            technologies=4, domain_depth=2, domain_children=2, seed=1,
+            stdout=io.StringIO()
+        )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_generated_data(self):
+        self.assertEqual(Client.objects.count(), 5)
+        self.assertEqual(Project.objects.count(), 20)
+        # two roots with two children each
+        self.assertEqual(Domain.objects.count(), 6)
+        self.assertFalse(Domain.objects.filter(lft=0).exists())
+        self.assertFalse(Project.objects.filter(summary=None).exists())
+        self.assertFalse(Project.objects.filter(search_vector=None).exists())
+        self.assertTrue(
+            Project.objects.filter(domains__isnull=False).exists()
+        )
+        self.assertEqual(ProjectStatusChange.objects.count(), 20)
+
+    def test_results_are_written_and_compared(self):
+        output = os.path.join(self.directory, 'benchmark.json')
+        call_command(
+            'benchmark_admin', repeat=1, import_rows=5, output=output,
+            stdout=io.StringIO()
+        )
+        with open(output) as file:
+            report = json.load(file)
+        self.assertEqual(report['data']['project'], 20)
+        for name in ('project changelist', 'project filter domains',
+                     'project filter project_budget', 'client search',
+                     'project export_as_csv', 'project import',
+                     'project create_list'):
+            self.assertGreater(report['results'][name]['queries'], 0)
+        self.assertFalse(List.objects.exists())
+
+        stdout = io.StringIO()
+        call_command(
+            'benchmark_admin', repeat=0, only='client changelist',
+            compare=output, stdout=stdout
+        )
+        self.assertIn('client changelist', stdout.getvalue())
+        self.assertIn('regressions', stdout.getvalue())
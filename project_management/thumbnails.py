@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import hashlib
+import io
+import posixpath
+import re
+
+# Django Imports
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from PIL import Image, ImageOps
+
+# Project Imports
+from project_management.models import Project
+from project_management.utils import chunked
+
+
+# Pillow format, file extension and save options of each rendition format
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 85, 'optimize': True}),
+}
+
+# name of a rendition, see rendition_name()
+RENDITION_NAME = re.compile(r'\.\d+x\d+\.[0-9a-f]{12}\.\w+$')
+
+
+def get_sizes():
+    return [
+        tuple(size) for size in
+        getattr(settings, 'LOGO_THUMBNAIL_SIZES', ((150, 150),))
+    ]
+
+
+def get_formats():
+    """
+    Returns the configured formats the installed Pillow can write, best
+    first; WebP needs Pillow built with libwebp.
+    """
+    Image.init()
+    return [
+        name for name in
+        getattr(settings, 'LOGO_THUMBNAIL_FORMATS', ('webp', 'jpeg'))
+        if FORMATS[name][0] in Image.SAVE
+    ]
+
+
+def size_key(size):
+    return '{}x{}'.format(*size)
+
+
+def render(image, size, name):
+    """
+    Returns the bytes of image cropped and scaled to size in the format
+    `name`. Transparency is flattened on white for formats without it.
+    """
+    pil_format, extension, options = FORMATS[name]
+    thumbnail = ImageOps.fit(image, size, Image.LANCZOS)
+    if thumbnail.mode not in ('RGB', 'RGBA') or pil_format == 'JPEG':
+        thumbnail = thumbnail.convert('RGBA')
+        if pil_format == 'JPEG':
+            background = Image.new('RGB', thumbnail.size, (255, 255, 255))
+            background.paste(thumbnail, mask=thumbnail.split()[3])
+            thumbnail = background
+    output = io.BytesIO()
+    thumbnail.save(output, pil_format, **options)
+    return output.getvalue()
+
+
+def rendition_name(source, size, name, content):
+    """
+    Returns the storage name of a rendition, next to the source with the
+    hash of its content in the name: a changed rendition gets a new URL, so
+    the files can be cached forever.
+    """
+    stem = posixpath.splitext(source)[0]
+    return '{}.{}.{}.{}'.format(
+        stem, size_key(size), hashlib.sha1(content).hexdigest()[:12],
+        FORMATS[name][1]
+    )
+
+
+def rendition_names(thumbnails):
+    return set(
+        rendition
+        for renditions in thumbnails.get('sizes', {}).values()
+        for rendition in renditions.values()
+    )
+
+
+def shared_renditions(project, source):
+    """
+    Returns the renditions of `source` listed by the other projects: the
+    projects with the same stored logo share its renditions.
+    """
+    if not source:
+        return set()
+    return set(
+        name
+        for thumbnails in Project.objects.filter(
+            logo_thumbnails__source=source
+        ).exclude(pk=project.pk).values_list('logo_thumbnails', flat=True)
+        for name in rendition_names(thumbnails or {})
+    )
+
+
+def is_stale(project):
+    """
+    Returns whether the thumbnails of the project do not match its current
+    logo and the configured sizes and formats.
+    """
+    thumbnails = project.logo_thumbnails or {}
+    if not project.logo:
+        return bool(thumbnails)
+    if thumbnails.get('error'):
+        # a logo that could not be rendered is retried once it changes
+        return thumbnails.get('source') != project.logo.name
+    return (
+        thumbnails.get('source') != project.logo.name or
+        set(thumbnails.get('sizes', {})) !=
+        set(size_key(size) for size in get_sizes()) or
+        any(
+            set(renditions) != set(get_formats())
+            for renditions in thumbnails.get('sizes', {}).values()
+        )
+    )
+
+
+def generate(project):
+    """
+    Renders the logo of the project in every configured size and format
+    and returns the new value of Project.logo_thumbnails. Renditions whose
+    name already exists in the storage are not written again.
+    """
+    if not project.logo:
+        return {}
+    source = project.logo.name
+    project.logo.open('rb')
+    try:
+        image = Image.open(project.logo)
+        image.load()
+    finally:
+        project.logo.close()
+    if image.mode == 'P':
+        image = image.convert('RGBA')
+
+    sizes = {}
+    for size in get_sizes():
+        renditions = sizes[size_key(size)] = {}
+        for name in get_formats():
+            content = render(image, size, name)
+            path = rendition_name(source, size, name, content)
+            if not default_storage.exists(path):
+                path = default_storage.save(path, ContentFile(content))
+            renditions[name] = path
+    return {'source': source, 'sizes': sizes}
+
+
+def update_thumbnails(pks, batch_size=100):
+    """
+    Regenerates the stale thumbnails of the given projects and deletes the
+    renditions they replace that no other project lists. The error of a
+    logo that cannot be rendered is stored in its logo_thumbnails. Returns
+    the number of projects updated.
+
+    Projects are saved with queryset updates, which send no signals.
+    """
+    updated = 0
+    for batch in chunked(sorted(set(pks)), batch_size):
+        projects = Project.objects.filter(pk__in=batch).only(
+            'logo', 'logo_thumbnails'
+        )
+        for project in projects:
+            if not is_stale(project):
+                continue
+            previous = project.logo_thumbnails or {}
+            try:
+                thumbnails = generate(project)
+            except Exception as error:
+                # recorded, so the logo is not rendered again until changed
+                thumbnails = {
+                    'source': project.logo.name, 'error': repr(error)
+                }
+            Project.objects.filter(pk=project.pk).update(
+                logo_thumbnails=thumbnails
+            )
+            replaced = rendition_names(previous) - rendition_names(thumbnails)
+            if replaced:
+                replaced -= shared_renditions(project, previous.get('source'))
+            for path in replaced:
+                default_storage.delete(path)
+            updated += 1
+    return updated
+
+
+def logo_html(project, size=None):
+    """
+    Returns a <picture> of the logo thumbnail of `size` in every generated
+    format, or the scaled original until the thumbnails are generated.
+    """
+    size = size or get_sizes()[0]
+    renditions = (project.logo_thumbnails or {}).get('sizes', {}).get(
+        size_key(size)
+    )
+    if not renditions or is_stale(project):
+        return format_html(
+            '<img src="{}" width="{}" height="{}" />',
+            project.logo.url, *size
+        )
+    names = [name for name in get_formats() if name in renditions]
+    sources = format_html_join(
+        '', '<source srcset="{}" type="image/{}" />', (
+            (default_storage.url(renditions[name]), name)
+            for name in names[:-1]
+        )
+    )
+    return format_html(
+        '<picture>{}<img src="{}" width="{}" height="{}" /></picture>',
+        sources, default_storage.url(renditions[names[-1]]), *size
+    )
@@ -4,8 +4,15 @@
 from django.conf.urls import url
 
 # Project Imports
-from project_management.views import create_custom_list
+from project_management.views import (
+    autocomplete, create_custom_list, filter_choices
+)
 
 urlpatterns = [
+    url(r'^autocomplete/(?P<name>\w+)/$', autocomplete, name='autocomplete'),
     url(r'^create_list/$', create_custom_list, name='create_custom_list'),
+    url(
+        r'^filter_choices/(?P<app_label>\w+)/(?P<model_name>\w+)/$',
+        filter_choices, name='filter_choices'
+    ),
 ]
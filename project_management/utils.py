@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# Python Imports
+import uuid
+
+# Django Imports
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Case, Value, When
+from django.db.models.functions import Cast
+
+
+def chunked(items, size):
+    """
+    Splits a list into consecutive lists of at most `size` items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def bulk_update(queryset, objs, field_names, batch_size=500):
+    """
+    Saves `field_names` of `objs` with one UPDATE per batch, setting each
+    column to a CASE WHEN pk = ... expression. Django 1.11 has no
+    QuerySet.bulk_update.
+    """
+    model = queryset.model
+    connection = connections[queryset.db]
+    fields = [model._meta.get_field(name) for name in field_names]
+    for batch in chunked(objs, batch_size):
+        updates = {}
+        for field in fields:
+            whens = [
+                When(pk=obj.pk, then=Cast(
+                    Value(field.get_db_prep_save(
+                        field.pre_save(obj, False), connection
+                    )),
+                    field
+                ))
+                for obj in batch
+            ]
+            updates[field.attname] = Case(*whens, output_field=field)
+        queryset.filter(pk__in=[obj.pk for obj in batch]).update(**updates)
+
+
+def get_cache_version(key):
+    # a random token rather than a counter, so an evicted or flushed
+    # version never comes back to a value older entries were built with
+    return cache.get_or_set(key, lambda: uuid.uuid4().hex, None)
+
+
+def bump_cache_version(key):
+    """
+    Moves every cache entry built with get_cache_version(key) to a new
+    version, so they are no longer read.
+    """
+    cache.set(key, uuid.uuid4().hex, None)
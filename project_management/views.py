@@ -1,35 +1,125 @@
 # -*- coding: utf-8 -*-
 
 # Django Imports
-from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.apps import apps
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponseRedirect, JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
 from django.views.decorators.csrf import csrf_protect
+from django.views.decorators.http import require_safe
 
 # Project Imports
+from project_management.autocomplete import AUTOCOMPLETE_MODELS, search
+from project_management.filters import get_filter_page_size, get_lazy_filter
 from project_management.forms import ListForm
-from project_management.models import List
+from project_management.media import serve
+from project_management.models import List, Project
+from project_management.selection import (
+    LIST_SELECTION_SESSION_KEY, get_preview, selection_queryset
+)
 
 
+@staff_member_required
+def autocomplete(request, name):
+    if name not in AUTOCOMPLETE_MODELS:
+        raise Http404
+    # the same permission as the changelist of the model
+    model_admin = admin.site._registry.get(AUTOCOMPLETE_MODELS[name][0])
+    if model_admin is None or not model_admin.has_change_permission(request):
+        raise PermissionDenied
+    return JsonResponse({'results': search(name, request.GET.get('q', ''))})
+
+
+@staff_member_required
+def filter_choices(request, app_label, model_name):
+    """
+    Returns one page of options of a lazy changelist filter as JSON.
+    """
+    try:
+        model = apps.get_model(app_label, model_name)
+    except LookupError:
+        raise Http404
+    model_admin = admin.site._registry.get(model)
+    field_path = request.GET.get('field', '')
+    filter_class = model_admin and get_lazy_filter(
+        model_admin, request, field_path
+    )
+    if filter_class is None:
+        raise Http404
+    if not model_admin.has_change_permission(request):
+        raise PermissionDenied
+
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    page_size = get_filter_page_size()
+    try:
+        choices = filter_class.get_choices_page(
+            request, model_admin, field_path,
+            request.GET.get('q', '').strip(), (page - 1) * page_size,
+            page_size + 1
+        )
+    except IncorrectLookupParameters:
+        # the changelist params of the facet filters
+        raise Http404
+    return JsonResponse({
+        'results': [
+            {'value': value, 'display': display}
+            for value, display in choices[:page_size]
+        ],
+        'more': len(choices) > page_size,
+    })
+
+
+@staff_member_required
 @csrf_protect
 def create_custom_list(request):
-    if request.method == 'POST':
-        form = ListForm(request.POST)
-        if form.is_valid():
-            project_list = List()
+    selection = request.session.get(LIST_SELECTION_SESSION_KEY)
+    if selection is None:
+        return HttpResponseRedirect(
+            reverse('admin:project_management_project_changelist')
+        )
+    model_admin = admin.site._registry[Project]
+    try:
+        queryset = selection_queryset(model_admin, request, selection)
+    except IncorrectLookupParameters:
+        raise Http404
+
+    form = ListForm(request.POST if request.method == 'POST' else None)
+    if form.is_valid():
+        project_list = form.cleaned_data['project_list']
+        if project_list is None:
+            project_list = List(created_by=request.user)
             project_list.name = form.cleaned_data['name']
-            project_list.created_by = request.user
-            project_list.updated_by = request.user
-            project_list.save()
-
-            count = 0
-            for project in request.session.get('data'):
-                project_list.projects.add(project)
-                count += 1
-
-            messages.add_message(
-                request, messages.INFO,
-                "Successfully added {} projects to list {}.".format(
-                    count, project_list.name
-                )
+        project_list.updated_by = request.user
+        project_list.save()
+
+        count = project_list.add_projects(queryset)
+        del request.session[LIST_SELECTION_SESSION_KEY]
+
+        messages.add_message(
+            request, messages.INFO,
+            "Successfully added {} projects to list {}.".format(
+                count, project_list.name
             )
-            return HttpResponseRedirect("/admin/project_management/list/")
+        )
+        return HttpResponseRedirect("/admin/project_management/list/")
+
+    return render(
+        request, 'admin/project/create_list.html',
+        dict(get_preview(queryset), form=form)
+    )
+
+
+@staff_member_required
+@require_safe
+def media(request, path):
+    """
+    Serves the uploaded files of MEDIA_ROOT to staff users, see media.py.
+    """
+    return serve(request, path)
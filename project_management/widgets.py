@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+# Django Imports
+from django.contrib.admin.widgets import ForeignKeyRawIdWidget
+from django.urls import reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+
+class AutocompleteRawIdWidget(ForeignKeyRawIdWidget):
+    """
+    Raw id widget with a search box fed by the autocomplete API, which
+    fills in the id of the chosen object.
+    """
+
+    class Media:
+        js = ('project_management/js/autocomplete.js',)
+
+    def __init__(self, rel, admin_site, autocomplete_name, attrs=None,
+                 using=None):
+        self.autocomplete_name = autocomplete_name
+        super(AutocompleteRawIdWidget, self).__init__(
+            rel, admin_site, attrs=attrs, using=using
+        )
+
+    def render(self, name, value, attrs=None, renderer=None):
+        output = super(AutocompleteRawIdWidget, self).render(
+            name, value, attrs=attrs, renderer=renderer
+        )
+        target = (attrs or {}).get('id', 'id_{}'.format(name))
+        search = format_html(
+            '<input type="text" class="vTextField autocomplete-search" '
+            'placeholder="Search" autocomplete="off" data-url="{}" '
+            'data-target="{}" list="{}_autocomplete" />'
+            '<datalist id="{}_autocomplete"></datalist>',
+            reverse(
+                'project_management:autocomplete',
+                args=[self.autocomplete_name]
+            ),
+            target, target, target
+        )
+        return mark_safe(output + search)
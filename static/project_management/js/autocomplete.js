@@ -0,0 +1,50 @@
+(function() {
+    'use strict';
+
+    var DELAY = 150;
+
+    function bind(input) {
+        var target = document.getElementById(input.getAttribute('data-target'));
+        var list = document.getElementById(input.getAttribute('list'));
+        var timer = null;
+        var ids = {};
+
+        input.addEventListener('input', function() {
+            var term = input.value;
+            if (ids.hasOwnProperty(term)) {
+                target.value = ids[term];
+                return;
+            }
+            clearTimeout(timer);
+            timer = setTimeout(function() {
+                var request = new XMLHttpRequest();
+                request.open(
+                    'GET',
+                    input.getAttribute('data-url') + '?q=' + encodeURIComponent(term)
+                );
+                request.onload = function() {
+                    if (request.status !== 200 || input.value !== term) {
+                        return;
+                    }
+                    var results = JSON.parse(request.responseText).results;
+                    ids = {};
+                    list.innerHTML = '';
+                    results.forEach(function(result) {
+                        var option = document.createElement('option');
+                        option.value = result.text;
+                        ids[result.text] = result.id;
+                        list.appendChild(option);
+                    });
+                };
+                request.send();
+            }, DELAY);
+        });
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var inputs = document.querySelectorAll('input.autocomplete-search');
+        for (var i = 0; i < inputs.length; i++) {
+            bind(inputs[i]);
+        }
+    });
+})();
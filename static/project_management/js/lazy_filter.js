@@ -0,0 +1,102 @@
+(function() {
+    'use strict';
+
+    var DELAY = 250;
+
+    function queryString(select, value) {
+        var params = new URLSearchParams(window.location.search);
+        params.delete('p');
+        params.delete(select.getAttribute('data-isnull'));
+        params.set(select.getAttribute('data-lookup'), value);
+        return '?' + params.toString();
+    }
+
+    function bind(select) {
+        var input = select.parentNode.querySelector('input.lazy-filter-search');
+        var initial = select.innerHTML;
+        var state = {term: '', page: 0, loading: false, more: true};
+        var timer = null;
+
+        function load() {
+            if (state.loading || !state.more) {
+                return;
+            }
+            state.loading = true;
+            var term = state.term;
+            var request = new XMLHttpRequest();
+            request.open(
+                'GET',
+                select.getAttribute('data-url') +
+                '&q=' + encodeURIComponent(term) + '&page=' + (state.page + 1)
+            );
+            request.onload = function() {
+                state.loading = false;
+                if (request.status !== 200 || state.term !== term) {
+                    return;
+                }
+                var data = JSON.parse(request.responseText);
+                var more = select.querySelector('option.lazy-filter-more');
+                if (more) {
+                    select.removeChild(more);
+                }
+                data.results.forEach(function(result) {
+                    var option = document.createElement('option');
+                    option.value = queryString(select, result.value);
+                    option.textContent = result.display;
+                    select.appendChild(option);
+                });
+                if (data.more) {
+                    var option = document.createElement('option');
+                    option.className = 'lazy-filter-more';
+                    option.value = '';
+                    option.textContent = select.getAttribute('data-more-label');
+                    select.appendChild(option);
+                }
+                state.page += 1;
+                state.more = data.more;
+            };
+            request.onerror = function() {
+                state.loading = false;
+            };
+            request.send();
+        }
+
+        function reset(term) {
+            select.innerHTML = initial;
+            state = {term: term, page: 0, loading: false, more: true};
+            load();
+        }
+
+        select.addEventListener('focus', function() {
+            if (state.page === 0) {
+                load();
+            }
+        });
+        select.addEventListener('change', function() {
+            var option = select.options[select.selectedIndex];
+            if (option.className === 'lazy-filter-more') {
+                load();
+                return;
+            }
+            window.location = window.location.pathname + option.value;
+        });
+        if (input) {
+            input.addEventListener('input', function() {
+                clearTimeout(timer);
+                timer = setTimeout(function() {
+                    reset(input.value.trim());
+                }, DELAY);
+            });
+        }
+    }
+
+    document.addEventListener('DOMContentLoaded', function() {
+        var selects = document.querySelectorAll('select.lazy-filter');
+        for (var i = 0; i < selects.length; i++) {
+            if (!selects[i].hasAttribute('data-bound')) {
+                selects[i].setAttribute('data-bound', '');
+                bind(selects[i]);
+            }
+        }
+    });
+})();